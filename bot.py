@@ -5,10 +5,6 @@ import asyncio
 import logging
 import signal
 import sys
-from pathlib import Path
-
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent))
 
 from config import config, setup_logging
 from core.bot_instance import create_bot
@@ -17,6 +13,20 @@ from core.bot_instance import create_bot
 setup_logging()
 logger = logging.getLogger(__name__)
 
+def install_event_loop():
+    """Use uvloop (or winloop on Windows) as the event loop if available"""
+    try:
+        if sys.platform != "win32":
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        else:
+            import winloop
+            winloop.install()
+    except ImportError:
+        logger.warning("uvloop/winloop not installed - using default asyncio event loop")
+
+install_event_loop()
+
 class BotRunner:
     """Bot runner with graceful shutdown handling"""
     
@@ -26,22 +36,18 @@ class BotRunner:
     
     def setup_signal_handlers(self):
         """Setup signal handlers for graceful shutdown"""
+        loop = asyncio.get_running_loop()
+        
         if sys.platform != "win32":
-            # Unix signals
+            # Unix signals - delivered directly by the event loop
             for sig in (signal.SIGTERM, signal.SIGINT):
-                signal.signal(sig, self._signal_handler)
+                loop.add_signal_handler(sig, self.shutdown_event.set)
         else:
-            # Windows signal
-            signal.signal(signal.SIGINT, self._signal_handler)
-    
-    def _signal_handler(self, signum, frame):
-        """Handle shutdown signals"""
-        logger.info(f"Received signal {signum}, shutting down...")
-        asyncio.create_task(self._shutdown())
-    
-    async def _shutdown(self):
-        """Trigger shutdown"""
-        self.shutdown_event.set()
+            # Windows signal - add_signal_handler is not supported, so hop onto the loop
+            signal.signal(
+                signal.SIGINT,
+                lambda *_: loop.call_soon_threadsafe(self.shutdown_event.set)
+            )
     
     async def run(self):
         """Run the bot with graceful shutdown"""
@@ -69,10 +75,12 @@ class BotRunner:
             
             # Wait for bot task to complete
             try:
-                await asyncio.wait_for(bot_task, timeout=10.0)
-            except asyncio.TimeoutError:
+                async with asyncio.timeout(10.0):
+                    await bot_task
+            except TimeoutError:
                 logger.warning("Bot shutdown timed out")
                 bot_task.cancel()
+                await asyncio.gather(bot_task, return_exceptions=True)
             
             logger.info("Bot shutdown complete")
             return True
@@ -81,23 +89,26 @@ class BotRunner:
             logger.info("Received keyboard interrupt")
             return True
         except Exception as e:
-            logger.error(f"Error running bot: {e}", exc_info=True)
+            logger.error("Error running bot: %s", e, exc_info=True)
             return False
         finally:
-            if self.bot:
+            # Only stop here if the normal shutdown path didn't get to it
+            if self.bot and self.bot.is_running:
                 await self.bot.stop()
 
 async def main():
     """Main entry point"""
-    logger.info("=" * 50)
-    logger.info("🤖 Starting ZyraX Telegram Bot")
-    logger.info("=" * 50)
-    
-    # Display configuration info
-    logger.info(f"Bot Token: {'*' * 20}{config.BOT_TOKEN[-10:] if config.BOT_TOKEN else 'NOT SET'}")
-    logger.info(f"Database URI: {config.MONGODB_URI}")
-    logger.info(f"Debug Mode: {config.DEBUG}")
-    logger.info(f"Log Level: {config.LOG_LEVEL}")
+    # Display startup banner and configuration info as one record
+    banner = "\n".join([
+        "=" * 50,
+        "🤖 Starting ZyraX Telegram Bot",
+        "=" * 50,
+        f"Bot Token: {'*' * 20}{config.BOT_TOKEN[-10:] if config.BOT_TOKEN else 'NOT SET'}",
+        f"Database URI: {config.MONGODB_URI}",
+        f"Debug Mode: {config.DEBUG}",
+        f"Log Level: {config.LOG_LEVEL}"
+    ])
+    logger.info(banner)
     
     # Validate required config
     if not config.BOT_TOKEN:
@@ -130,5 +141,5 @@ if __name__ == "__main__":
         logger.info("Interrupted by user")
         sys.exit(0)
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         sys.exit(1)
@@ -2,15 +2,20 @@
 Configuration management for ZyraX Telegram Bot
 """
 import os
+import atexit
 import logging
+import logging.handlers
+import queue
+from dataclasses import dataclass
 from typing import Optional
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Main configuration class"""
+    """Main configuration class, populated from the environment once at import"""
     
     # Bot Configuration
     BOT_TOKEN: str = os.getenv("BOT_TOKEN", "")
@@ -19,6 +24,9 @@ class Config:
     
     # Database Configuration
     MONGODB_URI: str = os.getenv("MONGODB_URI", "mongodb://localhost:27017/zyraX_bot")
+    MONGODB_MAX_POOL_SIZE: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "50"))
+    MONGODB_MIN_POOL_SIZE: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "10"))
+    ACTION_LOG_RETENTION_DAYS: int = int(os.getenv("ACTION_LOG_RETENTION_DAYS", "90"))
     
     # Redis Configuration
     REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
@@ -45,14 +53,13 @@ class Config:
     # Captcha Settings
     CAPTCHA_TIMEOUT: int = int(os.getenv("CAPTCHA_TIMEOUT", "300"))  # 5 minutes
     
-    @classmethod
-    def validate(cls) -> bool:
+    def validate(self) -> bool:
         """Validate required configuration values"""
-        if not cls.BOT_TOKEN:
+        if not self.BOT_TOKEN:
             logging.error("BOT_TOKEN is required")
             return False
         
-        if not cls.API_ID or not cls.API_HASH:
+        if not self.API_ID or not self.API_HASH:
             logging.warning("API_ID and API_HASH not set - MTProto features disabled")
         
         return True
@@ -60,16 +67,35 @@ class Config:
 # Create singleton instance
 config = Config()
 
+_logging_configured = False
+
 # Setup logging
 def setup_logging():
-    """Setup logging configuration"""
+    """Setup logging configuration (safe to call more than once)"""
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+    
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     
+    # File writes happen on a listener thread so logging never blocks the event loop
+    log_queue = queue.SimpleQueue()
+    file_handler = logging.FileHandler(config.LOG_FILE, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(log_format))
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    # Full formatting is done by the file handler on the listener side
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    
     logging.basicConfig(
         level=getattr(logging, config.LOG_LEVEL.upper()),
         format=log_format,
         handlers=[
-            logging.FileHandler(config.LOG_FILE),
+            queue_handler,
             logging.StreamHandler()
         ]
     )
@@ -78,5 +104,3 @@ def setup_logging():
     logging.getLogger("telegram").setLevel(logging.WARNING)
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("pyrogram").setLevel(logging.WARNING)
-
-setup_logging()
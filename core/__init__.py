@@ -1,13 +1,29 @@
 """
 Core components for ZyraX Bot
+
+The Database instance is not re-exported: ``core.database`` is the submodule,
+so import it with ``from core.database import database``.
 """
-from .database import init_database, close_database, database
+import importlib
+
 from .constants import *
-from .helpers import *
-from .decorators import *
 
 __all__ = [
     'init_database',
-    'close_database', 
-    'database'
+    'close_database'
 ]
+
+# Submodules pulling in heavy dependencies (pymongo, telegram) are imported on first attribute access
+_LAZY_SUBMODULES = ('database', 'helpers', 'decorators')
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        # Same result whether or not the submodule was already imported
+        return importlib.import_module(f'.{name}', __name__)
+    for submodule in _LAZY_SUBMODULES:
+        module = importlib.import_module(f'.{submodule}', __name__)
+        if name in module.__dict__ and not name.startswith('_'):
+            value = module.__dict__[name]
+            globals()[name] = value
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
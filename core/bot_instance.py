@@ -2,43 +2,95 @@
 Bot instance initialization and setup for ZyraX Bot
 """
 import logging
-from typing import Optional
-from telegram.ext import Application, PicklePersistence
-from telegram import BotCommand
+from typing import Optional, TYPE_CHECKING
+
+import orjson
+from telegram import BotCommand, Update
+from telegram.error import TelegramError
+from telegram.request import HTTPXRequest
 
 from config import config
 from core.database import init_database, close_database
-from handlers.loader import init_command_loader
+
+if TYPE_CHECKING:
+    from telegram.ext import Application
 
 logger = logging.getLogger(__name__)
 
+class OrjsonRequest(HTTPXRequest):
+    """HTTPX request backend that decodes Bot API responses with orjson"""
+    
+    @staticmethod
+    def parse_json_payload(payload: bytes) -> dict:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError as exc:
+            raise TelegramError("Invalid server response") from exc
+
+# Bot commands menu, built once at import
+BOT_COMMANDS = (
+    BotCommand("start", "Start the bot"),
+    BotCommand("help", "Show help information"),
+    BotCommand("settings", "Chat settings"),
+    BotCommand("ban", "Ban a user"),
+    BotCommand("unban", "Unban a user"),
+    BotCommand("mute", "Mute a user"),
+    BotCommand("unmute", "Unmute a user"),
+    BotCommand("kick", "Kick a user"),
+    BotCommand("warn", "Warn a user"),
+    BotCommand("promote", "Promote a user to admin"),
+    BotCommand("demote", "Demote an admin"),
+    BotCommand("purge", "Delete messages"),
+    BotCommand("pin", "Pin a message"),
+    BotCommand("unpin", "Unpin a message"),
+    BotCommand("lock", "Lock chat features"),
+    BotCommand("unlock", "Unlock chat features"),
+    BotCommand("filter", "Add a filter"),
+    BotCommand("note", "Save a note"),
+    BotCommand("rules", "Show chat rules"),
+    BotCommand("id", "Get user/chat ID"),
+    BotCommand("info", "Get user information")
+)
+
 class ZyraXBot:
     """Main bot class for ZyraX"""
     
     def __init__(self):
-        self.application: Optional[Application] = None
+        self.application: Optional["Application"] = None
         self.command_loader = None
         self._running = False
+        self._bot_info: Optional[dict] = None
     
     async def initialize(self) -> bool:
         """Initialize the bot application"""
+        # Deferred so importing this module doesn't pull in telegram.ext and the handler tree
+        from telegram.ext import Application, ChatMemberHandler, TypeHandler
+        from core.helpers import ChatHelper
+        from core.persistence import create_persistence
+        from core.rate_limiter import TelegramRateLimiter
+        from handlers.loader import init_command_loader
+        from utils.user_resolver import UserResolver
+        
         try:
             # Validate configuration
             if not config.validate():
                 logger.error("Invalid configuration")
                 return False
             
-            # Setup persistence
-            persistence = PicklePersistence(filepath="bot_data.pickle")
-            
             # Create application
-            self.application = (
+            builder = (
                 Application.builder()
                 .token(config.BOT_TOKEN)
-                .persistence(persistence)
-                .build()
+                .request(OrjsonRequest(connection_pool_size=256, pool_timeout=10))
+                .get_updates_request(OrjsonRequest())
+                .rate_limiter(TelegramRateLimiter())
             )
             
+            # Setup persistence (Redis-backed, the local pickle file if Redis is unset or down)
+            builder = builder.persistence(await create_persistence(config.REDIS_URL))
+            
+            self.application = builder.build()
+            
             # Initialize database
             if not await init_database():
                 logger.error("Failed to initialize database")
@@ -52,6 +104,16 @@ class ZyraXBot:
                 logger.error("Failed to load command handlers")
                 return False
             
+            # Keep cached admin lists in step with promotions and demotions
+            self.application.add_handler(
+                ChatMemberHandler(ChatHelper.on_chat_member_update, ChatMemberHandler.CHAT_MEMBER),
+                group=-1
+            )
+            self.command_loader.update_types.add(Update.CHAT_MEMBER)
+            
+            # Index users seen in any update, so commands can target them by @username
+            self.application.add_handler(TypeHandler(Update, UserResolver.on_update), group=-2)
+            
             # Setup bot commands menu
             await self._setup_bot_commands()
             
@@ -62,11 +124,13 @@ class ZyraXBot:
             return True
         
         except Exception as e:
-            logger.error(f"Error initializing bot: {e}", exc_info=True)
+            logger.error("Error initializing bot: %s", e, exc_info=True)
             return False
     
     async def start(self) -> None:
         """Start the bot"""
+        from core.helpers import configure_permissions
+        
         if not self.application:
             if not await self.initialize():
                 raise RuntimeError("Failed to initialize bot")
@@ -77,21 +141,33 @@ class ZyraXBot:
             
             # Start the bot
             await self.application.initialize()
+            
+            # IDs are fixed for the process lifetime - resolve them once
+            configure_permissions(
+                owner_id=self.application.bot_data.get('owner_id'),
+                bot_id=self.application.bot.id
+            )
+            
             await self.application.start()
             await self.application.updater.start_polling(
+                poll_interval=0.0,
+                timeout=50,
+                bootstrap_retries=-1,
                 drop_pending_updates=True,
-                allowed_updates=None
+                allowed_updates=self.command_loader.get_allowed_updates()
             )
             
             logger.info("Bot started successfully!")
             
         except Exception as e:
-            logger.error(f"Error starting bot: {e}", exc_info=True)
+            logger.error("Error starting bot: %s", e, exc_info=True)
             await self.stop()
             raise
     
     async def stop(self) -> None:
         """Stop the bot"""
+        from middleware.chat_logger import chat_logger
+        
         if not self._running:
             return
         
@@ -102,6 +178,8 @@ class ZyraXBot:
             if self.application:
                 await self.application.updater.stop()
                 await self.application.stop()
+                # Send buffered log channel messages while the bot can still talk
+                await chat_logger.stop()
                 await self.application.shutdown()
             
             # Close database connection
@@ -110,78 +188,60 @@ class ZyraXBot:
             logger.info("Bot stopped successfully")
         
         except Exception as e:
-            logger.error(f"Error stopping bot: {e}", exc_info=True)
+            logger.error("Error stopping bot: %s", e, exc_info=True)
     
     async def _setup_bot_commands(self) -> None:
         """Setup bot commands menu"""
         try:
-            commands = [
-                BotCommand("start", "Start the bot"),
-                BotCommand("help", "Show help information"),
-                BotCommand("settings", "Chat settings"),
-                BotCommand("ban", "Ban a user"),
-                BotCommand("unban", "Unban a user"),
-                BotCommand("mute", "Mute a user"),
-                BotCommand("unmute", "Unmute a user"),
-                BotCommand("kick", "Kick a user"),
-                BotCommand("warn", "Warn a user"),
-                BotCommand("promote", "Promote a user to admin"),
-                BotCommand("demote", "Demote an admin"),
-                BotCommand("purge", "Delete messages"),
-                BotCommand("pin", "Pin a message"),
-                BotCommand("unpin", "Unpin a message"),
-                BotCommand("lock", "Lock chat features"),
-                BotCommand("unlock", "Unlock chat features"),
-                BotCommand("filter", "Add a filter"),
-                BotCommand("note", "Save a note"),
-                BotCommand("rules", "Show chat rules"),
-                BotCommand("id", "Get user/chat ID"),
-                BotCommand("info", "Get user information")
-            ]
-            
-            await self.application.bot.set_my_commands(commands)
+            await self.application.bot.set_my_commands(BOT_COMMANDS)
             logger.info("Bot commands menu updated")
         
         except Exception as e:
-            logger.error(f"Error setting bot commands: {e}")
+            logger.error("Error setting bot commands: %s", e)
     
     async def _error_handler(self, update, context) -> None:
         """Global error handler"""
         try:
             logger.error(
-                f"Exception while handling update {update}: {context.error}",
+                "Exception while handling update %s: %s",
+                update,
+                context.error,
                 exc_info=context.error
             )
             
             # Send error to developer chat if configured
             if config.DEV_CHAT_ID and update:
                 try:
-                    error_msg = f"🚨 **Bot Error**\n\n"
+                    parts = ["🚨 **Bot Error**\n\n"]
                     
                     if update.effective_user:
-                        error_msg += f"**User:** {update.effective_user.id} "
-                        error_msg += f"(@{update.effective_user.username})\n"
+                        parts.append(
+                            f"**User:** {update.effective_user.id} "
+                            f"(@{update.effective_user.username})\n"
+                        )
                     
                     if update.effective_chat:
-                        error_msg += f"**Chat:** {update.effective_chat.id} "
-                        error_msg += f"({update.effective_chat.title})\n"
+                        parts.append(
+                            f"**Chat:** {update.effective_chat.id} "
+                            f"({update.effective_chat.title})\n"
+                        )
                     
-                    if update.effective_message:
-                        error_msg += f"**Message:** {update.effective_message.text[:100]}...\n"
+                    if update.effective_message and update.effective_message.text:
+                        parts.append(f"**Message:** {update.effective_message.text[:100]}...\n")
                     
-                    error_msg += f"\n**Error:** `{str(context.error)}`"
+                    parts.append(f"\n**Error:** `{context.error}`")
                     
                     await context.bot.send_message(
                         chat_id=config.DEV_CHAT_ID,
-                        text=error_msg,
+                        text="".join(parts),
                         parse_mode="Markdown"
                     )
                 
                 except Exception as e:
-                    logger.error(f"Error sending error report: {e}")
+                    logger.error("Error sending error report: %s", e)
         
         except Exception as e:
-            logger.error(f"Error in error handler: {e}")
+            logger.error("Error in error handler: %s", e)
     
     @property
     def is_running(self) -> bool:
@@ -189,13 +249,16 @@ class ZyraXBot:
         return self._running
     
     async def get_bot_info(self) -> dict:
-        """Get bot information"""
+        """Get bot information (cached after the first successful call)"""
         if not self.application:
             return {}
         
+        if self._bot_info is not None:
+            return self._bot_info
+        
         try:
             bot = await self.application.bot.get_me()
-            return {
+            self._bot_info = {
                 'id': bot.id,
                 'username': bot.username,
                 'first_name': bot.first_name,
@@ -203,9 +266,15 @@ class ZyraXBot:
                 'can_read_all_group_messages': bot.can_read_all_group_messages,
                 'supports_inline_queries': bot.supports_inline_queries
             }
+            return self._bot_info
         except Exception as e:
-            logger.error(f"Error getting bot info: {e}")
+            logger.error("Error getting bot info: %s", e)
             return {}
+    
+    async def refresh_bot_info(self) -> dict:
+        """Drop cached bot information and fetch it again"""
+        self._bot_info = None
+        return await self.get_bot_info()
 
 # Global bot instance
 bot_instance: Optional[ZyraXBot] = None
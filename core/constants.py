@@ -1,7 +1,9 @@
 """
 Constants and enums for ZyraX Bot
 """
-from enum import Enum
+import sys
+from enum import IntEnum, StrEnum, unique
+from types import MappingProxyType
 
 # Bot Information
 BOT_NAME = "ZyraX"
@@ -27,7 +29,8 @@ MAX_PHOTO_SIZE = 10 * 1024 * 1024  # 10MB
 MAX_DOCUMENT_SIZE = 50 * 1024 * 1024  # 50MB
 
 # Action Types
-class ActionType(Enum):
+@unique
+class ActionType(StrEnum):
     BAN = "ban"
     UNBAN = "unban"
     MUTE = "mute"
@@ -43,7 +46,8 @@ class ActionType(Enum):
     PURGE = "purge"
 
 # Lock Types
-class LockType(Enum):
+@unique
+class LockType(StrEnum):
     STICKER = "sticker"
     ANIMATION = "animation"
     MEDIA = "media"
@@ -67,7 +71,8 @@ class LockType(Enum):
     DICE = "dice"
 
 # Ban/Mute Modes
-class PunishmentMode(Enum):
+@unique
+class PunishmentMode(StrEnum):
     BAN = "ban"
     MUTE = "mute"
     KICK = "kick"
@@ -75,20 +80,23 @@ class PunishmentMode(Enum):
     NOTHING = "nothing"
 
 # Captcha Types
-class CaptchaType(Enum):
+@unique
+class CaptchaType(StrEnum):
     BUTTON = "button"
     MATH = "math"
     TEXT = "text"
 
 # Flood Modes
-class FloodMode(Enum):
+@unique
+class FloodMode(StrEnum):
     BAN = "ban"
     MUTE = "mute"
     KICK = "kick"
     WARN = "warn"
 
 # Log Categories
-class LogCategory(Enum):
+@unique
+class LogCategory(StrEnum):
     ADMIN = "admin"
     BAN = "ban"
     MUTE = "mute"
@@ -107,7 +115,8 @@ class LogCategory(Enum):
     FEDERATION = "federation"
 
 # Service Message Types
-class ServiceType(Enum):
+@unique
+class ServiceType(StrEnum):
     JOIN = "join"
     LEAVE = "leave"
     BOOST = "boost"
@@ -116,14 +125,16 @@ class ServiceType(Enum):
     ALL = "all"
 
 # Chat Types
-class ChatType(Enum):
+@unique
+class ChatType(StrEnum):
     PRIVATE = "private"
     GROUP = "group"
     SUPERGROUP = "supergroup"
     CHANNEL = "channel"
 
 # User Status
-class UserStatus(Enum):
+@unique
+class UserStatus(StrEnum):
     CREATOR = "creator"
     ADMINISTRATOR = "administrator"
     MEMBER = "member"
@@ -132,12 +143,14 @@ class UserStatus(Enum):
     KICKED = "kicked"
 
 # Button Types
-class ButtonType(Enum):
+@unique
+class ButtonType(StrEnum):
     URL = "url"
     CALLBACK = "callback"
 
 # File Types
-class FileType(Enum):
+@unique
+class FileType(StrEnum):
     PHOTO = "photo"
     VIDEO = "video"
     ANIMATION = "animation"
@@ -153,6 +166,19 @@ class FileType(Enum):
     DICE = "dice"
     GAME = "game"
 
+# Value -> member lookup tables for hot dispatch paths
+ACTION_LOOKUP = MappingProxyType({m.value: m for m in ActionType})
+LOCK_LOOKUP = MappingProxyType({m.value: m for m in LockType})
+PUNISHMENT_LOOKUP = MappingProxyType({m.value: m for m in PunishmentMode})
+CAPTCHA_LOOKUP = MappingProxyType({m.value: m for m in CaptchaType})
+FLOOD_LOOKUP = MappingProxyType({m.value: m for m in FloodMode})
+LOG_CATEGORY_LOOKUP = MappingProxyType({m.value: m for m in LogCategory})
+SERVICE_LOOKUP = MappingProxyType({m.value: m for m in ServiceType})
+CHAT_TYPE_LOOKUP = MappingProxyType({m.value: m for m in ChatType})
+USER_STATUS_LOOKUP = MappingProxyType({m.value: m for m in UserStatus})
+BUTTON_LOOKUP = MappingProxyType({m.value: m for m in ButtonType})
+FILE_TYPE_LOOKUP = MappingProxyType({m.value: m for m in FileType})
+
 # Permission flags
 ADMIN_PERMISSIONS = [
     "can_change_info",
@@ -178,23 +204,45 @@ TIME_PATTERNS = {
 }
 
 # Default messages
-DEFAULT_MESSAGES = {
-    "welcome": "Welcome {mention}! 👋",
-    "goodbye": "Goodbye {first}! 👋",
-    "rules": "No rules have been set for this chat.",
-    "ban_message": "Banned user {mention} from {chat}",
-    "unban_message": "Unbanned user {mention} from {chat}",
-    "mute_message": "Muted user {mention} in {chat}",
-    "unmute_message": "Unmuted user {mention} in {chat}",
-    "kick_message": "Kicked user {mention} from {chat}",
-    "warn_message": "⚠️ Warning {count}/{limit} for {mention}\nReason: {reason}",
-    "flood_message": "Flooding detected! Taking action against {mention}",
-    "captcha_message": "Welcome {mention}! Please solve the captcha below to verify you're human:",
-    "level_up": "🎉 Congratulations {mention}! You reached level {level}!"
-}
+@unique
+class DefaultMessage(IntEnum):
+    WELCOME = 0
+    GOODBYE = 1
+    RULES = 2
+    BAN_MESSAGE = 3
+    UNBAN_MESSAGE = 4
+    MUTE_MESSAGE = 5
+    UNMUTE_MESSAGE = 6
+    KICK_MESSAGE = 7
+    WARN_MESSAGE = 8
+    FLOOD_MESSAGE = 9
+    CAPTCHA_MESSAGE = 10
+    LEVEL_UP = 11
+
+DEFAULT_MSGS = (
+    "Welcome {mention}! 👋",
+    "Goodbye {first}! 👋",
+    "No rules have been set for this chat.",
+    "Banned user {mention} from {chat}",
+    "Unbanned user {mention} from {chat}",
+    "Muted user {mention} in {chat}",
+    "Unmuted user {mention} in {chat}",
+    "Kicked user {mention} from {chat}",
+    "⚠️ Warning {count}/{limit} for {mention}\nReason: {reason}",
+    "Flooding detected! Taking action against {mention}",
+    "Welcome {mention}! Please solve the captcha below to verify you're human:",
+    "🎉 Congratulations {mention}! You reached level {level}!"
+)
+
+def default_msg(code: DefaultMessage) -> str:
+    """Get default message template by code"""
+    return DEFAULT_MSGS[code]
 
-# Emoji constants
-EMOJIS = {
+# Name-keyed view kept for existing callers
+DEFAULT_MESSAGES = MappingProxyType({m.name.lower(): DEFAULT_MSGS[m] for m in DefaultMessage})
+
+# Emoji constants (interned so every template shares one copy)
+EMOJIS = MappingProxyType({k: sys.intern(v) for k, v in {
     "warning": "⚠️",
     "ban": "🔨",
     "mute": "🔇",
@@ -215,48 +263,98 @@ EMOJIS = {
     "gem": "💎",
     "money": "💰",
     "chart": "📊"
-}
+}.items()})
 
 # Error messages
-ERROR_MESSAGES = {
-    "no_permission": "❌ You don't have permission to use this command.",
-    "admin_only": "❌ This command is for admins only.",
-    "group_only": "❌ This command can only be used in groups.",
-    "private_only": "❌ This command can only be used in private chat.",
-    "user_not_found": "❌ User not found.",
-    "invalid_time": "❌ Invalid time format. Use: 1m, 2h, 3d, etc.",
-    "database_error": "❌ Database error occurred. Please try again later.",
-    "rate_limited": "❌ You're sending commands too fast. Please slow down.",
-    "feature_disabled": "❌ This feature is disabled in this chat.",
-    "federation_not_found": "❌ Federation not found.",
-    "already_banned": "❌ User is already banned.",
-    "not_banned": "❌ User is not banned.",
-    "cannot_ban_admin": "❌ Cannot ban an administrator.",
-    "cannot_restrict_admin": "❌ Cannot restrict an administrator.",
-    "bot_not_admin": "❌ I need to be an admin to perform this action.",
-    "insufficient_permissions": "❌ I don't have sufficient permissions.",
-}
+@unique
+class ErrorCode(IntEnum):
+    NO_PERMISSION = 0
+    ADMIN_ONLY = 1
+    GROUP_ONLY = 2
+    PRIVATE_ONLY = 3
+    USER_NOT_FOUND = 4
+    INVALID_TIME = 5
+    DATABASE_ERROR = 6
+    RATE_LIMITED = 7
+    FEATURE_DISABLED = 8
+    FEDERATION_NOT_FOUND = 9
+    ALREADY_BANNED = 10
+    NOT_BANNED = 11
+    CANNOT_BAN_ADMIN = 12
+    CANNOT_RESTRICT_ADMIN = 13
+    BOT_NOT_ADMIN = 14
+    INSUFFICIENT_PERMISSIONS = 15
+
+ERROR_MSGS = (
+    "❌ You don't have permission to use this command.",
+    "❌ This command is for admins only.",
+    "❌ This command can only be used in groups.",
+    "❌ This command can only be used in private chat.",
+    "❌ User not found.",
+    "❌ Invalid time format. Use: 1m, 2h, 3d, etc.",
+    "❌ Database error occurred. Please try again later.",
+    "❌ You're sending commands too fast. Please slow down.",
+    "❌ This feature is disabled in this chat.",
+    "❌ Federation not found.",
+    "❌ User is already banned.",
+    "❌ User is not banned.",
+    "❌ Cannot ban an administrator.",
+    "❌ Cannot restrict an administrator.",
+    "❌ I need to be an admin to perform this action.",
+    "❌ I don't have sufficient permissions."
+)
+
+def err(code: ErrorCode) -> str:
+    """Get error message by code"""
+    return ERROR_MSGS[code]
+
+# Name-keyed view kept for existing callers
+ERROR_MESSAGES = MappingProxyType({m.name.lower(): ERROR_MSGS[m] for m in ErrorCode})
 
 # Success messages
-SUCCESS_MESSAGES = {
-    "settings_updated": "✅ Settings updated successfully!",
-    "user_banned": "✅ User banned successfully.",
-    "user_unbanned": "✅ User unbanned successfully.",
-    "user_muted": "✅ User muted successfully.",
-    "user_unmuted": "✅ User unmuted successfully.",
-    "user_kicked": "✅ User kicked successfully.",
-    "user_warned": "✅ User warned successfully.",
-    "warning_removed": "✅ Warning removed successfully.",
-    "filter_added": "✅ Filter added successfully.",
-    "filter_removed": "✅ Filter removed successfully.",
-    "note_saved": "✅ Note saved successfully.",
-    "note_deleted": "✅ Note deleted successfully.",
-    "federation_created": "✅ Federation created successfully.",
-    "federation_deleted": "✅ Federation deleted successfully.",
-}
+@unique
+class SuccessCode(IntEnum):
+    SETTINGS_UPDATED = 0
+    USER_BANNED = 1
+    USER_UNBANNED = 2
+    USER_MUTED = 3
+    USER_UNMUTED = 4
+    USER_KICKED = 5
+    USER_WARNED = 6
+    WARNING_REMOVED = 7
+    FILTER_ADDED = 8
+    FILTER_REMOVED = 9
+    NOTE_SAVED = 10
+    NOTE_DELETED = 11
+    FEDERATION_CREATED = 12
+    FEDERATION_DELETED = 13
+
+SUCCESS_MSGS = (
+    "✅ Settings updated successfully!",
+    "✅ User banned successfully.",
+    "✅ User unbanned successfully.",
+    "✅ User muted successfully.",
+    "✅ User unmuted successfully.",
+    "✅ User kicked successfully.",
+    "✅ User warned successfully.",
+    "✅ Warning removed successfully.",
+    "✅ Filter added successfully.",
+    "✅ Filter removed successfully.",
+    "✅ Note saved successfully.",
+    "✅ Note deleted successfully.",
+    "✅ Federation created successfully.",
+    "✅ Federation deleted successfully."
+)
+
+def success_msg(code: SuccessCode) -> str:
+    """Get success message by code"""
+    return SUCCESS_MSGS[code]
+
+# Name-keyed view kept for existing callers
+SUCCESS_MESSAGES = MappingProxyType({m.name.lower(): SUCCESS_MSGS[m] for m in SuccessCode})
 
 # Help categories
-HELP_CATEGORIES = {
+HELP_CATEGORIES = MappingProxyType({
     "admin": "👑 Admin Commands",
     "moderation": "🔨 Moderation",
     "antiflood": "💧 Anti-Flood",
@@ -286,4 +384,4 @@ HELP_CATEGORIES = {
     "tickets": "🎫 Tickets",
     "suggestions": "💡 Suggestions",
     "stats": "📊 Statistics"
-}
+})
@@ -1,29 +1,56 @@
 """
 Database connection and management for ZyraX Bot
 """
+import copy
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set, Tuple
 from datetime import datetime
 import asyncio
+from weakref import WeakKeyDictionary, WeakValueDictionary
 
-import motor.motor_asyncio
-from pymongo import IndexModel, ASCENDING, DESCENDING
+from cachetools import TTLCache
+from pymongo import AsyncMongoClient, IndexModel, ASCENDING, DESCENDING, ReturnDocument
+from pymongo.asynchronous.database import AsyncDatabase
 from config import config
 
 logger = logging.getLogger(__name__)
 
+# In-process document cache settings
+CACHE_MAX_SIZE = 10_000
+CACHE_TTL = 60  # seconds
+
 class Database:
-    """MongoDB database manager using Motor (async PyMongo)"""
+    """MongoDB database manager using PyMongo's native asyncio client"""
     
     def __init__(self):
-        self.client: Optional[motor.motor_asyncio.AsyncIOMotorClient] = None
-        self.db: Optional[motor.motor_asyncio.AsyncIOMotorDatabase] = None
+        self.client: Optional[AsyncMongoClient] = None
+        self.db: Optional[AsyncDatabase] = None
         self._connected = False
+        # Clients are bound to the loop they were created on, so keep one per loop
+        self._clients: WeakKeyDictionary = WeakKeyDictionary()
+    
+    def client_for_loop(self) -> AsyncMongoClient:
+        """Get the shared client for the running event loop, creating it once"""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = AsyncMongoClient(
+                config.MONGODB_URI,
+                # Keep warm connections so bursts don't pay for handshakes
+                maxPoolSize=config.MONGODB_MAX_POOL_SIZE,
+                minPoolSize=config.MONGODB_MIN_POOL_SIZE,
+                maxIdleTimeMS=60_000,
+                serverSelectionTimeoutMS=5_000,
+                waitQueueTimeoutMS=2_000,
+                # Chat documents are large and repetitive - compress on the wire
+                compressors="zstd,zlib"
+            )
+        return client
     
     async def connect(self) -> bool:
         """Connect to MongoDB"""
         try:
-            self.client = motor.motor_asyncio.AsyncIOMotorClient(config.MONGODB_URI)
+            self.client = self.client_for_loop()
             # Extract database name from URI or use default
             # Handle both local and Atlas URIs
             if '/' in config.MONGODB_URI:
@@ -47,13 +74,21 @@ class Database:
             return True
             
         except Exception as e:
-            logger.error(f"Failed to connect to MongoDB: {e}")
+            logger.error("Failed to connect to MongoDB: %s", e)
             return False
     
+    async def has_string_ids(self) -> bool:
+        """Check for chats or users still keyed by string IDs from before migrate_ids.py"""
+        for name in ("chats", "users"):
+            if await self.db[name].find_one({"_id": {"$type": "string"}}, {"_id": 1}):
+                return True
+        return False
+    
     async def disconnect(self):
         """Disconnect from MongoDB"""
         if self.client:
-            self.client.close()
+            self._clients.pop(asyncio.get_running_loop(), None)
+            await self.client.close()
             self._connected = False
             logger.info("Disconnected from MongoDB")
     
@@ -64,74 +99,207 @@ class Database:
     
     async def _setup_indexes(self):
         """Setup database indexes for performance"""
-        try:
-            # Chats collection indexes
-            await self.db.chats.create_indexes([
-                IndexModel([("_id", ASCENDING)]),  # chat_id
+        indexes = {
+            "chats": [
                 IndexModel([("fed_id", ASCENDING)]),
                 IndexModel([("title", "text")])  # Text search on chat titles
-            ])
-            
-            # Users collection indexes
-            await self.db.users.create_indexes([
-                IndexModel([("_id", ASCENDING)]),  # user_id
+            ],
+            "users": [
                 IndexModel([("username", ASCENDING)]),
                 IndexModel([("chat_data", ASCENDING)])
-            ])
-            
-            # Federations collection indexes
-            await self.db.federations.create_indexes([
-                IndexModel([("_id", ASCENDING)]),  # fed_id
+            ],
+            "federations": [
                 IndexModel([("owner_id", ASCENDING)]),
                 IndexModel([("name", "text")])
-            ])
-            
-            # Filters collection indexes
-            await self.db.filters.create_indexes([
+            ],
+            "filters": [
                 IndexModel([("chat_id", ASCENDING), ("trigger", ASCENDING)]),
                 IndexModel([("chat_id", ASCENDING)]),
                 IndexModel([("created_at", DESCENDING)])
-            ])
-            
-            # Notes collection indexes
-            await self.db.notes.create_indexes([
+            ],
+            "notes": [
                 IndexModel([("chat_id", ASCENDING), ("name", ASCENDING)]),
                 IndexModel([("chat_id", ASCENDING)]),
                 IndexModel([("created_at", DESCENDING)])
-            ])
-            
-            # Blocklists collection indexes
-            await self.db.blocklists.create_indexes([
+            ],
+            "blocklists": [
                 IndexModel([("chat_id", ASCENDING), ("trigger", ASCENDING)]),
                 IndexModel([("chat_id", ASCENDING)]),
                 IndexModel([("created_at", DESCENDING)])
-            ])
-            
-            # Captcha pending collection indexes
-            await self.db.captcha_pending.create_indexes([
+            ],
+            "captcha_pending": [
                 IndexModel([("chat_id", ASCENDING), ("user_id", ASCENDING)]),
-                IndexModel([("expires_at", ASCENDING)])  # For cleanup
-            ])
-            
-            # Scheduled actions collection indexes
-            await self.db.scheduled_actions.create_indexes([
+                # TTL index - MongoDB deletes entries once expires_at has passed
+                IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0)
+            ],
+            "scheduled_actions": [
                 IndexModel([("execute_at", ASCENDING)]),
                 IndexModel([("chat_id", ASCENDING)]),
                 IndexModel([("user_id", ASCENDING)])
-            ])
-            
-            # Action logs collection indexes
-            await self.db.action_logs.create_indexes([
+            ],
+            "action_logs": [
+                # Equality fields first, then the sort key (ESR order)
                 IndexModel([("chat_id", ASCENDING), ("timestamp", DESCENDING)]),
-                IndexModel([("action_type", ASCENDING)]),
-                IndexModel([("performed_by", ASCENDING)]),
-                IndexModel([("target_user", ASCENDING)])
-            ])
-            
+                IndexModel([("chat_id", ASCENDING), ("action_type", ASCENDING), ("timestamp", DESCENDING)]),
+                IndexModel([("chat_id", ASCENDING), ("performed_by", ASCENDING), ("timestamp", DESCENDING)]),
+                IndexModel([("performed_by", ASCENDING), ("timestamp", DESCENDING)]),
+                IndexModel([("target_user", ASCENDING)]),
+                # Let MongoDB prune old entries so the hot index pages stay in memory
+                IndexModel(
+                    [("timestamp", ASCENDING)],
+                    expireAfterSeconds=config.ACTION_LOG_RETENTION_DAYS * 86400
+                )
+            ]
+        }
+        
+        # Collections are independent, so create their indexes concurrently
+        results = await asyncio.gather(
+            *(self.db[name].create_indexes(models) for name, models in indexes.items()),
+            return_exceptions=True
+        )
+        
+        failed = False
+        for name, result in zip(indexes, results):
+            if isinstance(result, Exception):
+                failed = True
+                logger.error("Failed to create indexes on %s: %s", name, result)
+        
+        if not failed:
             logger.info("Database indexes created successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to create indexes: {e}")
+
+# Default per-chat data stored under users.chat_data.<chat_id>
+DEFAULT_USER_CHAT_DATA = {
+    "approved": False,
+    "warnings": 0,
+    "warn_reasons": [],
+    "last_warn": None,
+    "message_count": 0,
+    "flood_start": None,
+    "xp": 0,
+    "level": 0,
+    "last_xp": None,
+    "balance": 0,
+    "bank": 0
+}
+
+# Default settings for a new chat, copied into each chats document
+DEFAULT_CHAT_SETTINGS = {
+    # Admin settings
+    "anon_admin": False,
+    "admin_error": True,
+    "admin_cache": [],
+    "admin_cache_updated": None,
+
+    # Antiflood
+    "flood_limit": 10,
+    "flood_mode": "mute",
+    "flood_timer": {"count": 10, "duration": 30},
+    "clear_flood": True,
+
+    # Antiraid
+    "antiraid_enabled": False,
+    "antiraid_duration": 21600,
+    "antiraid_action_time": 3600,
+    "auto_antiraid": 0,
+
+    # Locks - all disabled by default
+    "locks": {
+        "sticker": False, "animation": False, "media": False,
+        "url": False, "button": False, "forward": False,
+        "document": False, "photo": False, "video": False,
+        "audio": False, "voice": False, "contact": False,
+        "location": False, "rtl": False, "email": False,
+        "phone": False, "bot": False, "inline": False,
+        "game": False, "poll": False, "dice": False
+    },
+    "lock_warns": True,
+    "allowlist": [],
+
+    # Captcha
+    "captcha_enabled": False,
+    "captcha_mode": "button",
+    "captcha_rules": False,
+    "captcha_mute_time": 0,
+    "captcha_kick": False,
+    "captcha_kick_time": 0,
+
+    # Greetings
+    "welcome_enabled": True,
+    "welcome_text": "Welcome {mention}!",
+    "goodbye_enabled": False,
+    "goodbye_text": "Goodbye {first}!",
+    "clean_welcome": False,
+
+    # Warnings
+    "warn_mode": "ban",
+    "warn_limit": 3,
+    "warn_time": 0,
+
+    # Federations
+    "fed_id": None,
+    "quiet_fed": False,
+
+    # Logs
+    "log_channel_id": None,
+    "log_categories": [],
+
+    # Language
+    "language": "en",
+
+    # Clean service
+    "clean_service": {
+        "all": False, "join": False, "leave": False,
+        "boost": False, "location": False, "voice_chat": False
+    },
+
+    # Reports
+    "reports_enabled": True,
+
+    # Rules
+    "rules": None,
+    "private_rules": False,
+    "rules_button": "Rules",
+
+    # Disabled commands
+    "disabled_commands": [],
+    "disable_delete": False,
+    "disable_admin": False,
+
+    # Notes
+    "private_notes": False,
+
+    # Pins
+    "anti_channel_pin": False,
+    "clean_linked": False,
+
+    # Topics (for forum groups)
+    "action_topic_id": None,
+
+    # Connections
+    "connected_chat": None,
+
+    # Leveling
+    "leveling_enabled": False,
+    "level_up_message": "Congrats {mention}, you reached level {level}!"
+}
+
+def _insert_defaults(defaults: Dict[str, Any], fields: Set[str], prefix: str = "") -> Dict[str, Any]:
+    """
+    Flatten defaults into $setOnInsert paths that don't conflict with the $set fields
+    
+    A default is dropped only where its exact path is being set. Nested defaults
+    under a dotted $set field are kept as their own dotted paths.
+    """
+    paths = {}
+    for name, value in defaults.items():
+        path = prefix + name
+        if path in fields:
+            continue
+        if isinstance(value, dict) and any(field.startswith(path + ".") for field in fields):
+            paths.update(_insert_defaults(value, fields, path + "."))
+        else:
+            paths[path] = value
+    return paths
 
 # Collection wrappers with common operations
 class ChatCollection:
@@ -139,155 +307,137 @@ class ChatCollection:
     
     def __init__(self, db):
         self.collection = db.chats
+        self._cache: TTLCache = TTLCache(maxsize=CACHE_MAX_SIZE, ttl=CACHE_TTL)
+        # Per-chat locks, dropped automatically once no coroutine holds them
+        self._locks: WeakValueDictionary = WeakValueDictionary()
+    
+    def invalidate(self, chat_id: int):
+        """Drop a chat from the in-process cache"""
+        self._cache.pop(int(chat_id), None)
     
     async def get_chat(self, chat_id: int) -> Optional[Dict[str, Any]]:
         """Get chat by ID"""
-        return await self.collection.find_one({"_id": str(chat_id)})
+        key = int(chat_id)
+        chat = self._cache.get(key)
+        if chat is not None:
+            return chat
+        
+        chat = await self.collection.find_one({"_id": key})
+        if chat is not None:
+            self._cache[key] = chat
+        return chat
     
-    async def create_chat(self, chat_id: int, chat_type: str, title: str) -> Dict[str, Any]:
-        """Create new chat with default settings"""
+    async def get_chat_fields(self, chat_id: int, fields: List[str]) -> Dict[str, Any]:
+        """Get only the given fields of a chat (empty dict if the chat is unknown)"""
+        key = int(chat_id)
+        chat = self._cache.get(key)
+        if chat is not None:
+            return {field: chat[field] for field in fields if field in chat}
+        
+        # Fetch a projection rather than the full settings document
+        chat = await self.collection.find_one({"_id": key}, {field: 1 for field in fields})
+        return chat or {}
+    
+    @staticmethod
+    def _chat_defaults(chat_type: str, title: str) -> Dict[str, Any]:
+        """Build default settings for a new chat (without _id)"""
         now = datetime.utcnow()
-        chat_data = {
-            "_id": str(chat_id),
+        return {
             "chat_type": chat_type,
             "title": title,
-            
-            # Admin settings
-            "anon_admin": False,
-            "admin_error": True,
-            "admin_cache": [],
-            "admin_cache_updated": None,
-            
-            # Antiflood
-            "flood_limit": 10,
-            "flood_mode": "mute",
-            "flood_timer": {"count": 10, "duration": 30},
-            "clear_flood": True,
-            
-            # Antiraid
-            "antiraid_enabled": False,
-            "antiraid_duration": 21600,
-            "antiraid_action_time": 3600,
-            "auto_antiraid": 0,
-            
-            # Locks - all disabled by default
-            "locks": {
-                "sticker": False, "animation": False, "media": False,
-                "url": False, "button": False, "forward": False,
-                "document": False, "photo": False, "video": False,
-                "audio": False, "voice": False, "contact": False,
-                "location": False, "rtl": False, "email": False,
-                "phone": False, "bot": False, "inline": False,
-                "game": False, "poll": False, "dice": False
-            },
-            "lock_warns": True,
-            "allowlist": [],
-            
-            # Captcha
-            "captcha_enabled": False,
-            "captcha_mode": "button",
-            "captcha_rules": False,
-            "captcha_mute_time": 0,
-            "captcha_kick": False,
-            "captcha_kick_time": 0,
-            
-            # Greetings
-            "welcome_enabled": True,
-            "welcome_text": "Welcome {mention}!",
-            "goodbye_enabled": False,
-            "goodbye_text": "Goodbye {first}!",
-            "clean_welcome": False,
-            
-            # Warnings
-            "warn_mode": "ban",
-            "warn_limit": 3,
-            "warn_time": 0,
-            
-            # Federations
-            "fed_id": None,
-            "quiet_fed": False,
-            
-            # Logs
-            "log_channel_id": None,
-            "log_categories": [],
-            
-            # Language
-            "language": "en",
-            
-            # Clean service
-            "clean_service": {
-                "all": False, "join": False, "leave": False,
-                "boost": False, "location": False, "voice_chat": False
-            },
-            
-            # Reports
-            "reports_enabled": True,
-            
-            # Rules
-            "rules": None,
-            "private_rules": False,
-            "rules_button": "Rules",
-            
-            # Disabled commands
-            "disabled_commands": [],
-            "disable_delete": False,
-            "disable_admin": False,
-            
-            # Notes
-            "private_notes": False,
-            
-            # Pins
-            "anti_channel_pin": False,
-            "clean_linked": False,
-            
-            # Topics (for forum groups)
-            "action_topic_id": None,
-            
-            # Connections
-            "connected_chat": None,
-            
-            # Leveling
-            "leveling_enabled": False,
-            "level_up_message": "Congrats {mention}, you reached level {level}!",
-            
+            **copy.deepcopy(DEFAULT_CHAT_SETTINGS),
             "created_at": now,
             "updated_at": now
         }
+    
+    async def create_chat(self, chat_id: int, chat_type: str, title: str) -> Dict[str, Any]:
+        """Create new chat with default settings"""
+        chat_data = {"_id": int(chat_id), **self._chat_defaults(chat_type, title)}
         
         await self.collection.insert_one(chat_data)
+        self._cache[chat_data["_id"]] = chat_data
         return chat_data
     
-    async def update_chat(self, chat_id: int, update_data: Dict[str, Any]) -> bool:
-        """Update chat settings"""
-        update_data["updated_at"] = datetime.utcnow()
-        result = await self.collection.update_one(
-            {"_id": str(chat_id)},
-            {"$set": update_data}
-        )
-        return result.modified_count > 0
+    async def update_chat(self, chat_id: int, update_data: Dict[str, Any], upsert: bool = False) -> bool:
+        """Update chat settings, optionally creating the chat with defaults"""
+        key = int(chat_id)
+        # updated_at is stamped by the server
+        update = {"$set": update_data, "$currentDate": {"updated_at": True}}
+        
+        if upsert:
+            defaults = self._chat_defaults("supergroup", "Unknown")
+            del defaults["updated_at"]
+            update["$setOnInsert"] = _insert_defaults(defaults, set(update_data))
+        
+        result = await self.collection.update_one({"_id": key}, update, upsert=upsert)
+        
+        # Write through to the cached document
+        cached = self._cache.get(key)
+        if cached is not None:
+            if any("." in field for field in update_data):
+                # Dotted paths are easier to refetch than to patch in place
+                self.invalidate(chat_id)
+            else:
+                cached.update(update_data)
+                cached["updated_at"] = datetime.utcnow()
+        
+        return result.modified_count > 0 or result.upserted_id is not None
     
     async def get_or_create_chat(self, chat_id: int, chat_type: str = "supergroup", title: str = "Unknown") -> Dict[str, Any]:
         """Get existing chat or create new one"""
-        chat = await self.get_chat(chat_id)
-        if not chat:
-            chat = await self.create_chat(chat_id, chat_type, title)
-        return chat
+        key = int(chat_id)
+        chat = self._cache.get(key)
+        if chat is not None:
+            return chat
+        
+        # Concurrent misses for the same chat share one upsert
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        
+        async with lock:
+            chat = self._cache.get(key)
+            if chat is not None:
+                return chat
+            
+            # Single atomic upsert - defaults are only written if the chat is new
+            chat = await self.collection.find_one_and_update(
+                {"_id": key},
+                {"$setOnInsert": self._chat_defaults(chat_type, title)},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            self._cache[key] = chat
+            return chat
 
 class UserCollection:
     """User data operations"""
     
     def __init__(self, db):
         self.collection = db.users
+        self._cache: TTLCache = TTLCache(maxsize=CACHE_MAX_SIZE, ttl=CACHE_TTL)
+    
+    def invalidate(self, user_id: int):
+        """Drop a user from the in-process cache"""
+        self._cache.pop(int(user_id), None)
     
     async def get_user(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get user by ID"""
-        return await self.collection.find_one({"_id": str(user_id)})
+        key = int(user_id)
+        user = self._cache.get(key)
+        if user is not None:
+            return user
+        
+        user = await self.collection.find_one({"_id": key})
+        if user is not None:
+            self._cache[key] = user
+        return user
     
-    async def create_user(self, user_id: int, username: str = None, first_name: str = "", last_name: str = "") -> Dict[str, Any]:
-        """Create new user"""
+    @staticmethod
+    def _user_defaults(username: str = None, first_name: str = "", last_name: str = "") -> Dict[str, Any]:
+        """Build default data for a new user (without _id)"""
         now = datetime.utcnow()
-        user_data = {
-            "_id": str(user_id),
+        return {
             "username": username,
             "first_name": first_name,
             "last_name": last_name,
@@ -296,79 +446,206 @@ class UserCollection:
             "created_at": now,
             "updated_at": now
         }
+    
+    async def create_user(self, user_id: int, username: str = None, first_name: str = "", last_name: str = "") -> Dict[str, Any]:
+        """Create new user"""
+        user_data = {"_id": int(user_id), **self._user_defaults(username, first_name, last_name)}
         
         await self.collection.insert_one(user_data)
+        self._cache[user_data["_id"]] = user_data
         return user_data
     
     async def update_user(self, user_id: int, update_data: Dict[str, Any]) -> bool:
         """Update user data"""
-        update_data["updated_at"] = datetime.utcnow()
+        key = int(user_id)
+        # updated_at is stamped by the server
         result = await self.collection.update_one(
-            {"_id": str(user_id)},
-            {"$set": update_data}
+            {"_id": key},
+            {"$set": update_data, "$currentDate": {"updated_at": True}}
         )
+        
+        # Write through to the cached document
+        cached = self._cache.get(key)
+        if cached is not None:
+            cached.update(update_data)
+        
         return result.modified_count > 0
     
     async def get_or_create_user(self, user_id: int, username: str = None, first_name: str = "", last_name: str = "") -> Dict[str, Any]:
         """Get existing user or create new one"""
-        user = await self.get_user(user_id)
-        if not user:
-            user = await self.create_user(user_id, username, first_name, last_name)
+        key = int(user_id)
+        user = self._cache.get(key)
+        if user is not None:
+            return user
+        
+        # Single atomic upsert - defaults are only written if the user is new
+        user = await self.collection.find_one_and_update(
+            {"_id": key},
+            {"$setOnInsert": self._user_defaults(username, first_name, last_name)},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        self._cache[key] = user
         return user
     
+    async def is_approved(self, user_id: int, chat_id: int) -> bool:
+        """Check whether a user is approved in a chat"""
+        key = int(user_id)
+        chat_id_str = str(chat_id)
+        user = self._cache.get(key)
+        if user is not None and chat_id_str in user.get("chat_data", {}):
+            return user["chat_data"][chat_id_str].get("approved", False)
+        
+        user = await self.collection.find_one(
+            {"_id": key},
+            {f"chat_data.{chat_id_str}.approved": 1}
+        )
+        if not user:
+            return False
+        return user.get("chat_data", {}).get(chat_id_str, {}).get("approved", False)
+    
     async def get_user_chat_data(self, user_id: int, chat_id: int) -> Dict[str, Any]:
         """Get user's data for specific chat"""
-        user = await self.get_or_create_user(user_id)
+        key = int(user_id)
         chat_id_str = str(chat_id)
         
-        if chat_id_str not in user.get("chat_data", {}):
-            # Initialize chat data for user
-            default_chat_data = {
-                "approved": False,
-                "warnings": 0,
-                "warn_reasons": [],
-                "last_warn": None,
-                "message_count": 0,
-                "flood_start": None,
-                "xp": 0,
-                "level": 0,
-                "last_xp": None,
-                "balance": 0,
-                "bank": 0
-            }
-            
-            await self.collection.update_one(
-                {"_id": str(user_id)},
-                {"$set": {f"chat_data.{chat_id_str}": default_chat_data}}
-            )
-            
-            return default_chat_data
+        user = self._cache.get(key)
+        if user is not None and chat_id_str in user.get("chat_data", {}):
+            return user["chat_data"][chat_id_str]
+        
+        # Fill in the chat entry (and a new user's defaults) only where missing,
+        # fetching just that subtree in the same round trip
+        path = f"chat_data.{chat_id_str}"
+        defaults = {**self._user_defaults(), path: DEFAULT_USER_CHAT_DATA}
+        defaults.pop("chat_data")
+        
+        doc = await self.collection.find_one_and_update(
+            {"_id": key},
+            [{"$set": {
+                field: {"$ifNull": [f"${field}", {"$literal": value}]}
+                for field, value in defaults.items()
+            }}],
+            projection={path: 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        chat_data = doc["chat_data"][chat_id_str]
+        
+        if user is not None:
+            user.setdefault("chat_data", {})[chat_id_str] = chat_data
         
-        return user["chat_data"][chat_id_str]
+        return chat_data
     
     async def update_user_chat_data(self, user_id: int, chat_id: int, update_data: Dict[str, Any]) -> bool:
         """Update user's chat-specific data"""
         chat_id_str = str(chat_id)
         
-        # Ensure user exists first
-        await self.get_or_create_user(user_id)
-        
         # Update specific chat data
         update_dict = {}
         for key, value in update_data.items():
             update_dict[f"chat_data.{chat_id_str}.{key}"] = value
         
-        update_dict["updated_at"] = datetime.utcnow()
+        # Create the user in the same round trip; paths already written by
+        # $set/$currentDate must not be repeated in $setOnInsert or they conflict
+        defaults = self._user_defaults()
+        del defaults["chat_data"], defaults["updated_at"]
         
         result = await self.collection.update_one(
-            {"_id": str(user_id)},
-            {"$set": update_dict}
+            {"_id": int(user_id)},
+            {
+                "$set": update_dict,
+                "$currentDate": {"updated_at": True},
+                "$setOnInsert": defaults
+            },
+            upsert=True
         )
-        return result.modified_count > 0
+        
+        # Nested paths are easier to refetch than to patch in place
+        self.invalidate(user_id)
+        
+        return result.modified_count > 0 or result.upserted_id is not None
+
+# Queued by ActionLogBuffer.stop() to end the flusher loop
+_STOP = object()
+
+class ActionLogBuffer:
+    """Buffer action log documents and write them to MongoDB in batches"""
+    
+    def __init__(self, max_batch: int = 500, flush_interval: float = 0.2):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.collection = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self, db):
+        """Start the background flusher"""
+        self.collection = db.action_logs
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Stop the background flusher and write out anything still queued"""
+        if self._task is not None:
+            # Let the flusher write its partial batch and exit instead of cancelling it mid-write
+            self.queue.put_nowait(_STOP)
+            await self._task
+            self._task = None
+        
+        batch = []
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        if batch:
+            await self._write(batch)
+    
+    def put_nowait(self, log_data: Dict[str, Any]):
+        """Queue a log document without waiting for the write"""
+        self.queue.put_nowait(log_data)
+    
+    async def _drain(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """Wait for at least one document, then collect more until the batch is full or the interval passes
+        
+        Returns the batch and whether the stop sentinel was reached
+        """
+        item = await self.queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        
+        try:
+            async with asyncio.timeout(self.flush_interval):
+                while len(batch) < self.max_batch:
+                    item = await self.queue.get()
+                    if item is _STOP:
+                        return batch, True
+                    batch.append(item)
+        except TimeoutError:
+            pass
+        
+        return batch, False
+    
+    async def _run(self):
+        """Flush batches until stop() queues the sentinel"""
+        while True:
+            batch, stopping = await self._drain()
+            if batch:
+                await self._write(batch)
+            if stopping:
+                return
+    
+    async def _write(self, batch: List[Dict[str, Any]]):
+        """Insert a batch of log documents"""
+        try:
+            await self.collection.insert_many(batch, ordered=False)
+        except Exception as e:
+            logger.error("Failed to write %s action logs: %s", len(batch), e)
 
 # Global database instance
 database = Database()
 
+# Global action log buffer
+action_log_buffer = ActionLogBuffer()
+
 # Collection instances
 chats: Optional[ChatCollection] = None
 users: Optional[UserCollection] = None
@@ -378,13 +655,20 @@ async def init_database():
     global chats, users
     
     if await database.connect():
+        # String-keyed documents would be invisible to the int _id lookups
+        if await database.has_string_ids():
+            logger.error("Found chats/users with string _id values - stop the bot and run `python migrate_ids.py` first")
+            return False
+        
         chats = ChatCollection(database.db)
         users = UserCollection(database.db)
+        action_log_buffer.start(database.db)
         return True
     return False
 
 async def close_database():
     """Close database connection"""
+    await action_log_buffer.stop()
     await database.disconnect()
 
 # Utility functions for common operations
@@ -394,11 +678,17 @@ async def get_chat_settings(chat_id: int) -> Dict[str, Any]:
         raise RuntimeError("Database not initialized")
     return await chats.get_or_create_chat(chat_id)
 
+async def get_chat_fields(chat_id: int, *fields: str) -> Dict[str, Any]:
+    """Get selected chat settings without loading the whole document"""
+    if not chats:
+        raise RuntimeError("Database not initialized")
+    return await chats.get_chat_fields(chat_id, list(fields))
+
 async def update_chat_setting(chat_id: int, setting: str, value: Any) -> bool:
     """Update a single chat setting"""
     if not chats:
         raise RuntimeError("Database not initialized")
-    return await chats.update_chat(chat_id, {setting: value})
+    return await chats.update_chat(chat_id, {setting: value}, upsert=True)
 
 async def get_user_data(user_id: int, chat_id: int = None) -> Dict[str, Any]:
     """Get user data, optionally with chat-specific data"""
@@ -415,3 +705,9 @@ async def update_user_data(user_id: int, chat_id: int, **kwargs) -> bool:
     if not users:
         raise RuntimeError("Database not initialized")
     return await users.update_user_chat_data(user_id, chat_id, kwargs)
+
+async def is_user_approved(user_id: int, chat_id: int) -> bool:
+    """Check if a user is approved in a chat"""
+    if not users:
+        raise RuntimeError("Database not initialized")
+    return await users.is_approved(user_id, chat_id)
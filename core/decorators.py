@@ -1,22 +1,27 @@
 """
 Decorators for command permission checking and validation
 """
+import asyncio
 import functools
 import logging
-from typing import List, Optional, Callable, Any
-from datetime import datetime
+from collections import deque
+from time import monotonic, time_ns
+from typing import Dict, List, Optional, Callable, Any
+
+from bson.datetime_ms import DatetimeMS
 
 try:
     from telegram import Update
     from telegram.ext import ContextTypes
     from telegram.constants import ChatType
+    from telegram.error import RetryAfter
 except ImportError:
     # Handle case where telegram is not installed yet
     pass
 
 from core.helpers import PermissionChecker, ValidationHelper, MessageHelper
 from core.constants import ERROR_MESSAGES
-from core.database import get_chat_settings
+from core.database import get_chat_fields
 
 logger = logging.getLogger(__name__)
 
@@ -30,21 +35,25 @@ def admin_required(permissions: List[str] = None):
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
-            # Check if user is admin
-            if not await PermissionChecker.is_user_admin(update, context):
+            # Admin status and specific permissions are independent lookups,
+            # so run them concurrently
+            is_admin, *granted = await asyncio.gather(
+                PermissionChecker.is_user_admin(update, context),
+                *(PermissionChecker.has_permission(update, context, permission)
+                  for permission in permissions or ())
+            )
+            
+            if not is_admin:
                 await MessageHelper.send_message(
                     update, context, ERROR_MESSAGES["admin_only"]
                 )
                 return
             
-            # Check specific permissions if provided
-            if permissions:
-                for permission in permissions:
-                    if not await PermissionChecker.has_permission(update, context, permission):
-                        await MessageHelper.send_message(
-                            update, context, ERROR_MESSAGES["insufficient_permissions"]
-                        )
-                        return
+            if not all(granted):
+                await MessageHelper.send_message(
+                    update, context, ERROR_MESSAGES["insufficient_permissions"]
+                )
+                return
             
             return await func(update, context)
         
@@ -99,8 +108,7 @@ def owner_only(func: Callable) -> Callable:
     """Decorator to restrict command to bot owner only"""
     @functools.wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
-        owner_id = context.bot_data.get('owner_id')
-        if not owner_id or update.effective_user.id != owner_id:
+        if not PermissionChecker.is_bot_owner(update.effective_user.id):
             await MessageHelper.send_message(
                 update, context, ERROR_MESSAGES["no_permission"]
             )
@@ -119,29 +127,22 @@ def rate_limit(max_calls: int = 5, window_seconds: int = 60):
         window_seconds: Time window in seconds
     """
     def decorator(func: Callable) -> Callable:
+        # Per-process call history for this command, keyed by user ID
+        call_log: Dict[int, deque] = {}
+        
         @functools.wraps(func)
         async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
             user_id = update.effective_user.id
-            current_time = context.application.bot_data.get('current_time', 0)
-            
-            # Initialize rate limit data if not exists
-            if 'rate_limits' not in context.bot_data:
-                context.bot_data['rate_limits'] = {}
-            
-            rate_limits = context.bot_data['rate_limits']
+            now = monotonic()
             
-            # Get user's call history
-            func_name = func.__name__
-            key = f"{user_id}_{func_name}"
-            
-            if key not in rate_limits:
-                rate_limits[key] = []
-            
-            call_times = rate_limits[key]
+            call_times = call_log.get(user_id)
+            if call_times is None:
+                call_times = call_log[user_id] = deque(maxlen=max_calls + 1)
             
             # Remove old calls outside window
-            cutoff_time = current_time - window_seconds
-            call_times[:] = [t for t in call_times if t > cutoff_time]
+            cutoff_time = now - window_seconds
+            while call_times and call_times[0] <= cutoff_time:
+                call_times.popleft()
             
             # Check if limit exceeded
             if len(call_times) >= max_calls:
@@ -151,7 +152,7 @@ def rate_limit(max_calls: int = 5, window_seconds: int = 60):
                 return
             
             # Add current call
-            call_times.append(current_time)
+            call_times.append(now)
             
             return await func(update, context)
         
@@ -182,6 +183,13 @@ def require_args(min_args: int = 1, usage: str = None):
         return wrapper
     return decorator
 
+# Features with their own on/off setting: (setting, default, message when off)
+_FEATURE_CHECKS = {
+    'captcha': ('captcha_enabled', False, "❌ Captcha is not enabled in this chat."),
+    'leveling': ('leveling_enabled', False, "❌ Leveling is not enabled in this chat."),
+    'reports': ('reports_enabled', True, "❌ Reports are disabled in this chat."),
+}
+
 def feature_enabled(feature_name: str):
     """
     Decorator to check if a feature is enabled in the chat
@@ -189,13 +197,18 @@ def feature_enabled(feature_name: str):
     Args:
         feature_name: Name of the feature to check
     """
+    # Resolve the feature-specific toggle once, not on every call
+    toggle = _FEATURE_CHECKS.get(feature_name)
+    
+    fields = ('disabled_commands', toggle[0]) if toggle else ('disabled_commands',)
+    
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
             chat_id = update.effective_chat.id
             
             try:
-                chat_settings = await get_chat_settings(chat_id)
+                chat_settings = await get_chat_fields(chat_id, *fields)
                 
                 # Check if feature is disabled
                 if feature_name in chat_settings.get('disabled_commands', []):
@@ -204,27 +217,15 @@ def feature_enabled(feature_name: str):
                     )
                     return
                 
-                # Feature-specific checks
-                if feature_name == 'captcha' and not chat_settings.get('captcha_enabled', False):
-                    await MessageHelper.send_message(
-                        update, context, "❌ Captcha is not enabled in this chat."
-                    )
-                    return
-                
-                if feature_name == 'leveling' and not chat_settings.get('leveling_enabled', False):
-                    await MessageHelper.send_message(
-                        update, context, "❌ Leveling is not enabled in this chat."
-                    )
-                    return
-                
-                if feature_name == 'reports' and not chat_settings.get('reports_enabled', True):
-                    await MessageHelper.send_message(
-                        update, context, "❌ Reports are disabled in this chat."
-                    )
-                    return
+                # Feature-specific toggle
+                if toggle:
+                    enabled_key, default_enabled, disabled_message = toggle
+                    if not chat_settings.get(enabled_key, default_enabled):
+                        await MessageHelper.send_message(update, context, disabled_message)
+                        return
                 
             except Exception as e:
-                logger.error(f"Error checking feature {feature_name}: {e}")
+                logger.error("Error checking feature %s: %s", feature_name, e)
                 # Continue execution if database error
             
             return await func(update, context)
@@ -247,7 +248,7 @@ def log_action(action_type: str):
             
             # Log the action
             try:
-                from core.database import database
+                from core.database import database, action_log_buffer
                 
                 if database.is_connected:
                     log_data = {
@@ -257,7 +258,8 @@ def log_action(action_type: str):
                         "target_user": None,  # To be filled by the function
                         "reason": None,       # To be filled by the function
                         "metadata": {},       # Additional data
-                        "timestamp": datetime.utcnow()
+                        # Epoch milliseconds - BSON encodes this without a datetime round trip
+                        "timestamp": DatetimeMS(time_ns() // 1_000_000)
                     }
                     
                     # Try to extract target user and reason from context
@@ -265,46 +267,75 @@ def log_action(action_type: str):
                         log_data.update(context.action_log_data)
                         delattr(context, 'action_log_data')
                     
-                    await database.db.action_logs.insert_one(log_data)
+                    # Written in the background by the batch flusher
+                    action_log_buffer.put_nowait(log_data)
                 
             except Exception as e:
-                logger.error(f"Error logging action {action_type}: {e}")
+                logger.error("Error logging action %s: %s", action_type, e)
             
             return result
         
         return wrapper
     return decorator
 
+# At most this many developer error reports per window, to spare the dev chat
+# during an incident
+DEV_REPORT_LIMIT = 10
+DEV_REPORT_WINDOW = 60  # seconds
+_dev_reports: deque = deque(maxlen=DEV_REPORT_LIMIT)
+
+def _should_report() -> bool:
+    """Record a developer report if the rate limit allows it"""
+    now = monotonic()
+    while _dev_reports and _dev_reports[0] <= now - DEV_REPORT_WINDOW:
+        _dev_reports.popleft()
+    
+    if len(_dev_reports) >= DEV_REPORT_LIMIT:
+        return False
+    
+    _dev_reports.append(now)
+    return True
+
+async def _report_error(context: ContextTypes.DEFAULT_TYPE, dev_chat_id: int, text: str):
+    """Send an error report to the developer chat"""
+    try:
+        await context.bot.send_message(
+            chat_id=dev_chat_id,
+            text=text,
+            parse_mode="Markdown"
+        )
+    except Exception:
+        pass  # Don't fail if error reporting fails
+
 def handle_errors(func: Callable) -> Callable:
     """Decorator to handle and log errors gracefully"""
     @functools.wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Any:
         try:
             return await func(update, context)
+        except RetryAfter as e:
+            # Flood control - replying now would only extend the wait
+            logger.warning("Flood wait in %s, retry after %ss", func.__name__, e.retry_after)
         except Exception as e:
-            logger.error(f"Error in {func.__name__}: {e}", exc_info=True)
+            logger.exception("Error in %s: %s", func.__name__, e)
             
             # Send user-friendly error message
             await MessageHelper.send_message(
                 update, context, ERROR_MESSAGES["database_error"]
             )
             
-            # Report error to developer if configured
+            # Report error to developer if configured, without waiting on it
             dev_chat_id = context.bot_data.get('dev_chat_id')
-            if dev_chat_id:
-                try:
-                    error_msg = f"🚨 **Error in {func.__name__}**\n\n"
-                    error_msg += f"**User:** {update.effective_user.id}\n"
-                    error_msg += f"**Chat:** {update.effective_chat.id}\n"
-                    error_msg += f"**Error:** `{str(e)}`"
-                    
-                    await context.bot.send_message(
-                        chat_id=dev_chat_id,
-                        text=error_msg,
-                        parse_mode="Markdown"
-                    )
-                except:
-                    pass  # Don't fail if error reporting fails
+            if dev_chat_id and _should_report():
+                error_msg = (
+                    f"🚨 **Error in {func.__name__}**\n\n"
+                    f"**User:** {update.effective_user.id}\n"
+                    f"**Chat:** {update.effective_chat.id}\n"
+                    f"**Error:** `{e}`"
+                )
+                context.application.create_task(
+                    _report_error(context, dev_chat_id, error_msg), update=update
+                )
     
     return wrapper
 
@@ -321,14 +352,13 @@ def approved_or_admin(func: Callable) -> Callable:
         
         # Check if user is approved
         try:
-            from core.database import get_user_data
-            user_data = await get_user_data(user_id, chat_id)
+            from core.database import is_user_approved
             
-            if user_data.get('approved', False):
+            if await is_user_approved(user_id, chat_id):
                 return await func(update, context)
         
         except Exception as e:
-            logger.error(f"Error checking approval status: {e}")
+            logger.error("Error checking approval status: %s", e)
         
         await MessageHelper.send_message(
             update, context, ERROR_MESSAGES["no_permission"]
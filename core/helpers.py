@@ -1,12 +1,20 @@
 """
 Helper functions for ZyraX Bot
 """
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Union, Tuple
-from datetime import datetime, timedelta
-from telegram import Update, User, Chat, ChatMember
+import re
+from time import monotonic
+from functools import partial
+from itertools import islice
+from typing import Dict, Any, Optional, List, Union, Tuple, Iterable, Callable, Awaitable
+from datetime import datetime
+
+from cachetools import TTLCache
+from telegram import Update, User, Chat, ChatMember, ChatPermissions
 from telegram.ext import ContextTypes
 from telegram.constants import ChatType, ChatMemberStatus
+from telegram.error import BadRequest, TelegramError
 
 from core.database import get_chat_settings, get_user_data
 from utils.user_resolver import UserResolver
@@ -14,412 +22,588 @@ from utils.time_parser import TimeParser
 
 logger = logging.getLogger(__name__)
 
-class PermissionChecker:
-    """Check user permissions in chat"""
+# Chat administrator lists, refreshed every 10 minutes
+_ADMIN_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=600)
+
+# Permissions for a full mute, the restrict_user default
+_MUTE_PERMS = ChatPermissions(
+    can_send_messages=False,
+    can_send_audios=False,
+    can_send_documents=False,
+    can_send_photos=False,
+    can_send_videos=False,
+    can_send_video_notes=False,
+    can_send_voice_notes=False,
+    can_send_polls=False,
+    can_send_other_messages=False,
+    can_add_web_page_previews=False
+)
+
+# General purpose cache behind get_from_cache/set_cache, one bucket per key
+# prefix (the part before the first "_") so a prefix can be cleared without
+# scanning other keys.
+# Entries are (stored_at, data) and live at most 10 minutes whatever
+# max_age_seconds a reader asks for
+_CACHE_BUCKETS: Dict[str, TTLCache] = {}
+
+def _cache_bucket(key: str, create: bool = False) -> Optional[TTLCache]:
+    """Get the cache bucket for a key's prefix"""
+    prefix = key.split('_', 1)[0]
+    bucket = _CACHE_BUCKETS.get(prefix)
+    if bucket is None and create:
+        bucket = _CACHE_BUCKETS[prefix] = TTLCache(maxsize=4096, ttl=600)
+    return bucket
+
+_URL_RE = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+# Telegram lookups currently in flight, so concurrent callers share one request
+_inflight: Dict[Any, asyncio.Future] = {}
+
+async def _single_flight(key: Any, fetch):
+    """Run fetch() once for all concurrent callers using the same key"""
+    future = _inflight.get(key)
+    if future is not None:
+        # Shielded so a cancelled follower doesn't cancel the shared lookup
+        return await asyncio.shield(future)
     
-    @staticmethod
-    async def is_user_admin(
-        update: Update, 
-        context: ContextTypes.DEFAULT_TYPE, 
-        user_id: int = None,
-        chat_id: int = None
-    ) -> bool:
-        """Check if user is admin in chat"""
-        try:
-            if user_id is None:
-                user_id = update.effective_user.id
-            if chat_id is None:
-                chat_id = update.effective_chat.id
-            
-            # Bot owner is always admin
-            if user_id == context.bot_data.get('owner_id'):
-                return True
-            
-            # Get chat member
-            member = await context.bot.get_chat_member(chat_id, user_id)
-            return member.status in [ChatMemberStatus.OWNER, ChatMemberStatus.ADMINISTRATOR]
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await fetch()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # Mark as retrieved in case nobody else was waiting
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        del _inflight[key]
+
+# Bulk moderation actions in flight at once, well under the Bot API's ~30 req/s
+BULK_CONCURRENCY = 20
+
+async def _bounded_gather(calls: Iterable[Callable[[], Awaitable[Any]]]) -> List[Any]:
+    """Run calls concurrently, at most BULK_CONCURRENCY at a time, keeping order"""
+    semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+    
+    async def run(call):
+        async with semaphore:
+            return await call()
+    
+    return await asyncio.gather(*(run(call) for call in calls))
+
+# Bot owner and bot user IDs, set once at startup by configure_permissions()
+_OWNER_ID: Optional[int] = None
+_BOT_ID: Optional[int] = None
+
+def configure_permissions(owner_id: Optional[int], bot_id: int):
+    """Record the bot owner and bot user IDs used by permission checks"""
+    global _OWNER_ID, _BOT_ID
+    _OWNER_ID = owner_id
+    _BOT_ID = bot_id
+
+def is_bot_owner(user_id: int) -> bool:
+    """Check if user is the configured bot owner"""
+    return _OWNER_ID is not None and user_id == _OWNER_ID
+
+# Check user permissions in chat
+async def is_user_admin(
+    update: Update, 
+    context: ContextTypes.DEFAULT_TYPE, 
+    user_id: int = None,
+    chat_id: int = None
+) -> bool:
+    """Check if user is admin in chat"""
+    try:
+        if user_id is None:
+            user_id = update.effective_user.id
+        if chat_id is None:
+            chat_id = update.effective_chat.id
         
-        except Exception as e:
-            logger.error(f"Error checking admin status: {e}")
-            return False
+        # Bot owner is always admin
+        if is_bot_owner(user_id):
+            return True
+        
+        # Answered from the cached administrator list
+        return await get_admin(chat_id, context, user_id) is not None
     
-    @staticmethod
-    async def is_bot_admin(
-        update: Update,
-        context: ContextTypes.DEFAULT_TYPE,
-        chat_id: int = None
-    ) -> bool:
-        """Check if bot is admin in chat"""
-        try:
-            if chat_id is None:
-                chat_id = update.effective_chat.id
-            
-            member = await context.bot.get_chat_member(chat_id, context.bot.id)
-            return member.status == ChatMemberStatus.ADMINISTRATOR
+    except TelegramError as e:
+        logger.error("Error checking admin status: %s", e)
+        return False
+
+async def is_bot_admin(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    chat_id: int = None
+) -> bool:
+    """Check if bot is admin in chat"""
+    try:
+        if chat_id is None:
+            chat_id = update.effective_chat.id
         
-        except Exception as e:
-            logger.error(f"Error checking bot admin status: {e}")
-            return False
+        member = await context.bot.get_chat_member(chat_id, _BOT_ID or context.bot.id)
+        return member.status == ChatMemberStatus.ADMINISTRATOR
     
-    @staticmethod
-    async def has_permission(
-        update: Update,
-        context: ContextTypes.DEFAULT_TYPE,
-        permission: str,
-        user_id: int = None,
-        chat_id: int = None
-    ) -> bool:
-        """Check if user has specific permission"""
-        try:
-            if user_id is None:
-                user_id = update.effective_user.id
-            if chat_id is None:
-                chat_id = update.effective_chat.id
-            
-            # Check if user is admin first
-            if not await PermissionChecker.is_user_admin(update, context, user_id, chat_id):
-                return False
-            
-            # Get chat member with permissions
-            member = await context.bot.get_chat_member(chat_id, user_id)
-            
-            # Creator has all permissions
-            if member.status == ChatMemberStatus.OWNER:
-                return True
-            
-            # Check specific permission
-            if hasattr(member, permission):
-                return getattr(member, permission)
-            
-            return False
+    except TelegramError as e:
+        logger.error("Error checking bot admin status: %s", e)
+        return False
+
+async def has_permission(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    permission: str,
+    user_id: int = None,
+    chat_id: int = None
+) -> bool:
+    """Check if user has specific permission"""
+    try:
+        if user_id is None:
+            user_id = update.effective_user.id
+        if chat_id is None:
+            chat_id = update.effective_chat.id
         
-        except Exception as e:
-            logger.error(f"Error checking permission {permission}: {e}")
+        # Admin entry carries the permissions - non-admins have none
+        member = await get_admin(chat_id, context, user_id)
+        if member is None:
             return False
+        
+        # Creator has all permissions
+        if member.status == ChatMemberStatus.OWNER:
+            return True
+        
+        # Check specific permission
+        if hasattr(member, permission):
+            return getattr(member, permission)
+        
+        return False
+    
+    except TelegramError as e:
+        logger.error("Error checking permission %s: %s", permission, e)
+        return False
 
-class MessageHelper:
-    """Helper functions for message handling"""
+# Helper functions for message handling
+async def send_message(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    text: str,
+    parse_mode: str = "Markdown",
+    reply_markup=None,
+    reply_to_message: bool = False
+):
+    """Send message with error handling"""
+    kwargs = {
+        'text': text,
+        'parse_mode': parse_mode
+    }
     
-    @staticmethod
-    async def send_message(
-        update: Update,
-        context: ContextTypes.DEFAULT_TYPE,
-        text: str,
-        parse_mode: str = "Markdown",
-        reply_markup=None,
-        reply_to_message: bool = False
-    ):
-        """Send message with error handling"""
+    if reply_markup:
+        kwargs['reply_markup'] = reply_markup
+    
+    if reply_to_message and update.effective_message:
+        kwargs['reply_to_message_id'] = update.effective_message.message_id
+    
+    try:
+        return await context.bot.send_message(
+            chat_id=update.effective_chat.id,
+            **kwargs
+        )
+    
+    except BadRequest as e:
+        # Only a parse failure is worth retrying as plain text
+        if not parse_mode or "can't parse entities" not in str(e).lower():
+            logger.error("Error sending message: %s", e)
+            return None
+        
+        logger.warning("Markdown rejected, sending as plain text: %s", e)
+        kwargs['parse_mode'] = None
         try:
-            kwargs = {
-                'text': text,
-                'parse_mode': parse_mode
-            }
-            
-            if reply_markup:
-                kwargs['reply_markup'] = reply_markup
-            
-            if reply_to_message and update.effective_message:
-                kwargs['reply_to_message_id'] = update.effective_message.message_id
-            
             return await context.bot.send_message(
                 chat_id=update.effective_chat.id,
                 **kwargs
             )
-        
-        except Exception as e:
-            logger.error(f"Error sending message: {e}")
-            # Try without markdown if parsing failed
-            try:
-                return await context.bot.send_message(
-                    chat_id=update.effective_chat.id,
-                    text=text
-                )
-            except Exception as e2:
-                logger.error(f"Error sending plain message: {e2}")
-                return None
-    
-    @staticmethod
-    async def edit_message(
-        update: Update,
-        context: ContextTypes.DEFAULT_TYPE,
-        message_id: int,
-        text: str,
-        parse_mode: str = "Markdown",
-        reply_markup=None
-    ):
-        """Edit message with error handling"""
-        try:
-            return await context.bot.edit_message_text(
-                chat_id=update.effective_chat.id,
-                message_id=message_id,
-                text=text,
-                parse_mode=parse_mode,
-                reply_markup=reply_markup
-            )
-        except Exception as e:
-            logger.error(f"Error editing message: {e}")
+        except TelegramError as e2:
+            logger.error("Error sending plain message: %s", e2)
             return None
     
-    @staticmethod
-    async def delete_message(
-        update: Update,
-        context: ContextTypes.DEFAULT_TYPE,
-        message_id: int = None
-    ):
-        """Delete message with error handling"""
-        try:
-            if message_id is None:
-                message_id = update.effective_message.message_id
-            
-            await context.bot.delete_message(
-                chat_id=update.effective_chat.id,
-                message_id=message_id
-            )
-            return True
-        except Exception as e:
-            logger.error(f"Error deleting message: {e}")
-            return False
+    except TelegramError as e:
+        logger.error("Error sending message: %s", e)
+        return None
 
-class ChatHelper:
-    """Helper functions for chat operations"""
-    
-    @staticmethod
-    async def get_chat_admins(
-        chat_id: int,
-        context: ContextTypes.DEFAULT_TYPE,
-        use_cache: bool = True
-    ) -> List[ChatMember]:
-        """Get chat administrators with caching"""
-        try:
-            # Check cache first if enabled
-            cache_key = f"admins_{chat_id}"
-            if use_cache and cache_key in context.bot_data:
-                cached_data = context.bot_data[cache_key]
-                # Check if cache is still valid (10 minutes)
-                if datetime.now() - cached_data['timestamp'] < timedelta(minutes=10):
-                    return cached_data['admins']
-            
-            # Fetch from Telegram
-            admins = await context.bot.get_chat_administrators(chat_id)
-            
-            # Update cache
-            if use_cache:
-                context.bot_data[cache_key] = {
-                    'admins': admins,
-                    'timestamp': datetime.now()
-                }
-            
-            return admins
+async def edit_message(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    message_id: int,
+    text: str,
+    parse_mode: str = "Markdown",
+    reply_markup=None
+):
+    """Edit message with error handling"""
+    try:
+        return await context.bot.edit_message_text(
+            chat_id=update.effective_chat.id,
+            message_id=message_id,
+            text=text,
+            parse_mode=parse_mode,
+            reply_markup=reply_markup
+        )
+    except TelegramError as e:
+        logger.error("Error editing message: %s", e)
+        return None
+
+async def delete_message(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    message_id: int = None
+):
+    """Delete message with error handling"""
+    try:
+        if message_id is None:
+            message_id = update.effective_message.message_id
+        
+        await context.bot.delete_message(
+            chat_id=update.effective_chat.id,
+            message_id=message_id
+        )
+        return True
+    except TelegramError as e:
+        logger.error("Error deleting message: %s", e)
+        return False
+
+async def delete_messages(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    message_ids: List[int]
+) -> List[bool]:
+    """Delete several messages concurrently, returns success per message"""
+    return await _bounded_gather(
+        partial(delete_message, update, context, message_id)
+        for message_id in message_ids
+    )
+
+# Helper functions for chat operations
+async def get_chat_admins(
+    chat_id: int,
+    context: ContextTypes.DEFAULT_TYPE,
+    use_cache: bool = True
+) -> List[ChatMember]:
+    """Get chat administrators with caching"""
+    try:
+        # Check cache first if enabled
+        if use_cache:
+            admins = _ADMIN_CACHE.get(chat_id)
+            if admins is not None:
+                return admins
+        
+        # Fetch from Telegram, sharing the request with concurrent callers
+        admins = await _single_flight(
+            ("admins", chat_id),
+            lambda: context.bot.get_chat_administrators(chat_id)
+        )
+        
+        # Update cache
+        if use_cache:
+            _ADMIN_CACHE[chat_id] = admins
         
-        except Exception as e:
-            logger.error(f"Error getting chat admins: {e}")
-            return []
+        return admins
     
-    @staticmethod
-    async def restrict_user(
-        update: Update,
-        context: ContextTypes.DEFAULT_TYPE,
-        user_id: int,
-        until_date: datetime = None,
-        can_send_messages: bool = False,
-        can_send_media: bool = False,
-        can_send_other: bool = False,
-        can_add_web_page_previews: bool = False
-    ) -> bool:
-        """Restrict user in chat"""
-        try:
-            from telegram import ChatPermissions
-            
+    except TelegramError as e:
+        logger.error("Error getting chat admins: %s", e)
+        return []
+
+async def get_admin(
+    chat_id: int,
+    context: ContextTypes.DEFAULT_TYPE,
+    user_id: int
+) -> Optional[ChatMember]:
+    """Get a user's administrator entry, or None if they are not an admin"""
+    admins = await get_chat_admins(chat_id, context)
+    return next((admin for admin in admins if admin.user.id == user_id), None)
+
+def invalidate_admins(chat_id: int):
+    """Drop a chat's cached administrator list after it changes"""
+    _ADMIN_CACHE.pop(chat_id, None)
+
+async def on_chat_member_update(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Invalidate the admin cache when someone gains or loses admin rights"""
+    change = update.chat_member
+    admin_statuses = (ChatMemberStatus.OWNER, ChatMemberStatus.ADMINISTRATOR)
+    
+    if (change.old_chat_member.status in admin_statuses
+            or change.new_chat_member.status in admin_statuses):
+        invalidate_admins(change.chat.id)
+
+async def restrict_user(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    user_id: int,
+    until_date: datetime = None,
+    can_send_messages: bool = False,
+    can_send_media: bool = False,
+    can_send_other: bool = False,
+    can_add_web_page_previews: bool = False
+) -> bool:
+    """Restrict user in chat"""
+    try:
+        if not (can_send_messages or can_send_media or can_send_other
+                or can_add_web_page_previews):
+            permissions = _MUTE_PERMS
+        else:
             permissions = ChatPermissions(
                 can_send_messages=can_send_messages,
-                can_send_media_messages=can_send_media,
+                can_send_audios=can_send_media,
+                can_send_documents=can_send_media,
+                can_send_photos=can_send_media,
+                can_send_videos=can_send_media,
+                can_send_video_notes=can_send_media,
+                can_send_voice_notes=can_send_media,
+                can_send_polls=can_send_other,
                 can_send_other_messages=can_send_other,
                 can_add_web_page_previews=can_add_web_page_previews
             )
-            
-            await context.bot.restrict_chat_member(
-                chat_id=update.effective_chat.id,
-                user_id=user_id,
-                permissions=permissions,
-                until_date=until_date
-            )
-            return True
         
-        except Exception as e:
-            logger.error(f"Error restricting user: {e}")
-            return False
-    
-    @staticmethod
-    async def ban_user(
-        update: Update,
-        context: ContextTypes.DEFAULT_TYPE,
-        user_id: int,
-        until_date: datetime = None,
-        revoke_messages: bool = False
-    ) -> bool:
-        """Ban user from chat"""
-        try:
-            await context.bot.ban_chat_member(
-                chat_id=update.effective_chat.id,
-                user_id=user_id,
-                until_date=until_date,
-                revoke_messages=revoke_messages
-            )
-            return True
-        
-        except Exception as e:
-            logger.error(f"Error banning user: {e}")
-            return False
+        await context.bot.restrict_chat_member(
+            chat_id=update.effective_chat.id,
+            user_id=user_id,
+            permissions=permissions,
+            until_date=until_date
+        )
+        return True
     
-    @staticmethod
-    async def unban_user(
-        update: Update,
-        context: ContextTypes.DEFAULT_TYPE,
-        user_id: int,
-        only_if_banned: bool = True
-    ) -> bool:
-        """Unban user from chat"""
-        try:
-            await context.bot.unban_chat_member(
-                chat_id=update.effective_chat.id,
-                user_id=user_id,
-                only_if_banned=only_if_banned
-            )
-            return True
-        
-        except Exception as e:
-            logger.error(f"Error unbanning user: {e}")
-            return False
+    except TelegramError as e:
+        logger.error("Error restricting user: %s", e)
+        return False
 
-class ValidationHelper:
-    """Helper functions for validation"""
+async def ban_user(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    user_id: int,
+    until_date: datetime = None,
+    revoke_messages: bool = False
+) -> bool:
+    """Ban user from chat"""
+    try:
+        await context.bot.ban_chat_member(
+            chat_id=update.effective_chat.id,
+            user_id=user_id,
+            until_date=until_date,
+            revoke_messages=revoke_messages
+        )
+        return True
     
-    @staticmethod
-    def validate_chat_type(update: Update, allowed_types: List[str]) -> bool:
-        """Validate if command can be used in current chat type"""
-        if not update.effective_chat:
-            return False
-        
-        chat_type = update.effective_chat.type
-        return chat_type in allowed_types
-    
-    @staticmethod
-    def validate_user_input(text: str, max_length: int = None, min_length: int = None) -> Tuple[bool, str]:
-        """Validate user input"""
-        if not text:
-            return False, "Input cannot be empty"
-        
-        if min_length and len(text) < min_length:
-            return False, f"Input must be at least {min_length} characters"
-        
-        if max_length and len(text) > max_length:
-            return False, f"Input cannot exceed {max_length} characters"
-        
-        return True, ""
+    except TelegramError as e:
+        logger.error("Error banning user: %s", e)
+        return False
+
+async def unban_user(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    user_id: int,
+    only_if_banned: bool = True
+) -> bool:
+    """Unban user from chat"""
+    try:
+        await context.bot.unban_chat_member(
+            chat_id=update.effective_chat.id,
+            user_id=user_id,
+            only_if_banned=only_if_banned
+        )
+        return True
     
-    @staticmethod
-    def is_url(text: str) -> bool:
-        """Check if text is a valid URL"""
-        import re
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-        return url_pattern.match(text) is not None
+    except TelegramError as e:
+        logger.error("Error unbanning user: %s", e)
+        return False
 
-class FormatHelper:
-    """Helper functions for formatting"""
+async def ban_users(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    user_ids: List[int],
+    until_date: datetime = None,
+    revoke_messages: bool = False
+) -> List[bool]:
+    """Ban several users concurrently, returns success per user"""
+    return await _bounded_gather(
+        partial(ban_user, update, context, user_id, until_date, revoke_messages)
+        for user_id in user_ids
+    )
+
+async def restrict_users(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    user_ids: List[int],
+    until_date: datetime = None,
+    **permissions: bool
+) -> List[bool]:
+    """Restrict several users concurrently, returns success per user"""
+    return await _bounded_gather(
+        partial(restrict_user, update, context, user_id, until_date, **permissions)
+        for user_id in user_ids
+    )
+
+# Helper functions for validation
+def validate_chat_type(update: Update, allowed_types: List[str]) -> bool:
+    """Validate if command can be used in current chat type"""
+    if not update.effective_chat:
+        return False
     
-    @staticmethod
-    def format_user_mention(user: Union[User, Dict[str, Any]]) -> str:
-        """Format user mention"""
-        if isinstance(user, User):
-            if user.username:
-                return f"@{user.username}"
-            return f"[{user.first_name}](tg://user?id={user.id})"
-        elif isinstance(user, dict):
-            return UserResolver.format_user_mention(user)
-        return "Unknown User"
+    chat_type = update.effective_chat.type
+    return chat_type in allowed_types
+
+def validate_user_input(text: str, max_length: int = None, min_length: int = None) -> Tuple[bool, str]:
+    """Validate user input"""
+    if not text:
+        return False, "Input cannot be empty"
     
-    @staticmethod
-    def format_duration(seconds: int) -> str:
-        """Format duration in human readable format"""
-        return TimeParser.format_duration(seconds)
+    if min_length and len(text) < min_length:
+        return False, f"Input must be at least {min_length} characters"
     
-    @staticmethod
-    def format_chat_title(chat: Chat) -> str:
-        """Format chat title"""
-        if chat.type == ChatType.PRIVATE:
-            return f"Private chat with {chat.first_name or 'Unknown'}"
-        return chat.title or "Unknown Chat"
+    if max_length and len(text) > max_length:
+        return False, f"Input cannot exceed {max_length} characters"
     
-    @staticmethod
-    def truncate_text(text: str, max_length: int = 100) -> str:
-        """Truncate text with ellipsis"""
-        if len(text) <= max_length:
-            return text
-        return text[:max_length - 3] + "..."
+    return True, ""
+
+def is_url(text: str) -> bool:
+    """Check if text is a valid URL"""
+    return _URL_RE.match(text) is not None
+
+# Helper functions for formatting
+def format_user_mention(user: Union[User, Dict[str, Any]]) -> str:
+    """Format user mention"""
+    if isinstance(user, User):
+        if user.username:
+            return f"@{user.username}"
+        return f"[{user.first_name}](tg://user?id={user.id})"
+    elif isinstance(user, dict):
+        return UserResolver.format_user_mention(user)
+    return "Unknown User"
+
+def format_duration(seconds: int) -> str:
+    """Format duration in human readable format"""
+    return TimeParser.format_duration(seconds)
+
+def format_chat_title(chat: Chat) -> str:
+    """Format chat title"""
+    if chat.type == ChatType.PRIVATE:
+        return f"Private chat with {chat.first_name or 'Unknown'}"
+    return chat.title or "Unknown Chat"
+
+def truncate_text(text: str, max_length: int = 100) -> str:
+    """Truncate text with ellipsis"""
+    if len(text) <= max_length:
+        return text
+    return f"{text[:max_length - 1]}…"
+
+def format_list(items: List[str], max_items: int = 10) -> str:
+    """Format list of items"""
+    if not items:
+        return "None"
     
-    @staticmethod
-    def format_list(items: List[str], max_items: int = 10) -> str:
-        """Format list of items"""
-        if not items:
-            return "None"
-        
-        if len(items) <= max_items:
-            return ", ".join(items)
-        
-        shown = items[:max_items]
-        remaining = len(items) - max_items
-        return ", ".join(shown) + f" and {remaining} more"
+    remaining = len(items) - max_items
+    shown = ", ".join(islice(items, max_items))
+    return f"{shown} and {remaining} more" if remaining > 0 else shown
 
-class CacheHelper:
-    """Helper functions for caching"""
+# Helper functions for caching
+def get_from_cache(
+    context: ContextTypes.DEFAULT_TYPE,
+    key: str,
+    max_age_seconds: int = 600
+) -> Optional[Any]:
+    """Get data from cache if not expired"""
+    bucket = _cache_bucket(key)
+    entry = bucket.get(key) if bucket is not None else None
+    if entry is None:
+        return None
     
-    @staticmethod
-    def get_from_cache(
-        context: ContextTypes.DEFAULT_TYPE,
-        key: str,
-        max_age_seconds: int = 600
-    ) -> Optional[Any]:
-        """Get data from cache if not expired"""
-        if key not in context.bot_data:
-            return None
-        
-        cached_data = context.bot_data[key]
-        if 'timestamp' not in cached_data:
-            return None
-        
-        age = datetime.now() - cached_data['timestamp']
-        if age.total_seconds() > max_age_seconds:
-            del context.bot_data[key]
-            return None
-        
-        return cached_data.get('data')
+    stored_at, data = entry
+    if monotonic() - stored_at > max_age_seconds:
+        del bucket[key]
+        return None
+    
+    return data
+
+def set_cache(
+    context: ContextTypes.DEFAULT_TYPE,
+    key: str,
+    data: Any
+):
+    """Set data in cache with timestamp"""
+    _cache_bucket(key, create=True)[key] = (monotonic(), data)
+
+def clear_cache(context: ContextTypes.DEFAULT_TYPE, pattern: str = None):
+    """Clear cache entries matching pattern"""
+    if pattern is None:
+        _CACHE_BUCKETS.clear()
+        return
     
-    @staticmethod
-    def set_cache(
-        context: ContextTypes.DEFAULT_TYPE,
-        key: str,
-        data: Any
-    ):
-        """Set data in cache with timestamp"""
-        context.bot_data[key] = {
-            'data': data,
-            'timestamp': datetime.now()
-        }
+    # A bare prefix such as "admins_" drops its whole bucket
+    prefix = pattern.rstrip('_')
+    if '_' not in prefix and prefix in _CACHE_BUCKETS:
+        del _CACHE_BUCKETS[prefix]
+        return
     
-    @staticmethod
-    def clear_cache(context: ContextTypes.DEFAULT_TYPE, pattern: str = None):
-        """Clear cache entries matching pattern"""
-        if pattern is None:
-            context.bot_data.clear()
-            return
-        
-        keys_to_remove = [k for k in context.bot_data.keys() if pattern in k]
+    for bucket in _CACHE_BUCKETS.values():
+        keys_to_remove = [k for k in bucket.keys() if pattern in k]
         for key in keys_to_remove:
-            del context.bot_data[key]
+            bucket.pop(key, None)
+
+# Class namespaces kept for existing callers
+class PermissionChecker:
+    """Check user permissions in chat"""
+    __slots__ = ()
+    is_user_admin = staticmethod(is_user_admin)
+    is_bot_admin = staticmethod(is_bot_admin)
+    has_permission = staticmethod(has_permission)
+    is_bot_owner = staticmethod(is_bot_owner)
+
+class MessageHelper:
+    """Helper functions for message handling"""
+    __slots__ = ()
+    send_message = staticmethod(send_message)
+    edit_message = staticmethod(edit_message)
+    delete_message = staticmethod(delete_message)
+    delete_messages = staticmethod(delete_messages)
+
+class ChatHelper:
+    """Helper functions for chat operations"""
+    __slots__ = ()
+    get_chat_admins = staticmethod(get_chat_admins)
+    get_admin = staticmethod(get_admin)
+    invalidate_admins = staticmethod(invalidate_admins)
+    on_chat_member_update = staticmethod(on_chat_member_update)
+    restrict_user = staticmethod(restrict_user)
+    ban_user = staticmethod(ban_user)
+    unban_user = staticmethod(unban_user)
+    ban_users = staticmethod(ban_users)
+    restrict_users = staticmethod(restrict_users)
+
+class ValidationHelper:
+    """Helper functions for validation"""
+    __slots__ = ()
+    validate_chat_type = staticmethod(validate_chat_type)
+    validate_user_input = staticmethod(validate_user_input)
+    is_url = staticmethod(is_url)
+
+class FormatHelper:
+    """Helper functions for formatting"""
+    __slots__ = ()
+    format_user_mention = staticmethod(format_user_mention)
+    format_duration = staticmethod(format_duration)
+    format_chat_title = staticmethod(format_chat_title)
+    truncate_text = staticmethod(truncate_text)
+    format_list = staticmethod(format_list)
+
+class CacheHelper:
+    """Helper functions for caching"""
+    __slots__ = ()
+    get_from_cache = staticmethod(get_from_cache)
+    set_cache = staticmethod(set_cache)
+    clear_cache = staticmethod(clear_cache)
@@ -0,0 +1,134 @@
+"""
+Redis-backed persistence for ZyraX Bot
+"""
+import asyncio
+import logging
+import pickle
+from typing import Dict, Any, Optional
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+from telegram.ext import BasePersistence, PersistenceInput, PicklePersistence
+
+logger = logging.getLogger(__name__)
+
+# Local file used when Redis is not configured or not reachable
+PICKLE_FILE = "bot_data.pickle"
+
+class RedisPersistence(BasePersistence):
+    """
+    Async persistence storing PTB data in Redis hashes
+
+    Each user/chat entry is stored as its own hash field, so a flush only
+    rewrites the entries that changed instead of the whole state.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        prefix: str = "zyrax",
+        store_data: PersistenceInput = None,
+        update_interval: float = 60
+    ):
+        super().__init__(store_data=store_data, update_interval=update_interval)
+        self.redis = aioredis.from_url(redis_url)
+        self.prefix = prefix
+
+    def _key(self, name: str) -> str:
+        """Build a namespaced Redis key"""
+        return f"{self.prefix}:{name}"
+
+    async def _load_hash(self, name: str) -> Dict[int, Any]:
+        """Load a whole hash, keyed by integer ID"""
+        raw = await self.redis.hgetall(self._key(name))
+        return {int(key): pickle.loads(value) for key, value in raw.items()}
+
+    async def _load_value(self, name: str) -> Optional[Any]:
+        """Load a single pickled value"""
+        raw = await self.redis.get(self._key(name))
+        return pickle.loads(raw) if raw is not None else None
+
+    async def get_user_data(self) -> Dict[int, Dict[Any, Any]]:
+        """Load all user data"""
+        return await self._load_hash("user_data")
+
+    async def get_chat_data(self) -> Dict[int, Dict[Any, Any]]:
+        """Load all chat data"""
+        return await self._load_hash("chat_data")
+
+    async def get_bot_data(self) -> Dict[Any, Any]:
+        """Load bot data"""
+        return await self._load_value("bot_data") or {}
+
+    async def get_callback_data(self) -> Optional[Any]:
+        """Load callback data"""
+        return await self._load_value("callback_data")
+
+    async def get_conversations(self, name: str) -> Dict[Any, Any]:
+        """Load conversation states for a handler"""
+        raw = await self.redis.hgetall(self._key(f"conversations:{name}"))
+        return {pickle.loads(key): pickle.loads(value) for key, value in raw.items()}
+
+    async def update_conversation(self, name: str, key: Any, new_state: Optional[object]) -> None:
+        """Store a single conversation state"""
+        redis_key = self._key(f"conversations:{name}")
+        field = pickle.dumps(key)
+
+        if new_state is None:
+            await self.redis.hdel(redis_key, field)
+        else:
+            await self.redis.hset(redis_key, field, pickle.dumps(new_state))
+
+    async def update_user_data(self, user_id: int, data: Dict[Any, Any]) -> None:
+        """Store data for a single user"""
+        await self.redis.hset(self._key("user_data"), str(user_id), pickle.dumps(data))
+
+    async def update_chat_data(self, chat_id: int, data: Dict[Any, Any]) -> None:
+        """Store data for a single chat"""
+        await self.redis.hset(self._key("chat_data"), str(chat_id), pickle.dumps(data))
+
+    async def update_bot_data(self, data: Dict[Any, Any]) -> None:
+        """Store bot data"""
+        await self.redis.set(self._key("bot_data"), pickle.dumps(data))
+
+    async def update_callback_data(self, data: Any) -> None:
+        """Store callback data"""
+        await self.redis.set(self._key("callback_data"), pickle.dumps(data))
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        """Delete data for a single chat"""
+        await self.redis.hdel(self._key("chat_data"), str(chat_id))
+
+    async def drop_user_data(self, user_id: int) -> None:
+        """Delete data for a single user"""
+        await self.redis.hdel(self._key("user_data"), str(user_id))
+
+    async def refresh_user_data(self, user_id: int, user_data: Dict[Any, Any]) -> None:
+        """Nothing to refresh - Redis is only written by this process"""
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: Dict[Any, Any]) -> None:
+        """Nothing to refresh - Redis is only written by this process"""
+
+    async def refresh_bot_data(self, bot_data: Dict[Any, Any]) -> None:
+        """Nothing to refresh - Redis is only written by this process"""
+
+    async def flush(self) -> None:
+        """Close the Redis connection on shutdown"""
+        try:
+            await self.redis.aclose()
+        except Exception as e:
+            logger.error("Error closing Redis connection: %s", e)
+
+async def create_persistence(redis_url: Optional[str]) -> BasePersistence:
+    """Use Redis persistence when it is reachable, otherwise the local pickle file"""
+    if redis_url:
+        persistence = RedisPersistence(redis_url)
+        try:
+            async with asyncio.timeout(5):
+                await persistence.redis.ping()
+            return persistence
+        except (RedisError, OSError) as e:
+            logger.warning("Redis unavailable (%s) - persisting bot data to %s instead", e, PICKLE_FILE)
+            await persistence.redis.aclose()
+    
+    return PicklePersistence(filepath=PICKLE_FILE)
@@ -0,0 +1,130 @@
+"""
+Client-side throttling of Bot API requests for ZyraX Bot
+"""
+import asyncio
+import logging
+from time import monotonic
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Union
+
+from cachetools import TTLCache
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Telegram's documented limits: ~30 messages per second overall and
+# 20 messages per minute in a single group
+GLOBAL_RATE = (30, 1.0)
+GROUP_RATE = (20, 60.0)
+
+# The per-group limit counts messages posted, not moderation calls
+SEND_ENDPOINTS = frozenset({
+    'sendMessage', 'forwardMessage', 'copyMessage', 'sendPhoto', 'sendAudio',
+    'sendDocument', 'sendVideo', 'sendAnimation', 'sendVoice', 'sendVideoNote',
+    'sendMediaGroup', 'sendLocation', 'sendVenue', 'sendContact', 'sendPoll',
+    'sendDice', 'sendSticker'
+})
+
+class TokenBucket:
+    """Token bucket refilled continuously at capacity/period tokens per second"""
+    
+    __slots__ = ('capacity', 'rate', 'tokens', 'updated')
+    
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = monotonic()
+    
+    def take(self) -> float:
+        """Take a token, returns 0 on success or the seconds until one is available"""
+        now = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+class TelegramRateLimiter(BaseRateLimiter[int]):
+    """
+    Keep outgoing requests under Telegram's flood limits
+    
+    Every request takes a token from the global bucket, and messages sent to
+    a group also take one from that group's bucket. When Telegram answers with
+    RetryAfter anyway, all requests are held back for the requested time and
+    the failed one is retried.
+    """
+    
+    def __init__(self, max_retries: int = 1):
+        self.max_retries = max_retries
+        self._global = TokenBucket(*GLOBAL_RATE)
+        # An idle group's bucket is full again after a minute, so it can be dropped
+        self._groups: TTLCache = TTLCache(maxsize=10_000, ttl=GROUP_RATE[1])
+        self._frozen_until = 0.0
+    
+    async def initialize(self) -> None:
+        """Nothing to set up"""
+    
+    async def shutdown(self) -> None:
+        """Nothing to clean up"""
+    
+    async def _wait(self, bucket: TokenBucket) -> None:
+        """Wait out any flood freeze, then until the bucket has a token"""
+        while True:
+            frozen_for = self._frozen_until - monotonic()
+            if frozen_for > 0:
+                await asyncio.sleep(frozen_for)
+                continue
+            
+            delay = bucket.take()
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+    
+    def _group_bucket(self, chat_id: Any) -> Optional[TokenBucket]:
+        """Bucket for a group or channel target, None for private chats"""
+        is_group = (
+            (isinstance(chat_id, int) and chat_id < 0)
+            or (isinstance(chat_id, str) and chat_id.startswith('@'))
+        )
+        if not is_group:
+            return None
+        
+        bucket = self._groups.get(chat_id)
+        if bucket is None:
+            bucket = self._groups[chat_id] = TokenBucket(*GROUP_RATE)
+        return bucket
+    
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Union[bool, Dict[str, Any], List[Dict[str, Any]]]]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[int]
+    ) -> Union[bool, Dict[str, Any], List[Dict[str, Any]]]:
+        """Throttle one Bot API request, retrying after flood waits"""
+        group_bucket = None
+        if endpoint in SEND_ENDPOINTS:
+            group_bucket = self._group_bucket(data.get('chat_id'))
+        retries = 0
+        
+        while True:
+            if group_bucket is not None:
+                await self._wait(group_bucket)
+            await self._wait(self._global)
+            
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                # Hold every request back, not just this one
+                retry_after = e.retry_after
+                self._frozen_until = max(self._frozen_until, monotonic() + retry_after)
+                
+                if retries >= self.max_retries:
+                    raise
+                retries += 1
+                logger.warning("Flood wait on %s, retrying in %ss", endpoint, retry_after)
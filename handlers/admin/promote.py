@@ -1,13 +1,14 @@
 """
 Promote and demote admin commands
 """
+import asyncio
 import logging
-from telegram import Update, ChatPermissions
+from telegram import Update
 from telegram.ext import ContextTypes
 from telegram.constants import ChatMemberStatus
 
 from core.decorators import admin_required, group_only, bot_admin_required, handle_errors
-from core.helpers import MessageHelper
+from core.helpers import send_message, get_admin, invalidate_admins
 from utils.user_resolver import UserResolver
 
 logger = logging.getLogger(__name__)
@@ -22,18 +23,42 @@ COMMAND_INFO = {
     "group_only": True
 }
 
+# Rights granted by /promote
+_ADMIN_PERMS = dict(
+    can_change_info=False,
+    can_post_messages=False,
+    can_edit_messages=False,
+    can_delete_messages=True,
+    can_invite_users=True,
+    can_restrict_members=True,
+    can_pin_messages=True,
+    can_promote_members=False,
+    is_anonymous=False,
+    can_manage_chat=False,
+    can_manage_video_chats=False
+)
+
+# /demote revokes every one of them
+_DEMOTE_PERMS = {permission: False for permission in _ADMIN_PERMS}
+
+# Success replies
+_PROMOTE_OK = "✅ **Promoted** {mention} to administrator"
+_PROMOTE_OK_TITLE = "✅ **Promoted** {mention} to administrator with title: **{title}**"
+_DEMOTE_OK = "✅ **Demoted** {mention} from administrator"
+
 @handle_errors
 @group_only
 @bot_admin_required
 @admin_required(["can_promote_members"])
 async def handle(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle promote/demote commands"""
-    command = update.effective_message.text.split()[0][1:].lower()  # Remove /
+    # Command word only: drop the leading /, any arguments and any @botname
+    text = update.effective_message.text
+    command = text.split(None, 1)[0][1:].partition('@')[0].lower()
     
-    if command == "promote":
-        await handle_promote(update, context)
-    elif command == "demote":
-        await handle_demote(update, context)
+    subcommand = _SUBCOMMANDS.get(command)
+    if subcommand:
+        await subcommand(update, context)
 
 async def handle_promote(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /promote command"""
@@ -41,29 +66,29 @@ async def handle_promote(update: Update, context: ContextTypes.DEFAULT_TYPE):
     target_user = await UserResolver.resolve_user(update, context)
     
     if not target_user:
-        await MessageHelper.send_message(
+        await send_message(
             update, context, "❌ Please specify a user to promote (reply, mention, username, or ID)"
         )
         return
     
     user_id = target_user['id']
     if not user_id:
-        await MessageHelper.send_message(
+        await send_message(
             update, context, "❌ Could not determine user ID"
         )
         return
     
     # Check if user is already admin
     try:
-        member = await context.bot.get_chat_member(update.effective_chat.id, user_id)
-        if member.status in [ChatMemberStatus.OWNER, ChatMemberStatus.ADMINISTRATOR]:
-            await MessageHelper.send_message(
+        member = await get_admin(update.effective_chat.id, context, user_id)
+        if member is not None:
+            await send_message(
                 update, context, "❌ User is already an administrator"
             )
             return
     except Exception as e:
-        logger.error(f"Error checking member status: {e}")
-        await MessageHelper.send_message(
+        logger.error("Error checking member status: %s", e)
+        await send_message(
             update, context, "❌ Error checking user status"
         )
         return
@@ -80,51 +105,50 @@ async def handle_promote(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await context.bot.promote_chat_member(
             chat_id=update.effective_chat.id,
             user_id=user_id,
-            can_change_info=False,
-            can_post_messages=False,
-            can_edit_messages=False,
-            can_delete_messages=True,
-            can_invite_users=True,
-            can_restrict_members=True,
-            can_pin_messages=True,
-            can_promote_members=False,
-            is_anonymous=False,
-            can_manage_chat=False,
-            can_manage_video_chats=False
+            **_ADMIN_PERMS
         )
-        
-        # Set custom title if provided
-        if custom_title:
-            try:
-                await context.bot.set_chat_administrator_custom_title(
-                    chat_id=update.effective_chat.id,
-                    user_id=user_id,
-                    custom_title=custom_title
-                )
-            except Exception as e:
-                logger.warning(f"Could not set custom title: {e}")
-        
-        # Format success message
-        user_mention = UserResolver.format_user_mention(target_user)
-        success_msg = f"✅ **Promoted** {user_mention} to administrator"
-        
-        if custom_title:
-            success_msg += f" with title: **{custom_title}**"
-        
-        await MessageHelper.send_message(update, context, success_msg)
-        
-        # Log action
-        context.action_log_data = {
-            'target_user': str(user_id),
-            'reason': f"Promoted to admin{f' with title: {custom_title}' if custom_title else ''}",
-            'metadata': {'custom_title': custom_title}
-        }
-    
     except Exception as e:
-        logger.error(f"Error promoting user: {e}")
-        await MessageHelper.send_message(
+        logger.error("Error promoting user: %s", e)
+        await send_message(
             update, context, "❌ Failed to promote user. Make sure I have the required permissions."
         )
+        return
+    
+    invalidate_admins(update.effective_chat.id)
+    
+    # Log action
+    context.action_log_data = {
+        'target_user': str(user_id),
+        'reason': f"Promoted to admin{f' with title: {custom_title}' if custom_title else ''}",
+        'metadata': {'custom_title': custom_title}
+    }
+    
+    # Format success message
+    user_mention = UserResolver.format_user_mention(target_user)
+    if custom_title:
+        success_msg = _PROMOTE_OK_TITLE.format(mention=user_mention, title=custom_title)
+    else:
+        success_msg = _PROMOTE_OK.format(mention=user_mention)
+    
+    # Custom title and reply don't depend on each other - send both at once.
+    # The promotion already happened, so a failed reply is only logged
+    tasks = [send_message(update, context, success_msg)]
+    if custom_title:
+        tasks.append(_set_custom_title(update, context, user_id, custom_title))
+    for result in await asyncio.gather(*tasks, return_exceptions=True):
+        if isinstance(result, Exception):
+            logger.error("Error replying after promotion: %s", result)
+
+async def _set_custom_title(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, custom_title: str):
+    """Set an administrator's custom title, logging rather than raising on failure"""
+    try:
+        await context.bot.set_chat_administrator_custom_title(
+            chat_id=update.effective_chat.id,
+            user_id=user_id,
+            custom_title=custom_title
+        )
+    except Exception as e:
+        logger.warning("Could not set custom title: %s", e)
 
 async def handle_demote(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /demote command"""
@@ -132,37 +156,37 @@ async def handle_demote(update: Update, context: ContextTypes.DEFAULT_TYPE):
     target_user = await UserResolver.resolve_user(update, context)
     
     if not target_user:
-        await MessageHelper.send_message(
+        await send_message(
             update, context, "❌ Please specify a user to demote (reply, mention, username, or ID)"
         )
         return
     
     user_id = target_user['id']
     if not user_id:
-        await MessageHelper.send_message(
+        await send_message(
             update, context, "❌ Could not determine user ID"
         )
         return
     
     # Check if user is admin
     try:
-        member = await context.bot.get_chat_member(update.effective_chat.id, user_id)
+        member = await get_admin(update.effective_chat.id, context, user_id)
         
-        if member.status == ChatMemberStatus.OWNER:
-            await MessageHelper.send_message(
+        if member is not None and member.status == ChatMemberStatus.OWNER:
+            await send_message(
                 update, context, "❌ Cannot demote the chat creator"
             )
             return
         
-        if member.status != ChatMemberStatus.ADMINISTRATOR:
-            await MessageHelper.send_message(
+        if member is None:
+            await send_message(
                 update, context, "❌ User is not an administrator"
             )
             return
     
     except Exception as e:
-        logger.error(f"Error checking member status: {e}")
-        await MessageHelper.send_message(
+        logger.error("Error checking member status: %s", e)
+        await send_message(
             update, context, "❌ Error checking user status"
         )
         return
@@ -172,24 +196,16 @@ async def handle_demote(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await context.bot.promote_chat_member(
             chat_id=update.effective_chat.id,
             user_id=user_id,
-            can_change_info=False,
-            can_post_messages=False,
-            can_edit_messages=False,
-            can_delete_messages=False,
-            can_invite_users=False,
-            can_restrict_members=False,
-            can_pin_messages=False,
-            can_promote_members=False,
-            is_anonymous=False,
-            can_manage_chat=False,
-            can_manage_video_chats=False
+            **_DEMOTE_PERMS
         )
         
+        invalidate_admins(update.effective_chat.id)
+        
         # Format success message
         user_mention = UserResolver.format_user_mention(target_user)
-        success_msg = f"✅ **Demoted** {user_mention} from administrator"
+        success_msg = _DEMOTE_OK.format(mention=user_mention)
         
-        await MessageHelper.send_message(update, context, success_msg)
+        await send_message(update, context, success_msg)
         
         # Log action
         context.action_log_data = {
@@ -199,7 +215,12 @@ async def handle_demote(update: Update, context: ContextTypes.DEFAULT_TYPE):
         }
     
     except Exception as e:
-        logger.error(f"Error demoting user: {e}")
-        await MessageHelper.send_message(
+        logger.error("Error demoting user: %s", e)
+        await send_message(
             update, context, "❌ Failed to demote user. Make sure I have the required permissions."
         )
+
+_SUBCOMMANDS = {
+    "promote": handle_promote,
+    "demote": handle_demote
+}
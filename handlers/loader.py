@@ -5,13 +5,19 @@ import os
 import sys
 import importlib
 import inspect
+import json
 import logging
-from typing import Dict, List, Any, Optional
-from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Tuple
+from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler
 
+from core.constants import BOT_NAME, HELP_CATEGORIES
+
 logger = logging.getLogger(__name__)
 
+# Handler files found by the last full scan, with the mtimes they were found at
+HANDLER_MANIFEST = ".zyrax_handler_cache.json"
+
 class CommandLoader:
     """Dynamic command loader that scans and registers handlers"""
     
@@ -20,75 +26,162 @@ class CommandLoader:
         self.commands: Dict[str, Dict[str, Any]] = {}
         self.categories: Dict[str, List[str]] = {}
         self.loaded_modules: List[str] = []
+        self.update_types: Set[str] = set()
+        # Per category: number of commands visible to admins (True) and to everyone (False)
+        self._visible_counts: Dict[str, Dict[bool, int]] = {}
+        # Main help keyboards keyed by admin flag, built by the help module
+        self._help_keyboards: Dict[bool, Any] = {}
+        # (category, button text, callback data) for each non-empty category
+        self._help_buttons: List[Tuple[str, str, str]] = []
+        # Module paths are built relative to the working directory
+        self._cwd_prefix = os.getcwd() + os.sep
+        self._module_paths: Dict[str, str] = {}
     
-    async def load_all_handlers(self, handlers_dir: str = "handlers") -> bool:
+    async def load_all_handlers(self, handlers_dir: str = "handlers", force_reload: bool = False) -> bool:
         """
         Load all command handlers from handlers directory
         
         Args:
             handlers_dir: Directory containing handler modules
+            force_reload: Re-execute modules that are already imported
             
         Returns:
             True if loading successful, False otherwise
         """
         try:
-            handlers_path = Path(handlers_dir)
-            
-            if not handlers_path.exists():
-                logger.error(f"Handlers directory {handlers_dir} not found")
+            if not os.path.isdir(handlers_dir):
+                logger.error("Handlers directory %s not found", handlers_dir)
                 return False
             
-            # Load handlers from each subdirectory
-            for category_dir in handlers_path.iterdir():
-                if category_dir.is_dir() and not category_dir.name.startswith('__'):
-                    await self._load_category(category_dir)
+            # Reuse the previous scan while nothing under handlers_dir has changed
+            discovered = None if force_reload else self._read_manifest(handlers_dir)
+            from_manifest = discovered is not None
+            if not from_manifest:
+                discovered = self._discover_handlers(handlers_dir)
+            
+            for category_name, handler_files in discovered.items():
+                await self._load_category(category_name, handler_files, force_reload)
             
-            logger.info(f"Loaded {len(self.commands)} commands from {len(self.loaded_modules)} modules")
+            if not from_manifest:
+                self._write_manifest(handlers_dir, discovered)
+            
+            self._build_help_buttons()
+            
+            logger.info("Loaded %s commands from %s modules", len(self.commands), len(self.loaded_modules))
             return True
         
         except Exception as e:
-            logger.error(f"Error loading handlers: {e}", exc_info=True)
+            logger.error("Error loading handlers: %s", e, exc_info=True)
             return False
     
-    async def _load_category(self, category_path: Path) -> None:
-        """Load all handlers from a category directory"""
-        category_name = category_path.name
-        self.categories[category_name] = []
+    def _build_help_buttons(self) -> None:
+        """Format the main help menu's category buttons once per load"""
+        self._help_buttons = []
+        for category, commands in self.categories.items():
+            if not commands:
+                continue
+            
+            category_title = HELP_CATEGORIES.get(category, category.title())
+            emoji = category_title.split()[0] if category_title.split() else "📁"
+            self._help_buttons.append(
+                (category, f"{emoji} {category.title()}", f"help:category:{category}")
+            )
         
-        for handler_file in category_path.glob("*.py"):
-            if handler_file.name.startswith('__'):
+        self._help_keyboards.clear()
+    
+    def _discover_handlers(self, handlers_dir: str) -> Dict[str, List[str]]:
+        """Map each category under handlers_dir to its handler files"""
+        discovered: Dict[str, List[str]] = {}
+        
+        # Single scandir-backed walk: handler modules live one level down,
+        # in one directory per category
+        for root, dirs, files in os.walk(handlers_dir):
+            if root == handlers_dir:
+                dirs[:] = [name for name in dirs if not name.startswith('__')]
                 continue
             
+            dirs.clear()
+            discovered[os.path.basename(root)] = [
+                os.path.join(root, name) for name in files
+                if name.endswith('.py') and not name.startswith('__')
+            ]
+        
+        return discovered
+    
+    def _read_manifest(self, handlers_dir: str) -> Optional[Dict[str, List[str]]]:
+        """Categories from the discovery manifest, or None if it is missing or stale"""
+        try:
+            with open(HANDLER_MANIFEST, 'rb') as manifest_file:
+                manifest = json.load(manifest_file)
+            
+            if manifest['handlers_dir'] != handlers_dir:
+                return None
+            
+            # Added or removed files change their directory's mtime
+            for path, mtime_ns in manifest['mtimes'].items():
+                if os.stat(path, follow_symlinks=False).st_mtime_ns != mtime_ns:
+                    return None
+            
+            return manifest['categories']
+        
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+    
+    def _write_manifest(self, handlers_dir: str, discovered: Dict[str, List[str]]) -> None:
+        """Record a full scan so the next start can skip it"""
+        try:
+            paths = [handlers_dir]
+            for category_name, handler_files in discovered.items():
+                paths.append(os.path.join(handlers_dir, category_name))
+                paths.extend(handler_files)
+            
+            manifest = {
+                'handlers_dir': handlers_dir,
+                'categories': discovered,
+                'mtimes': {
+                    path: os.stat(path, follow_symlinks=False).st_mtime_ns
+                    for path in paths
+                }
+            }
+            
+            # Write then rename, so a crash never leaves a half-written manifest
+            tmp_path = HANDLER_MANIFEST + '.tmp'
+            with open(tmp_path, 'w') as manifest_file:
+                json.dump(manifest, manifest_file)
+            os.replace(tmp_path, HANDLER_MANIFEST)
+        
+        except OSError as e:
+            logger.warning("Could not write handler manifest: %s", e)
+    
+    async def _load_category(self, category_name: str, handler_files: List[str], force_reload: bool = False) -> None:
+        """Load all handlers from a category directory"""
+        self.categories[category_name] = []
+        self._visible_counts[category_name] = {True: 0, False: 0}
+        
+        for handler_file in handler_files:
             try:
-                await self._load_handler_file(handler_file, category_name)
+                await self._load_handler_file(handler_file, category_name, force_reload)
             except Exception as e:
-                logger.error(f"Error loading {handler_file}: {e}")
+                logger.error("Error loading %s: %s", handler_file, e)
     
-    async def _load_handler_file(self, handler_file: Path, category: str) -> None:
+    async def _load_handler_file(self, handler_file: str, category: str, force_reload: bool = False) -> None:
         """Load a single handler file"""
-        # Build module path
-        try:
-            relative_path = handler_file.relative_to(Path.cwd())
-        except ValueError:
-            # If not relative to cwd, try absolute path
-            relative_path = handler_file
-        
-        module_path = str(relative_path.with_suffix('')).replace(os.sep, '.')
+        module_path = self._module_path(handler_file)
         
         try:
-            # Import the module
-            if module_path in sys.modules:
-                module = importlib.reload(sys.modules[module_path])
-            else:
+            # Import the module, reusing an already imported one unless asked to reload
+            module = sys.modules.get(module_path)
+            if module is None:
                 module = importlib.import_module(module_path)
+            elif force_reload:
+                module = importlib.reload(module)
             
             # Check if module has COMMAND_INFO
-            if not hasattr(module, 'COMMAND_INFO'):
-                logger.warning(f"Module {module_path} has no COMMAND_INFO")
+            command_info = module.__dict__.get('COMMAND_INFO')
+            if command_info is None:
+                logger.warning("Module %s has no COMMAND_INFO", module_path)
                 return
             
-            command_info = module.COMMAND_INFO
-            
             # Validate command info
             if not self._validate_command_info(command_info, module_path):
                 return
@@ -97,10 +190,22 @@ class CommandLoader:
             await self._register_handlers(module, command_info, category)
             
             self.loaded_modules.append(module_path)
-            logger.debug(f"Loaded module {module_path}")
+            logger.debug("Loaded module %s", module_path)
         
         except Exception as e:
-            logger.error(f"Error importing {module_path}: {e}")
+            logger.error("Error importing %s: %s", module_path, e)
+    
+    def _module_path(self, handler_file: str) -> str:
+        """Dotted module path for a handler file, remembered across reloads"""
+        module_path = self._module_paths.get(handler_file)
+        if module_path is None:
+            module_path = (
+                handler_file.removeprefix(self._cwd_prefix)
+                .removesuffix('.py')
+                .replace(os.sep, '.')
+            )
+            self._module_paths[handler_file] = module_path
+        return module_path
     
     def _validate_command_info(self, command_info: Dict[str, Any], module_path: str) -> bool:
         """Validate command info structure"""
@@ -108,15 +213,15 @@ class CommandLoader:
         
         for field in required_fields:
             if field not in command_info:
-                logger.error(f"Module {module_path} missing required field: {field}")
+                logger.error("Module %s missing required field: %s", module_path, field)
                 return False
         
         if not isinstance(command_info['commands'], list):
-            logger.error(f"Module {module_path} commands must be a list")
+            logger.error("Module %s commands must be a list", module_path)
             return False
         
         if not command_info['commands']:
-            logger.error(f"Module {module_path} has empty commands list")
+            logger.error("Module %s has empty commands list", module_path)
             return False
         
         return True
@@ -125,50 +230,70 @@ class CommandLoader:
         """Register handlers from module"""
         commands = command_info['commands']
         
+        # Category list is changing - cached help keyboards are stale
+        self._help_keyboards.clear()
+        
+        # Module globals, looked up directly rather than through getattr
+        module_dict = module.__dict__
+        
         # Look for handler functions in order of preference
-        handler_func = None
-        for func_name in ['handle', 'handler', 'main']:
-            if hasattr(module, func_name):
-                handler_func = getattr(module, func_name)
-                break
+        handler_func = (
+            module_dict.get('handle')
+            or module_dict.get('handler')
+            or module_dict.get('main')
+        )
         
         if not handler_func:
-            logger.error(f"No handler function found in {module.__name__}")
+            logger.error("No handler function found in %s", module.__name__)
             return
         
+        # Command info shared by all of the module's commands - readers don't mutate it
+        entry = {
+            **command_info,
+            'handler_func': handler_func,
+            'module': module.__name__,
+            'category': category
+        }
+        
         # Register command handlers
         for command in commands:
             handler = CommandHandler(command, handler_func)
             self.application.add_handler(handler)
             
             # Store command info
-            self.commands[command] = {
-                **command_info,
-                'handler_func': handler_func,
-                'module': module.__name__,
-                'category': category
-            }
-            
-            self.categories[category].append(command)
+            self.commands[command] = entry
+        
+        self.categories[category].extend(commands)
+        
+        visible_counts = self._visible_counts[category]
+        visible_counts[True] += len(commands)
+        if not command_info.get('admin_only', False):
+            visible_counts[False] += len(commands)
+        
+        self.update_types.update((Update.MESSAGE, Update.EDITED_MESSAGE))
         
         # Register message handler if specified
-        if hasattr(module, 'MESSAGE_HANDLER') and hasattr(module, 'message_handler'):
-            message_info = module.MESSAGE_HANDLER
+        message_info = module_dict.get('MESSAGE_HANDLER')
+        message_handler = module_dict.get('message_handler')
+        if message_info is not None and message_handler is not None:
             filters = message_info.get('filters')
             
             if filters:
-                handler = MessageHandler(filters, module.message_handler)
+                handler = MessageHandler(filters, message_handler)
                 self.application.add_handler(handler)
-                logger.debug(f"Registered message handler for {module.__name__}")
+                self.update_types.update((Update.MESSAGE, Update.EDITED_MESSAGE))
+                logger.debug("Registered message handler for %s", module.__name__)
         
         # Register callback query handler if specified
-        if hasattr(module, 'CALLBACK_HANDLER') and hasattr(module, 'callback_handler'):
-            callback_info = module.CALLBACK_HANDLER
+        callback_info = module_dict.get('CALLBACK_HANDLER')
+        callback_handler = module_dict.get('callback_handler')
+        if callback_info is not None and callback_handler is not None:
             pattern = callback_info.get('pattern')
             
-            handler = CallbackQueryHandler(module.callback_handler, pattern=pattern)
+            handler = CallbackQueryHandler(callback_handler, pattern=pattern)
             self.application.add_handler(handler)
-            logger.debug(f"Registered callback handler for {module.__name__}")
+            self.update_types.add(Update.CALLBACK_QUERY)
+            logger.debug("Registered callback handler for %s", module.__name__)
     
     def get_command_info(self, command: str) -> Optional[Dict[str, Any]]:
         """Get information about a specific command"""
@@ -178,6 +303,11 @@ class CommandLoader:
         """Get all commands in a category"""
         return self.categories.get(category, [])
     
+    def get_visible_count(self, category: str, is_admin: bool) -> int:
+        """Get the number of commands in a category the user can see"""
+        visible_counts = self._visible_counts.get(category)
+        return visible_counts[is_admin] if visible_counts else 0
+    
     def get_all_categories(self) -> List[str]:
         """Get all available categories"""
         return list(self.categories.keys())
@@ -186,6 +316,10 @@ class CommandLoader:
         """Get all available commands"""
         return list(self.commands.keys())
     
+    def get_allowed_updates(self) -> List[str]:
+        """Get the update types registered handlers can process"""
+        return sorted(self.update_types)
+    
     def is_command_enabled(self, command: str, chat_id: int) -> bool:
         """Check if command is enabled in chat"""
         # This would check database for disabled commands
@@ -208,10 +342,8 @@ class CommandLoader:
         if not commands:
             return f"❌ No commands found in category: {category}"
         
-        from core.constants import HELP_CATEGORIES, EMOJIS
-        
         category_title = HELP_CATEGORIES.get(category, category.title())
-        help_text = f"**{category_title}**\n\n"
+        parts = [f"**{category_title}**\n\n"]
         
         # Use a set to track unique commands to avoid duplicates
         seen_commands = set()
@@ -231,38 +363,33 @@ class CommandLoader:
             description = command_info.get('description', 'No description')
             usage = command_info.get('usage', f'/{command}')
             
-            help_text += f"• **{usage}**\n"
-            help_text += f"  {description}\n\n"
+            parts.append(f"• **{usage}**\n  {description}\n\n")
         
-        return help_text.strip()
+        return "".join(parts).strip()
     
     def _generate_general_help(self, user_is_admin: bool) -> str:
         """Generate general help text with categories"""
-        from core.constants import HELP_CATEGORIES, BOT_NAME
-        
-        help_text = f"**🤖 {BOT_NAME} - Available Commands**\n\n"
-        help_text += "Choose a category to see available commands:\n\n"
+        parts = [
+            f"**🤖 {BOT_NAME} - Available Commands**\n\n",
+            "Choose a category to see available commands:\n\n"
+        ]
         
         for category, commands in self.categories.items():
             if not commands:
                 continue
             
-            # Count visible commands
-            visible_count = 0
-            for command in commands:
-                command_info = self.commands[command]
-                if not command_info.get('admin_only', False) or user_is_admin:
-                    visible_count += 1
-            
+            visible_count = self.get_visible_count(category, user_is_admin)
             if visible_count == 0:
                 continue
             
             category_title = HELP_CATEGORIES.get(category, category.title())
-            help_text += f"• **{category_title}** ({visible_count} commands)\n"
-            help_text += f"  Use `/help {category}` to see commands\n\n"
+            parts.append(
+                f"• **{category_title}** ({visible_count} commands)\n"
+                f"  Use `/help {category}` to see commands\n\n"
+            )
         
-        help_text += "\n💡 **Tip:** Use `/help <category>` to see specific commands"
-        return help_text.strip()
+        parts.append("\n💡 **Tip:** Use `/help <category>` to see specific commands")
+        return "".join(parts).strip()
 
 # Global loader instance
 command_loader: Optional[CommandLoader] = None
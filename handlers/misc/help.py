@@ -25,6 +25,9 @@ CALLBACK_HANDLER = {
     "pattern": "^help:"
 }
 
+# Callback data prefix of the category buttons
+_CATEGORY_PREFIX = "help:category:"
+
 async def handle(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /help command"""
     loader = get_command_loader()
@@ -56,55 +59,45 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Check if user is admin
     is_admin = await PermissionChecker.is_user_admin(update, context)
     
-    # Parse callback data
-    data = query.data.split(":")
-    if len(data) < 2:
-        return
-    
-    action = data[1]
+    # Parse callback data by prefix
+    data = query.data
     
-    if action == "close":
+    if data == "help:close":
         await query.delete_message()
-        return
-    elif action == "main":
+    elif data == "help:main":
         await edit_main_help(update, context, is_admin)
-    elif action == "category":
-        if len(data) >= 3:
-            category = data[2]
-            await edit_category_help(update, context, category, is_admin)
+    elif data.startswith(_CATEGORY_PREFIX):
+        category = data[len(_CATEGORY_PREFIX):]
+        await edit_category_help(update, context, category, is_admin)
 
-async def send_main_help(update: Update, context: ContextTypes.DEFAULT_TYPE, is_admin: bool):
-    """Send main help message with category buttons"""
-    loader = get_command_loader()
-    
-    text = f"**🤖 {BOT_NAME} - Available Commands**\n\n"
-    text += "Choose a category below to see available commands:\n"
+# Fixed navigation buttons, shared by every render
+_CLOSE_ROW = [InlineKeyboardButton("❌ Close", callback_data="help:close")]
+_BACK_MARKUP = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("⬅️ Back to Categories", callback_data="help:main")]]
+)
+
+# Text above the category buttons
+_MAIN_HELP_TEXT = (
+    f"**🤖 {BOT_NAME} - Available Commands**\n\n"
+    "Choose a category below to see available commands:\n"
+)
+
+def build_main_keyboard(loader, is_admin: bool) -> InlineKeyboardMarkup:
+    """Category keyboard for the main help page, cached on the loader"""
+    reply_markup = loader._help_keyboards.get(is_admin)
+    if reply_markup is not None:
+        return reply_markup
     
     # Create inline keyboard with category buttons
     keyboard = []
     row = []
     
-    for i, (category, commands) in enumerate(loader.categories.items()):
-        if not commands:
+    for category, button_text, callback_data in loader._help_buttons:
+        # Skip categories with no commands this user can see
+        if loader.get_visible_count(category, is_admin) == 0:
             continue
         
-        # Count visible commands
-        visible_count = sum(
-            1 for cmd in commands
-            if not loader.commands[cmd].get('admin_only', False) or is_admin
-        )
-        
-        if visible_count == 0:
-            continue
-        
-        category_title = HELP_CATEGORIES.get(category, category.title())
-        emoji = category_title.split()[0] if category_title.split() else "📁"
-        
-        button = InlineKeyboardButton(
-            f"{emoji} {category.title()}", 
-            callback_data=f"help:category:{category}"
-        )
-        row.append(button)
+        row.append(InlineKeyboardButton(button_text, callback_data=callback_data))
         
         # 2 buttons per row
         if len(row) == 2:
@@ -116,59 +109,26 @@ async def send_main_help(update: Update, context: ContextTypes.DEFAULT_TYPE, is_
         keyboard.append(row)
     
     # Add close button
-    keyboard.append([InlineKeyboardButton("❌ Close", callback_data="help:close")])
+    keyboard.append(_CLOSE_ROW)
     
     reply_markup = InlineKeyboardMarkup(keyboard)
+    loader._help_keyboards[is_admin] = reply_markup
+    return reply_markup
+
+async def send_main_help(update: Update, context: ContextTypes.DEFAULT_TYPE, is_admin: bool):
+    """Send main help message with category buttons"""
+    reply_markup = build_main_keyboard(get_command_loader(), is_admin)
     
     await MessageHelper.send_message(
-        update, context, text, reply_markup=reply_markup
+        update, context, _MAIN_HELP_TEXT, reply_markup=reply_markup
     )
 
 async def edit_main_help(update: Update, context: ContextTypes.DEFAULT_TYPE, is_admin: bool):
     """Edit message to show main help"""
-    loader = get_command_loader()
     query = update.callback_query
+    reply_markup = build_main_keyboard(get_command_loader(), is_admin)
     
-    text = f"**🤖 {BOT_NAME} - Available Commands**\n\n"
-    text += "Choose a category below to see available commands:\n"
-    
-    # Create inline keyboard
-    keyboard = []
-    row = []
-    
-    for category, commands in loader.categories.items():
-        if not commands:
-            continue
-        
-        visible_count = sum(
-            1 for cmd in commands
-            if not loader.commands[cmd].get('admin_only', False) or is_admin
-        )
-        
-        if visible_count == 0:
-            continue
-        
-        category_title = HELP_CATEGORIES.get(category, category.title())
-        emoji = category_title.split()[0] if category_title.split() else "📁"
-        
-        button = InlineKeyboardButton(
-            f"{emoji} {category.title()}", 
-            callback_data=f"help:category:{category}"
-        )
-        row.append(button)
-        
-        if len(row) == 2:
-            keyboard.append(row)
-            row = []
-    
-    if row:
-        keyboard.append(row)
-    
-    keyboard.append([InlineKeyboardButton("❌ Close", callback_data="help:close")])
-    
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    await query.edit_message_text(text, reply_markup=reply_markup, parse_mode="Markdown")
+    await query.edit_message_text(_MAIN_HELP_TEXT, reply_markup=reply_markup, parse_mode="Markdown")
 
 async def send_category_help(update: Update, context: ContextTypes.DEFAULT_TYPE, category: str, is_admin: bool):
     """Send help for specific category"""
@@ -188,7 +148,7 @@ async def send_category_help(update: Update, context: ContextTypes.DEFAULT_TYPE,
         return
     
     category_title = HELP_CATEGORIES.get(category, category.title())
-    text = f"**{category_title}**\n\n"
+    parts = [f"**{category_title}**\n\n"]
     
     for command in commands:
         command_info = loader.commands[command]
@@ -199,15 +159,12 @@ async def send_category_help(update: Update, context: ContextTypes.DEFAULT_TYPE,
         description = command_info.get('description', 'No description')
         usage = command_info.get('usage', f'/{command}')
         
-        text += f"• **{usage}**\n"
-        text += f"  {description}\n\n"
+        parts.append(f"• **{usage}**\n  {description}\n\n")
     
-    # Add back button
-    keyboard = [[InlineKeyboardButton("⬅️ Back to Categories", callback_data="help:main")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    text = "".join(parts).strip()
     
     await MessageHelper.send_message(
-        update, context, text.strip(), reply_markup=reply_markup
+        update, context, text, reply_markup=_BACK_MARKUP
     )
 
 async def edit_category_help(update: Update, context: ContextTypes.DEFAULT_TYPE, category: str, is_admin: bool):
@@ -225,7 +182,7 @@ async def edit_category_help(update: Update, context: ContextTypes.DEFAULT_TYPE,
         return
     
     category_title = HELP_CATEGORIES.get(category, category.title())
-    text = f"**{category_title}**\n\n"
+    parts = [f"**{category_title}**\n\n"]
     
     for command in commands:
         command_info = loader.commands[command]
@@ -236,13 +193,11 @@ async def edit_category_help(update: Update, context: ContextTypes.DEFAULT_TYPE,
         description = command_info.get('description', 'No description')
         usage = command_info.get('usage', f'/{command}')
         
-        text += f"• **{usage}**\n"
-        text += f"  {description}\n\n"
+        parts.append(f"• **{usage}**\n  {description}\n\n")
     
-    keyboard = [[InlineKeyboardButton("⬅️ Back to Categories", callback_data="help:main")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    text = "".join(parts).strip()
     
     try:
-        await query.edit_message_text(text.strip(), reply_markup=reply_markup, parse_mode="Markdown")
+        await query.edit_message_text(text, reply_markup=_BACK_MARKUP, parse_mode="Markdown")
     except Exception as e:
-        logger.error(f"Error editing help message: {e}")
+        logger.error("Error editing help message: %s", e)
@@ -20,18 +20,8 @@ COMMAND_INFO = {
     "group_only": False
 }
 
-async def handle(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle start command"""
-    await handle_start(update, context)
-
-async def handle_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle /start command"""
-    user = update.effective_user
-    chat = update.effective_chat
-    
-    if chat.type == "private":
-        # Private chat start message
-        text = f"""
+# /start replies - only the group greeting's mention changes per call
+_PRIVATE_START_TEXT = f"""
 🤖 **Welcome to {BOT_NAME}!**
 
 I'm an advanced Telegram bot designed to help manage your groups with powerful moderation, anti-spam, and community features.
@@ -54,14 +44,29 @@ Use `/help [category]` to see specific commands or contact my developers.
 
 Version: {BOT_VERSION}
 """
-    else:
-        # Group start message
-        text = f"""
-👋 Hello {user.mention_markdown_v2()}!
+
+_GROUP_START_TEMPLATE = f"""
+👋 Hello {{mention}}!
 
 I'm **{BOT_NAME}**, your group management assistant. I'm here to help keep this chat organized and fun!
 
 Use `/help` to see what I can do, or `/settings` to configure my features.
 """
+
+async def handle(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle start command"""
+    await handle_start(update, context)
+
+async def handle_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /start command"""
+    user = update.effective_user
+    chat = update.effective_chat
+    
+    if chat.type == "private":
+        # Private chat start message
+        text = _PRIVATE_START_TEXT
+    else:
+        # Group start message
+        text = _GROUP_START_TEMPLATE.format(mention=user.mention_markdown_v2())
     
     await MessageHelper.send_message(update, context, text)
@@ -1,10 +1,12 @@
 """
 User info command - Get detailed user information
 """
+import asyncio
 import logging
 from telegram import Update
 from telegram.ext import ContextTypes
 
+from core.database import get_user_data
 from core.helpers import MessageHelper
 from utils.user_resolver import UserResolver
 
@@ -19,6 +21,16 @@ COMMAND_INFO = {
     "group_only": False
 }
 
+# Admin rights shown by /info, in display order
+_ADMIN_PERM_LABELS = (
+    ('can_delete_messages', "Delete Messages"),
+    ('can_restrict_members', "Restrict Members"),
+    ('can_promote_members', "Promote Members"),
+    ('can_change_info', "Change Info"),
+    ('can_invite_users', "Invite Users"),
+    ('can_pin_messages', "Pin Messages")
+)
+
 async def handle(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /info command"""
     # Try to resolve target user
@@ -35,77 +47,70 @@ async def handle(update: Update, context: ContextTypes.DEFAULT_TYPE):
         }
     
     try:
-        text = f"**👤 User Information**\n\n"
-        text += f"**ID:** `{target_user['id']}`\n"
-        text += f"**Name:** {target_user['first_name']}"
+        parts = ["**👤 User Information**\n\n"]
+        parts.append(f"**ID:** `{target_user['id']}`\n")
+        parts.append(f"**Name:** {target_user['first_name']}")
         if target_user.get('last_name'):
-            text += f" {target_user['last_name']}"
-        text += "\n"
+            parts.append(f" {target_user['last_name']}")
+        parts.append("\n")
         
         if target_user.get('username'):
-            text += f"**Username:** @{target_user['username']}\n"
+            parts.append(f"**Username:** @{target_user['username']}\n")
+        
+        parts.append(f"**Is Bot:** {'Yes' if target_user.get('is_bot') else 'No'}\n")
         
-        text += f"**Is Bot:** {'Yes' if target_user.get('is_bot') else 'No'}\n"
+        in_group = update.effective_chat.type != "private"
+        
+        # Database record and chat membership are independent - fetch together
+        lookups = [get_user_data(target_user['id'])]
+        if in_group:
+            lookups.append(context.bot.get_chat_member(update.effective_chat.id, target_user['id']))
+        user_data, *member = await asyncio.gather(*lookups, return_exceptions=True)
         
         # Get additional info if in group
-        if update.effective_chat.type != "private":
-            try:
-                member = await context.bot.get_chat_member(
-                    update.effective_chat.id, target_user['id']
-                )
-                text += f"**Status:** {member.status.title()}\n"
+        if member:
+            member = member[0]
+            if isinstance(member, Exception):
+                logger.debug("Could not get member info: %s", member)
+            else:
+                parts.append(f"**Status:** {member.status.title()}\n")
                 
                 if member.status == "administrator":
-                    perms = []
-                    if member.can_delete_messages:
-                        perms.append("Delete Messages")
-                    if member.can_restrict_members:
-                        perms.append("Restrict Members")
-                    if member.can_promote_members:
-                        perms.append("Promote Members")
-                    if member.can_change_info:
-                        perms.append("Change Info")
-                    if member.can_invite_users:
-                        perms.append("Invite Users")
-                    if member.can_pin_messages:
-                        perms.append("Pin Messages")
+                    perms = [
+                        label for attr, label in _ADMIN_PERM_LABELS
+                        if getattr(member, attr, False)
+                    ]
                     
                     if perms:
-                        text += f"**Permissions:** {', '.join(perms)}\n"
-            
-            except Exception as e:
-                logger.debug(f"Could not get member info: {e}")
+                        parts.append(f"**Permissions:** {', '.join(perms)}\n")
         
-        # Try to get user data from database
-        try:
-            from core.database import get_user_data
-            user_data = await get_user_data(target_user['id'])
+        # User data from database
+        if isinstance(user_data, Exception):
+            logger.debug("Could not get user database info: %s", user_data)
+        elif user_data:
+            parts.append(f"\n**🗃️ Database Info:**\n")
+            parts.append(f"**Language:** {user_data.get('language', 'en')}\n")
             
-            if user_data:
-                text += f"\n**🗃️ Database Info:**\n"
-                text += f"**Language:** {user_data.get('language', 'en')}\n"
-                
-                # Show chat-specific data if in group
-                if update.effective_chat.type != "private":
-                    chat_data = user_data.get('chat_data', {}).get(
-                        str(update.effective_chat.id), {}
-                    )
-                    if chat_data:
-                        if chat_data.get('approved'):
-                            text += "**Status:** Approved ✅\n"
-                        if chat_data.get('warnings', 0) > 0:
-                            text += f"**Warnings:** {chat_data['warnings']}\n"
-                        if chat_data.get('level', 0) > 0:
-                            text += f"**Level:** {chat_data['level']} "
-                            text += f"(XP: {chat_data.get('xp', 0)})\n"
+            # Show chat-specific data if in group
+            if in_group:
+                chat_data = user_data.get('chat_data', {}).get(
+                    str(update.effective_chat.id), {}
+                )
+                if chat_data:
+                    if chat_data.get('approved'):
+                        parts.append("**Status:** Approved ✅\n")
+                    if chat_data.get('warnings', 0) > 0:
+                        parts.append(f"**Warnings:** {chat_data['warnings']}\n")
+                    if chat_data.get('level', 0) > 0:
+                        parts.append(f"**Level:** {chat_data['level']} ")
+                        parts.append(f"(XP: {chat_data.get('xp', 0)})\n")
         
-        except Exception as e:
-            logger.debug(f"Could not get user database info: {e}")
+        text = "".join(parts)
         
         await MessageHelper.send_message(update, context, text)
     
     except Exception as e:
-        logger.error(f"Error in info command: {e}")
+        logger.error("Error in info command: %s", e)
         await MessageHelper.send_message(
             update, context, "❌ Error retrieving user information"
         )
@@ -2,18 +2,20 @@
 Ban and unban commands
 """
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from telegram import Update
 from telegram.ext import ContextTypes
-from telegram.constants import ChatMemberStatus
 
 from core.decorators import admin_required, group_only, bot_admin_required, handle_errors
-from core.helpers import MessageHelper, ChatHelper
+from core.helpers import MessageHelper, ChatHelper, PermissionChecker
 from utils.user_resolver import UserResolver
 from utils.time_parser import TimeParser
 
 logger = logging.getLogger(__name__)
 
+_EXPIRY_FMT = '%Y-%m-%d %H:%M UTC'
+
 COMMAND_INFO = {
     "commands": ["ban", "unban", "tban", "sban", "dban"],
     "description": "Ban and unban users from the chat",
@@ -30,14 +32,13 @@ COMMAND_INFO = {
 @admin_required(["can_restrict_members"])
 async def handle(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle ban/unban commands"""
-    command = update.effective_message.text.split()[0][1:].lower()  # Remove /
+    # Command word only: drop the leading /, any arguments and any @botname
+    text = update.effective_message.text
+    command = text.split(None, 1)[0][1:].partition('@')[0].lower()
     
-    if command in ["ban", "sban", "dban"]:
-        await handle_ban(update, context, command)
-    elif command == "tban":
-        await handle_tban(update, context)
-    elif command == "unban":
-        await handle_unban(update, context)
+    subcommand = _SUBCOMMANDS.get(command)
+    if subcommand:
+        await subcommand(update, context)
 
 async def handle_ban(update: Update, context: ContextTypes.DEFAULT_TYPE, ban_type: str):
     """Handle ban, sban, dban commands"""
@@ -107,7 +108,7 @@ async def handle_ban(update: Update, context: ContextTypes.DEFAULT_TYPE, ban_typ
             )
     
     except Exception as e:
-        logger.error(f"Error banning user: {e}")
+        logger.error("Error banning user: %s", e)
         await MessageHelper.send_message(
             update, context, "❌ Error occurred while banning user"
         )
@@ -160,15 +161,16 @@ async def handle_tban(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     # Calculate until_date
-    until_date = datetime.now() + timedelta(seconds=duration_seconds)
+    # Aware UTC - Telegram reads naive datetimes as UTC, not server local time
+    until_date = datetime.now(timezone.utc) + timedelta(seconds=duration_seconds)
     
     # Extract reason - adjust based on whether we're replying or not
     if update.effective_message.reply_to_message:
         # When replying, skip first arg (time), rest is reason
-        reason_parts = context.args[1:] if len(context.args) > 1 else []
+        reason_parts = context.args[1:]
     else:
         # When not replying, skip first two args (user, time), rest is reason
-        reason_parts = context.args[2:] if len(context.args) > 2 else []
+        reason_parts = context.args[2:]
     
     reason = " ".join(reason_parts) if reason_parts else "No reason provided"
     
@@ -183,7 +185,7 @@ async def handle_tban(update: Update, context: ContextTypes.DEFAULT_TYPE):
             ban_msg = f"⏰ **Temporarily banned** {user_mention} for {duration_text}"
             if reason != "No reason provided":
                 ban_msg += f"\n**Reason:** {reason}"
-            ban_msg += f"\n**Expires:** {until_date.strftime('%Y-%m-%d %H:%M UTC')}"
+            ban_msg += f"\n**Expires:** {until_date.strftime(_EXPIRY_FMT)}"
             
             await MessageHelper.send_message(update, context, ban_msg)
             
@@ -203,7 +205,7 @@ async def handle_tban(update: Update, context: ContextTypes.DEFAULT_TYPE):
             )
     
     except Exception as e:
-        logger.error(f"Error temporarily banning user: {e}")
+        logger.error("Error temporarily banning user: %s", e)
         await MessageHelper.send_message(
             update, context, "❌ Error occurred while banning user"
         )
@@ -248,7 +250,7 @@ async def handle_unban(update: Update, context: ContextTypes.DEFAULT_TYPE):
             )
     
     except Exception as e:
-        logger.error(f"Error unbanning user: {e}")
+        logger.error("Error unbanning user: %s", e)
         await MessageHelper.send_message(
             update, context, "❌ Error occurred while unbanning user"
         )
@@ -257,7 +259,7 @@ async def _check_user_protection(update: Update, context: ContextTypes.DEFAULT_T
     """Check if user is protected from bans (admin, etc.)"""
     try:
         # Check if target is bot owner
-        if user_id == context.bot_data.get('owner_id'):
+        if PermissionChecker.is_bot_owner(user_id):
             await MessageHelper.send_message(
                 update, context, "❌ Cannot ban the bot owner"
             )
@@ -271,8 +273,7 @@ async def _check_user_protection(update: Update, context: ContextTypes.DEFAULT_T
             return True
         
         # Check if target is admin
-        member = await context.bot.get_chat_member(update.effective_chat.id, user_id)
-        if member.status in [ChatMemberStatus.OWNER, ChatMemberStatus.ADMINISTRATOR]:
+        if await ChatHelper.get_admin(update.effective_chat.id, context, user_id) is not None:
             await MessageHelper.send_message(
                 update, context, "❌ Cannot ban an administrator"
             )
@@ -281,5 +282,13 @@ async def _check_user_protection(update: Update, context: ContextTypes.DEFAULT_T
         return False
     
     except Exception as e:
-        logger.debug(f"Error checking user protection: {e}")
+        logger.debug("Error checking user protection: %s", e)
         return False
+
+_SUBCOMMANDS = {
+    "ban": partial(handle_ban, ban_type="ban"),
+    "sban": partial(handle_ban, ban_type="sban"),
+    "dban": partial(handle_ban, ban_type="dban"),
+    "tban": handle_tban,
+    "unban": handle_unban
+}
@@ -1,9 +1,14 @@
 """
 Chat logging middleware
 """
+import asyncio
 import logging
-from datetime import datetime
-from typing import Dict, Any
+from collections import deque
+from time import time_ns
+from typing import Dict, Any, Optional
+
+import orjson
+from bson.datetime_ms import DatetimeMS
 
 try:
     from telegram import Update
@@ -11,13 +16,40 @@ try:
 except ImportError:
     pass
 
+from core.database import database, action_log_buffer, get_chat_fields
+
 logger = logging.getLogger(__name__)
 
+# Telegram's limit for a single message
+MAX_MESSAGE_LENGTH = 4096
+
+# Log channel message layout
+_LOG_TEMPLATE = (
+    "**🔍 Action Log**\n\n"
+    "**Action:** {action}\n"
+    "**Performed by:** {by}\n"
+    "**Chat:** {chat}\n"
+    "**Time:** {ts}\n"
+)
+_TS_FMT = '%Y-%m-%d %H:%M:%S UTC'
+_DETAILS_OPEN = "\n**Details:**\n```json\n"
+_DETAILS_CLOSE = "\n```"
+_DETAILS_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
 class ChatLogger:
     """Middleware for logging chat activities"""
     
-    def __init__(self):
+    def __init__(self, batch_flush_interval: float = 1.0, max_buffer_size: int = 10_000):
         self.enabled = True
+        self.batch_flush_interval = batch_flush_interval
+        self.max_buffer_size = max_buffer_size
+        # Log channel messages waiting for the next flush, per channel
+        self._pending: Dict[int, deque] = {}
+        self._pending_event: Optional[asyncio.Event] = None
+        self._bot = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.dropped = 0
     
     async def log_action(
         self,
@@ -31,8 +63,6 @@ class ChatLogger:
             return
         
         try:
-            from core.database import database
-            
             if not database.is_connected:
                 return
             
@@ -40,7 +70,8 @@ class ChatLogger:
                 "chat_id": str(update.effective_chat.id),
                 "action_type": action_type,
                 "performed_by": str(update.effective_user.id),
-                "timestamp": datetime.utcnow(),
+                # Same representation as core.decorators.log_action writes
+                "timestamp": DatetimeMS(time_ns() // 1_000_000),
                 "metadata": metadata
             }
             
@@ -48,14 +79,14 @@ class ChatLogger:
             if hasattr(context, 'action_log_data'):
                 log_data.update(context.action_log_data)
             
-            # Insert into database
-            await database.db.action_logs.insert_one(log_data)
+            # Written in the background by the batch flusher
+            action_log_buffer.put_nowait(log_data)
             
             # Send to log channel if configured
             await self._send_to_log_channel(update, context, log_data)
         
         except Exception as e:
-            logger.error(f"Error logging action: {e}")
+            logger.error("Error logging action: %s", e)
     
     async def _send_to_log_channel(
         self,
@@ -65,9 +96,8 @@ class ChatLogger:
     ):
         """Send log message to configured log channel"""
         try:
-            from core.database import get_chat_settings
-            
-            chat_settings = await get_chat_settings(update.effective_chat.id)
+            # Served from the chat settings cache, which update_chat keeps current
+            chat_settings = await get_chat_fields(update.effective_chat.id, 'log_channel_id')
             log_channel_id = chat_settings.get('log_channel_id')
             
             if not log_channel_id:
@@ -77,27 +107,103 @@ class ChatLogger:
             action_type = log_data['action_type']
             performed_by = log_data['performed_by']
             
-            log_msg = f"**🔍 Action Log**\n\n"
-            log_msg += f"**Action:** {action_type.title()}\n"
-            log_msg += f"**Performed by:** {performed_by}\n"
-            log_msg += f"**Chat:** {update.effective_chat.title or 'Unknown'}\n"
-            log_msg += f"**Time:** {log_data['timestamp'].strftime('%Y-%m-%d %H:%M:%S UTC')}\n"
+            log_msg = _LOG_TEMPLATE.format(
+                action=action_type.title(),
+                by=performed_by,
+                chat=update.effective_chat.title or 'Unknown',
+                ts=log_data['timestamp'].as_datetime().strftime(_TS_FMT)
+            )
             
             # Add metadata
             metadata = log_data.get('metadata', {})
             if metadata:
-                log_msg += "\n**Details:**\n"
-                for key, value in metadata.items():
-                    log_msg += f"• {key}: {value}\n"
+                details = orjson.dumps(metadata, default=str, option=_DETAILS_OPTIONS).decode()
+                # Cut the details rather than have Telegram reject the whole message
+                room = MAX_MESSAGE_LENGTH - len(log_msg) - len(_DETAILS_OPEN) - len(_DETAILS_CLOSE)
+                log_msg = f"{log_msg}{_DETAILS_OPEN}{details[:room]}{_DETAILS_CLOSE}"
             
-            await context.bot.send_message(
-                chat_id=log_channel_id,
-                text=log_msg,
-                parse_mode="Markdown"
-            )
+            self._queue_channel_message(context.bot, log_channel_id, log_msg)
         
         except Exception as e:
-            logger.debug(f"Could not send to log channel: {e}")
+            logger.debug("Could not send to log channel: %s", e)
+    
+    def _queue_channel_message(self, bot, log_channel_id: int, log_msg: str):
+        """Queue a message for the log channel, dropping the oldest if the buffer is full"""
+        pending = self._pending.get(log_channel_id)
+        if pending is None:
+            pending = self._pending[log_channel_id] = deque(maxlen=self.max_buffer_size)
+        
+        if len(pending) == pending.maxlen:
+            self.dropped += 1
+            logger.warning("Log channel %s buffer full, %s messages dropped so far", log_channel_id, self.dropped)
+        pending.append(log_msg)
+        
+        # Flusher is started on first use, once an event loop is running
+        self._bot = bot
+        if self._task is None:
+            self._pending_event = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        self._pending_event.set()
+    
+    async def _run(self):
+        """Send queued log channel messages once per flush window until stop() is called"""
+        while True:
+            await self._pending_event.wait()
+            if not self._stopping:
+                await asyncio.sleep(self.batch_flush_interval)
+            self._pending_event.clear()
+            await self._flush()
+            if self._stopping:
+                return
+    
+    async def _flush(self):
+        """Send everything queued, one message per channel per 4096 characters"""
+        pending, self._pending = self._pending, {}
+        
+        for log_channel_id, messages in pending.items():
+            for text in self._pack(messages):
+                try:
+                    await self._bot.send_message(
+                        chat_id=log_channel_id,
+                        text=text,
+                        parse_mode="Markdown"
+                    )
+                except Exception as e:
+                    logger.debug("Could not send to log channel: %s", e)
+    
+    @staticmethod
+    def _pack(messages) -> list:
+        """Join messages with newlines into as few Telegram-sized texts as possible"""
+        texts = []
+        parts = []
+        length = 0
+        
+        for message in messages:
+            if parts and length + 1 + len(message) > MAX_MESSAGE_LENGTH:
+                texts.append("\n".join(parts))
+                parts = []
+                length = 0
+            
+            length += len(message) + (1 if parts else 0)
+            parts.append(message)
+        
+        if parts:
+            texts.append("\n".join(parts))
+        
+        return texts
+    
+    async def stop(self):
+        """Stop the flusher and send whatever is still queued"""
+        if self._task is not None:
+            # Let the flusher finish the batch it may be sending instead of cancelling it mid-send
+            self._stopping = True
+            self._pending_event.set()
+            await self._task
+            self._task = None
+            self._stopping = False
+        
+        if self._pending:
+            await self._flush()
 
 # Global logger instance
 chat_logger = ChatLogger()
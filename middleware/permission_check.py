@@ -2,7 +2,7 @@
 Permission checking middleware
 """
 import logging
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict, NamedTuple
 
 try:
     from telegram import Update
@@ -10,17 +10,29 @@ try:
 except ImportError:
     pass
 
+from core.helpers import PermissionChecker
+
 logger = logging.getLogger(__name__)
 
+class HandlerPerms(NamedTuple):
+    """Permission requirements of a registered handler"""
+    admin_only: bool = False
+    group_only: bool = False
+    private_only: bool = False
+
 class PermissionMiddleware:
     """Middleware for checking permissions before command execution"""
     
     def __init__(self):
-        self.handler_permissions = {}
+        self.handler_permissions: Dict[str, HandlerPerms] = {}
     
     def register_handler(self, handler_name: str, permissions: dict):
         """Register permission requirements for a handler"""
-        self.handler_permissions[handler_name] = permissions
+        self.handler_permissions[handler_name] = HandlerPerms(
+            admin_only=permissions.get('admin_only', False),
+            group_only=permissions.get('group_only', False),
+            private_only=permissions.get('private_only', False)
+        )
     
     async def check_permissions(
         self, 
@@ -29,25 +41,24 @@ class PermissionMiddleware:
         handler_name: str
     ) -> bool:
         """Check if user has required permissions"""
-        if handler_name not in self.handler_permissions:
+        perms = self.handler_permissions.get(handler_name)
+        if perms is None:
             return True  # No restrictions
         
-        perms = self.handler_permissions[handler_name]
-        
-        # Check admin requirement
-        if perms.get('admin_only', False):
-            from core.helpers import PermissionChecker
-            if not await PermissionChecker.is_user_admin(update, context):
-                return False
+        # Chat type checks are free - do them before the admin lookup
+        is_private = update.effective_chat.type == 'private'
         
         # Check group requirement
-        if perms.get('group_only', False):
-            if update.effective_chat.type == 'private':
-                return False
+        if perms.group_only and is_private:
+            return False
         
         # Check private requirement
-        if perms.get('private_only', False):
-            if update.effective_chat.type != 'private':
+        if perms.private_only and not is_private:
+            return False
+        
+        # Check admin requirement
+        if perms.admin_only:
+            if not await PermissionChecker.is_user_admin(update, context):
                 return False
         
         return True
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+One-shot migration of chat and user _id values from strings to integers
+
+Older versions stored Telegram IDs as strings ("-100123..."). The bot now
+stores them as numeric BSON integers, which keeps the _id indexes smaller.
+The bot refuses to start while string-keyed documents remain. Run this
+once with the bot stopped (needs MongoDB 4.2+ for pipeline updates):
+
+    python migrate_ids.py
+"""
+import asyncio
+import sys
+
+from pymongo import DeleteOne, UpdateOne
+
+from core.database import database
+
+BATCH_SIZE = 1000
+
+async def migrate_collection(collection) -> int:
+    """Rewrite every document whose _id is a string, returns the count"""
+    migrated = 0
+    ops = []
+
+    async for doc in collection.find({"_id": {"$type": "string"}}):
+        old_id = doc["_id"]
+        try:
+            new_id = int(old_id)
+        except ValueError:
+            print(f"⚠️ Skipping {collection.name} document with non-numeric _id {old_id!r}")
+            continue
+
+        # Merge rather than replace: if a numeric-id document already exists
+        # its fields are newer and win, the old document only fills in the
+        # fields it lacks
+        ops.append(UpdateOne(
+            {"_id": new_id},
+            [{"$replaceWith": {"$mergeObjects": [{"$literal": {**doc, "_id": new_id}}, "$$ROOT"]}}],
+            upsert=True
+        ))
+        ops.append(DeleteOne({"_id": old_id}))
+        migrated += 1
+
+        if len(ops) >= BATCH_SIZE:
+            await collection.bulk_write(ops, ordered=True)
+            ops = []
+
+    if ops:
+        await collection.bulk_write(ops, ordered=True)
+
+    return migrated
+
+async def main() -> int:
+    if not await database.connect():
+        print("❌ Could not connect to MongoDB")
+        return 1
+
+    try:
+        for name in ("chats", "users"):
+            count = await migrate_collection(database.db[name])
+            print(f"✅ {name}: migrated {count} documents")
+    finally:
+        await database.disconnect()
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,16 +1,34 @@
 """
 Chat model for database operations
 """
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
 from core.constants import LockType, FloodMode, PunishmentMode, CaptchaType
 
+# Accepted setting values, for O(1) validation
+_LOCK_TYPE_VALUES = frozenset(lt.value for lt in LockType)
+_FLOOD_MODE_VALUES = frozenset(fm.value for fm in FloodMode)
+_WARN_MODE_VALUES = frozenset(pm.value for pm in PunishmentMode)
+_CAPTCHA_MODE_VALUES = frozenset(ct.value for ct in CaptchaType)
+
+# Templates copied into each new ChatSettings
+_DEFAULT_LOCKS = MappingProxyType({lt.value: False for lt in LockType})
+_DEFAULT_FLOOD_TIMER = MappingProxyType({"count": 10, "duration": 30})
+_DEFAULT_CLEAN_SERVICE = MappingProxyType({
+    "all": False, "join": False, "leave": False,
+    "boost": False, "location": False, "voice_chat": False
+})
+
+# Fields that may arrive as ISO strings
+_DATETIME_FIELDS = ("created_at", "updated_at", "admin_cache_updated")
+
 @dataclass
 class ChatSettings:
     """Chat settings data class"""
     # Basic info
-    chat_id: str
+    chat_id: int
     chat_type: str = "supergroup"
     title: str = "Unknown"
     
@@ -23,7 +41,7 @@ class ChatSettings:
     # Antiflood settings
     flood_limit: int = 10
     flood_mode: str = FloodMode.MUTE.value
-    flood_timer: Dict[str, int] = field(default_factory=lambda: {"count": 10, "duration": 30})
+    flood_timer: Dict[str, int] = field(default_factory=lambda: dict(_DEFAULT_FLOOD_TIMER))
     clear_flood: bool = True
     
     # Antiraid settings
@@ -33,9 +51,7 @@ class ChatSettings:
     auto_antiraid: int = 0
     
     # Lock settings
-    locks: Dict[str, bool] = field(default_factory=lambda: {
-        lock_type.value: False for lock_type in LockType
-    })
+    locks: Dict[str, bool] = field(default_factory=lambda: dict(_DEFAULT_LOCKS))
     lock_warns: bool = True
     allowlist: List[str] = field(default_factory=list)
     
@@ -71,10 +87,7 @@ class ChatSettings:
     language: str = "en"
     
     # Clean service settings
-    clean_service: Dict[str, bool] = field(default_factory=lambda: {
-        "all": False, "join": False, "leave": False,
-        "boost": False, "location": False, "voice_chat": False
-    })
+    clean_service: Dict[str, bool] = field(default_factory=lambda: dict(_DEFAULT_CLEAN_SERVICE))
     
     # Reports
     reports_enabled: bool = True
@@ -112,7 +125,8 @@ class ChatSettings:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for database storage"""
-        data = asdict(self)
+        # Shallow on purpose - the BSON encoder walks nested values itself
+        data = {name: getattr(self, name) for name in _SETTINGS_FIELD_NAMES}
         # Convert chat_id to _id for MongoDB
         data["_id"] = data.pop("chat_id")
         return data
@@ -120,19 +134,22 @@ class ChatSettings:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ChatSettings':
         """Create instance from database document"""
+        # Already deserialized (e.g. handed back from a cache)
+        if data.__class__ is cls:
+            return data
+        
         # Convert _id back to chat_id
         if "_id" in data:
             data["chat_id"] = data.pop("_id")
         
         # Handle datetime fields
-        for field_name in ["created_at", "updated_at", "admin_cache_updated"]:
-            if field_name in data and data[field_name] is not None:
-                if isinstance(data[field_name], str):
-                    data[field_name] = datetime.fromisoformat(data[field_name])
+        for field_name in _DATETIME_FIELDS:
+            value = data.get(field_name)
+            if isinstance(value, str):
+                data[field_name] = datetime.fromisoformat(value)
         
-        # Filter out unknown fields
-        valid_fields = set(cls.__dataclass_fields__.keys())
-        filtered_data = {k: v for k, v in data.items() if k in valid_fields}
+        # Filter out unknown fields - the key intersection runs in C
+        filtered_data = {k: data[k] for k in data.keys() & _SETTINGS_FIELDS}
         
         return cls(**filtered_data)
     
@@ -140,6 +157,10 @@ class ChatSettings:
         """Update the updated_at timestamp"""
         self.updated_at = datetime.utcnow()
 
+# Field names of ChatSettings, computed once
+_SETTINGS_FIELD_NAMES = tuple(f.name for f in fields(ChatSettings))
+_SETTINGS_FIELDS = frozenset(_SETTINGS_FIELD_NAMES)
+
 class Chat:
     """Chat operations wrapper"""
     
@@ -147,7 +168,7 @@ class Chat:
     def create_default_settings(chat_id: int, chat_type: str = "supergroup", title: str = "Unknown") -> ChatSettings:
         """Create default chat settings"""
         return ChatSettings(
-            chat_id=str(chat_id),
+            chat_id=chat_id,
             chat_type=chat_type,
             title=title
         )
@@ -155,19 +176,19 @@ class Chat:
     @staticmethod
     def validate_lock_type(lock_type: str) -> bool:
         """Validate if lock type is valid"""
-        return lock_type in [lt.value for lt in LockType]
+        return lock_type in _LOCK_TYPE_VALUES
     
     @staticmethod
     def validate_flood_mode(mode: str) -> bool:
         """Validate if flood mode is valid"""
-        return mode in [fm.value for fm in FloodMode]
+        return mode in _FLOOD_MODE_VALUES
     
     @staticmethod
     def validate_warn_mode(mode: str) -> bool:
         """Validate if warn mode is valid"""
-        return mode in [pm.value for pm in PunishmentMode]
+        return mode in _WARN_MODE_VALUES
     
     @staticmethod
     def validate_captcha_mode(mode: str) -> bool:
         """Validate if captcha mode is valid"""
-        return mode in [ct.value for ct in CaptchaType]
+        return mode in _CAPTCHA_MODE_VALUES
@@ -1,11 +1,15 @@
 """
 Federation model for database operations
 """
+import os
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
 
-@dataclass
+# Bound once - strings only show up for documents that went through JSON
+_FROMISO = datetime.fromisoformat
+
+@dataclass(slots=True)
 class FederationBan:
     """Federation ban entry"""
     user_id: str
@@ -14,15 +18,25 @@ class FederationBan:
     banned_at: datetime = field(default_factory=datetime.utcnow)
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "user_id": self.user_id,
+            "reason": self.reason,
+            "banned_by": self.banned_by,
+            "banned_at": self.banned_at
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'FederationBan':
-        if "banned_at" in data and isinstance(data["banned_at"], str):
-            data["banned_at"] = datetime.fromisoformat(data["banned_at"])
+        # Already deserialized (e.g. handed back from a cache)
+        if data.__class__ is cls:
+            return data
+        
+        banned_at = data.get("banned_at")
+        if type(banned_at) is str:
+            data["banned_at"] = _FROMISO(banned_at)
         return cls(**data)
 
-@dataclass
+@dataclass(slots=True)
 class FederationData:
     """Federation data model"""
     fed_id: str
@@ -48,42 +62,56 @@ class FederationData:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for database storage"""
-        data = asdict(self)
-        data["_id"] = data.pop("fed_id")
-        
-        # Convert banned_users to dicts
-        data["banned_users"] = [ban.to_dict() for ban in self.banned_users]
-        
-        return data
+        return {
+            "_id": self.fed_id,
+            "name": self.name,
+            "owner_id": self.owner_id,
+            "admins": self.admins,
+            "fed_notif": self.fed_notif,
+            "fed_reason_required": self.fed_reason_required,
+            "subscribed_feds": self.subscribed_feds,
+            "banned_users": [ban.to_dict() for ban in self.banned_users],
+            "log_channel_id": self.log_channel_id,
+            "log_language": self.log_language,
+            "created_at": self.created_at
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'FederationData':
         """Create instance from database document"""
+        # Already deserialized (e.g. handed back from a cache)
+        if data.__class__ is cls:
+            return data
+        
         if "_id" in data:
             data["fed_id"] = data.pop("_id")
         
         # Handle datetime fields
-        if "created_at" in data and isinstance(data["created_at"], str):
-            data["created_at"] = datetime.fromisoformat(data["created_at"])
+        created_at = data.get("created_at")
+        if type(created_at) is str:
+            data["created_at"] = _FROMISO(created_at)
         
         # Convert banned_users back to objects
         if "banned_users" in data:
-            data["banned_users"] = [FederationBan.from_dict(ban) for ban in data["banned_users"]]
+            ban_from_dict = FederationBan.from_dict
+            data["banned_users"] = [ban_from_dict(ban) for ban in data["banned_users"]]
         
         # Filter unknown fields
-        valid_fields = set(cls.__dataclass_fields__.keys())
-        filtered_data = {k: v for k, v in data.items() if k in valid_fields}
+        filtered_data = {k: data[k] for k in data.keys() & _FEDERATION_FIELDS}
         
         return cls(**filtered_data)
 
+# Field names of FederationData, computed once
+_FEDERATION_FIELDS = frozenset(f.name for f in fields(FederationData))
+
 class Federation:
     """Federation operations wrapper"""
     
     @staticmethod
     def generate_fed_id() -> str:
         """Generate unique federation ID"""
-        import uuid
-        return str(uuid.uuid4())[:8]
+        # 8 hex characters straight from the OS random source
+        return os.urandom(4).hex()
     
     @staticmethod
     def create_federation(name: str, owner_id: int) -> FederationData:
@@ -3,10 +3,13 @@ Note model for database operations
 """
 from typing import Dict, Any, Optional
 from datetime import datetime
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from bson import ObjectId
 
-@dataclass
+# Bound once - strings only show up for documents that went through JSON
+_FROMISO = datetime.fromisoformat
+
+@dataclass(slots=True)
 class NoteData:
     """Note data model"""
     chat_id: str
@@ -20,21 +23,34 @@ class NoteData:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for database storage"""
-        data = asdict(self)
-        if self._id is None:
-            data.pop("_id")
+        data = {
+            "chat_id": self.chat_id,
+            "name": self.name,
+            "content": self.content,
+            "file_id": self.file_id,
+            "file_type": self.file_type,
+            "created_by": self.created_by,
+            "created_at": self.created_at
+        }
+        if self._id is not None:
+            data["_id"] = self._id
         return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'NoteData':
         """Create instance from database document"""
+        # Already deserialized (e.g. handed back from a cache)
+        if data.__class__ is cls:
+            return data
+        
         # Handle ObjectId
         if "_id" in data and isinstance(data["_id"], ObjectId):
             data["_id"] = str(data["_id"])
         
         # Handle datetime
-        if "created_at" in data and isinstance(data["created_at"], str):
-            data["created_at"] = datetime.fromisoformat(data["created_at"])
+        created_at = data.get("created_at")
+        if type(created_at) is str:
+            data["created_at"] = _FROMISO(created_at)
         
         return cls(**data)
 
@@ -1,11 +1,23 @@
 """
 User model for database operations
 """
+from math import isqrt
+from time import monotonic
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
 
-@dataclass
+# Bound once - strings only show up for documents that went through JSON
+_FROMISO = datetime.fromisoformat
+
+# Fields that may arrive as ISO strings
+_CHAT_DATETIME_FIELDS = ("last_warn", "flood_start", "last_xp")
+_USER_DATETIME_FIELDS = ("created_at", "updated_at")
+
+# Seconds between XP awards in a chat
+XP_COOLDOWN = 60
+
+@dataclass(slots=True)
 class UserChatData:
     """User data for a specific chat"""
     approved: bool = False
@@ -21,6 +33,8 @@ class UserChatData:
     xp: int = 0
     level: int = 0
     last_xp: Optional[datetime] = None
+    # monotonic() of the last award - in-process only, never stored
+    last_xp_ts: Optional[float] = field(default=None, repr=False, compare=False)
     
     # Economy
     balance: int = 0
@@ -28,78 +42,92 @@ class UserChatData:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for database storage"""
-        return asdict(self)
+        # Shallow on purpose - the BSON encoder walks nested values itself
+        return {
+            "approved": self.approved,
+            "warnings": self.warnings,
+            "warn_reasons": self.warn_reasons,
+            "last_warn": self.last_warn,
+            "message_count": self.message_count,
+            "flood_start": self.flood_start,
+            "xp": self.xp,
+            "level": self.level,
+            "last_xp": self.last_xp,
+            "balance": self.balance,
+            "bank": self.bank
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'UserChatData':
         """Create instance from database document"""
+        # Already deserialized (e.g. handed back from a cache)
+        if data.__class__ is cls:
+            return data
+        
         # Handle datetime fields
-        for field_name in ["last_warn", "flood_start", "last_xp"]:
-            if field_name in data and data[field_name] is not None:
-                if isinstance(data[field_name], str):
-                    data[field_name] = datetime.fromisoformat(data[field_name])
+        for field_name in _CHAT_DATETIME_FIELDS:
+            value = data.get(field_name)
+            if type(value) is str:
+                data[field_name] = _FROMISO(value)
         
         # Filter out unknown fields
-        valid_fields = set(cls.__dataclass_fields__.keys())
-        filtered_data = {k: v for k, v in data.items() if k in valid_fields}
+        filtered_data = {k: data[k] for k in data.keys() & _CHAT_DATA_FIELDS}
         
         return cls(**filtered_data)
 
-@dataclass
+@dataclass(slots=True)
 class UserData:
     """User data model"""
-    user_id: str
+    user_id: int
     username: Optional[str] = None
     first_name: str = ""
     last_name: str = ""
-    chat_data: Dict[str, UserChatData] = field(default_factory=dict)
+    # Keyed by int chat ID - MongoDB needs string keys, so they're converted in to_dict/from_dict
+    chat_data: Dict[int, UserChatData] = field(default_factory=dict)
     language: str = "en"
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for database storage"""
-        data = asdict(self)
-        # Convert user_id to _id for MongoDB
-        data["_id"] = data.pop("user_id")
-        
-        # Convert chat_data to dict format
-        chat_data_dict = {}
-        for chat_id, chat_data in data["chat_data"].items():
-            if isinstance(chat_data, UserChatData):
-                chat_data_dict[chat_id] = chat_data.to_dict()
-            else:
-                chat_data_dict[chat_id] = chat_data
-        data["chat_data"] = chat_data_dict
-        
-        return data
+        return {
+            # user_id is stored as _id for MongoDB
+            "_id": self.user_id,
+            "username": self.username,
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+            "chat_data": {str(chat_id): chat_data.to_dict() for chat_id, chat_data in self.chat_data.items()},
+            "language": self.language,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'UserData':
         """Create instance from database document"""
+        # Already deserialized (e.g. handed back from a cache)
+        if data.__class__ is cls:
+            return data
+        
         # Convert _id back to user_id
         if "_id" in data:
             data["user_id"] = data.pop("_id")
         
         # Handle datetime fields
-        for field_name in ["created_at", "updated_at"]:
-            if field_name in data and data[field_name] is not None:
-                if isinstance(data[field_name], str):
-                    data[field_name] = datetime.fromisoformat(data[field_name])
+        for field_name in _USER_DATETIME_FIELDS:
+            value = data.get(field_name)
+            if type(value) is str:
+                data[field_name] = _FROMISO(value)
         
         # Convert chat_data back to UserChatData objects
-        chat_data_dict = {}
-        if "chat_data" in data:
-            for chat_id, chat_data in data["chat_data"].items():
-                if isinstance(chat_data, dict):
-                    chat_data_dict[chat_id] = UserChatData.from_dict(chat_data)
-                else:
-                    chat_data_dict[chat_id] = chat_data
-        data["chat_data"] = chat_data_dict
+        chat_from_dict = UserChatData.from_dict
+        data["chat_data"] = {
+            int(chat_id): chat_from_dict(chat_data) if isinstance(chat_data, dict) else chat_data
+            for chat_id, chat_data in data.get("chat_data", {}).items()
+        }
         
         # Filter out unknown fields
-        valid_fields = set(cls.__dataclass_fields__.keys())
-        filtered_data = {k: v for k, v in data.items() if k in valid_fields}
+        filtered_data = {k: data[k] for k in data.keys() & _USER_DATA_FIELDS}
         
         return cls(**filtered_data)
     
@@ -109,10 +137,12 @@ class UserData:
     
     def get_chat_data(self, chat_id: int) -> UserChatData:
         """Get or create chat data for specific chat"""
-        chat_id_str = str(chat_id)
-        if chat_id_str not in self.chat_data:
-            self.chat_data[chat_id_str] = UserChatData()
-        return self.chat_data[chat_id_str]
+        # int() hands back int IDs as-is, so the common case allocates nothing
+        key = int(chat_id)
+        chat_data = self.chat_data.get(key)
+        if chat_data is None:
+            chat_data = self.chat_data[key] = UserChatData()
+        return chat_data
     
     def add_warning(self, chat_id: int, reason: str = "No reason provided"):
         """Add a warning to user in specific chat"""
@@ -158,16 +188,21 @@ class UserData:
         chat_data = self.get_chat_data(chat_id)
         
         # Check cooldown (prevent XP farming)
-        now = datetime.utcnow()
-        if chat_data.last_xp and (now - chat_data.last_xp).seconds < 60:
+        now = monotonic()
+        if chat_data.last_xp_ts is not None:
+            if now - chat_data.last_xp_ts < XP_COOLDOWN:
+                return False
+        elif chat_data.last_xp and (datetime.utcnow() - chat_data.last_xp).total_seconds() < XP_COOLDOWN:
+            # Freshly loaded from the database - only the wall-clock time is known
             return False
         
         chat_data.xp += amount
-        chat_data.last_xp = now
+        chat_data.last_xp = datetime.utcnow()
+        chat_data.last_xp_ts = now
         
         # Calculate level (XP required = level^2 * 100)
         old_level = chat_data.level
-        new_level = int((chat_data.xp / 100) ** 0.5)
+        new_level = isqrt(chat_data.xp // 100)
         
         if new_level > old_level:
             chat_data.level = new_level
@@ -203,6 +238,10 @@ class UserData:
             return True
         return False
 
+# Field names of the dataclasses above, computed once
+_CHAT_DATA_FIELDS = frozenset(f.name for f in fields(UserChatData))
+_USER_DATA_FIELDS = frozenset(f.name for f in fields(UserData))
+
 class User:
     """User operations wrapper"""
     
@@ -210,7 +249,7 @@ class User:
     def create_default_data(user_id: int, username: str = None, first_name: str = "", last_name: str = "") -> UserData:
         """Create default user data"""
         return UserData(
-            user_id=str(user_id),
+            user_id=user_id,
             username=username,
             first_name=first_name,
             last_name=last_name
@@ -219,7 +258,8 @@ class User:
     @staticmethod
     def calculate_level_from_xp(xp: int) -> int:
         """Calculate level from XP amount"""
-        return int((xp / 100) ** 0.5)
+        # Integer square root - exact, and no float round trip
+        return isqrt(xp // 100)
     
     @staticmethod
     def calculate_xp_for_level(level: int) -> int:
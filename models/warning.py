@@ -3,10 +3,13 @@ Warning model for database operations
 """
 from typing import Dict, Any, Optional
 from datetime import datetime
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from bson import ObjectId
 
-@dataclass
+# Bound once - strings only show up for documents that went through JSON
+_FROMISO = datetime.fromisoformat
+
+@dataclass(slots=True)
 class WarningData:
     """Warning data model"""
     chat_id: str
@@ -19,21 +22,33 @@ class WarningData:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for database storage"""
-        data = asdict(self)
-        if self._id is None:
-            data.pop("_id")
+        data = {
+            "chat_id": self.chat_id,
+            "user_id": self.user_id,
+            "reason": self.reason,
+            "warned_by": self.warned_by,
+            "warn_count": self.warn_count,
+            "created_at": self.created_at
+        }
+        if self._id is not None:
+            data["_id"] = self._id
         return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'WarningData':
         """Create instance from database document"""
+        # Already deserialized (e.g. handed back from a cache)
+        if data.__class__ is cls:
+            return data
+        
         # Handle ObjectId
         if "_id" in data and isinstance(data["_id"], ObjectId):
             data["_id"] = str(data["_id"])
         
         # Handle datetime
-        if "created_at" in data and isinstance(data["created_at"], str):
-            data["created_at"] = datetime.fromisoformat(data["created_at"])
+        created_at = data.get("created_at")
+        if type(created_at) is str:
+            data["created_at"] = _FROMISO(created_at)
         
         return cls(**data)
 
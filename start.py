@@ -5,8 +5,12 @@ Quick start script for ZyraX Bot
 import subprocess
 import sys
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
+# Packages that must be installed before the bot can start
+REQUIRED_PACKAGES = ("telegram", "pyrogram", "pymongo")
+
 def check_python_version():
     """Check if Python version is compatible"""
     if sys.version_info < (3, 11):
@@ -17,22 +21,21 @@ def check_python_version():
 
 def check_requirements():
     """Check if requirements are installed"""
-    try:
-        import telegram
-        import pyrogram
-        import motor
+    # find_spec locates the packages without executing them
+    missing = [name for name in REQUIRED_PACKAGES if find_spec(name) is None]
+    if not missing:
         print("✅ All required packages are installed")
         return True
-    except ImportError as e:
-        print(f"❌ Missing required package: {e}")
-        print("Installing requirements...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
-            print("✅ Requirements installed successfully")
-            return True
-        except subprocess.CalledProcessError:
-            print("❌ Failed to install requirements")
-            return False
+    
+    print(f"❌ Missing required package: {', '.join(missing)}")
+    print("Installing requirements...")
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        print("✅ Requirements installed successfully")
+        return True
+    except subprocess.CalledProcessError:
+        print("❌ Failed to install requirements")
+        return False
 
 def check_config():
     """Check if configuration exists"""
@@ -0,0 +1,136 @@
+"""
+Tests for core.database
+"""
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+from pymongo import ReturnDocument
+
+from core.database import ChatCollection, UserCollection, DEFAULT_CHAT_SETTINGS, DEFAULT_USER_CHAT_DATA
+
+
+class _RecordingCollection:
+    """Collection stand-in that keeps the arguments of each write"""
+    
+    def __init__(self):
+        self.calls = []
+    
+    async def update_one(self, filter, update, upsert=False):
+        self.calls.append((filter, update, upsert))
+        return SimpleNamespace(modified_count=0, upserted_id=filter["_id"])
+    
+    async def find_one_and_update(self, filter, update, **kwargs):
+        self.calls.append((filter, update, kwargs))
+        # What the server returns for the projected chat entry
+        chat_id_str = next(iter(kwargs["projection"])).split(".")[1]
+        return {"_id": filter["_id"], "chat_data": {chat_id_str: dict(DEFAULT_USER_CHAT_DATA)}}
+
+
+def _chats():
+    collection = _RecordingCollection()
+    return ChatCollection(SimpleNamespace(chats=collection)), collection
+
+
+def test_upsert_nested_field_keeps_sibling_defaults():
+    chats, collection = _chats()
+    assert asyncio.run(chats.update_chat(-100, {"locks.sticker": True}, upsert=True))
+    
+    filter, update, upsert = collection.calls[0]
+    assert filter == {"_id": -100} and upsert
+    assert update["$set"] == {"locks.sticker": True}
+    assert update["$currentDate"] == {"updated_at": True}
+    
+    on_insert = update["$setOnInsert"]
+    assert "locks" not in on_insert
+    assert "locks.sticker" not in on_insert
+    for lock, value in DEFAULT_CHAT_SETTINGS["locks"].items():
+        if lock != "sticker":
+            assert on_insert[f"locks.{lock}"] == value
+    assert on_insert["clean_service"] == DEFAULT_CHAT_SETTINGS["clean_service"]
+    assert "updated_at" not in on_insert
+
+
+def test_upsert_top_level_field_drops_only_that_default():
+    chats, collection = _chats()
+    asyncio.run(chats.update_chat(-100, {"language": "de"}, upsert=True))
+    
+    on_insert = collection.calls[0][1]["$setOnInsert"]
+    assert "language" not in on_insert
+    assert on_insert["locks"] == DEFAULT_CHAT_SETTINGS["locks"]
+    # $set and $setOnInsert paths must never overlap or prefix each other
+    for path in on_insert:
+        assert not path.startswith("language")
+
+
+def test_update_without_upsert_has_no_insert_defaults():
+    chats, collection = _chats()
+    asyncio.run(chats.update_chat(-100, {"language": "de"}))
+    assert "$setOnInsert" not in collection.calls[0][1]
+
+
+def test_update_refreshes_cached_updated_at():
+    chats, _ = _chats()
+    stale = datetime(2000, 1, 1)
+    chats._cache[-100] = {"_id": -100, "language": "en", "updated_at": stale}
+    asyncio.run(chats.update_chat(-100, {"language": "de"}))
+    
+    cached = chats._cache[-100]
+    assert cached["language"] == "de"
+    assert cached["updated_at"] > stale
+
+
+def _users():
+    collection = _RecordingCollection()
+    return UserCollection(SimpleNamespace(users=collection)), collection
+
+
+def test_get_user_chat_data_fills_missing_fields_in_one_projected_upsert():
+    users, collection = _users()
+    chat_data = asyncio.run(users.get_user_chat_data(7, -100))
+    assert chat_data == DEFAULT_USER_CHAT_DATA
+    
+    filter, pipeline, kwargs = collection.calls[0]
+    assert filter == {"_id": 7}
+    assert kwargs["upsert"] and kwargs["return_document"] is ReturnDocument.AFTER
+    assert kwargs["projection"] == {"chat_data.-100": 1}
+    
+    # One $set stage, each field only written where it is missing
+    assert len(pipeline) == 1
+    stage = pipeline[0]["$set"]
+    assert "chat_data" not in stage
+    assert stage["chat_data.-100"] == {"$ifNull": ["$chat_data.-100", {"$literal": DEFAULT_USER_CHAT_DATA}]}
+    assert stage["language"] == {"$ifNull": ["$language", {"$literal": "en"}]}
+
+
+def test_get_user_chat_data_answers_from_cache():
+    users, collection = _users()
+    users._cache[7] = {"_id": 7, "chat_data": {"-100": {"warns": 2}}}
+    assert asyncio.run(users.get_user_chat_data(7, -100)) == {"warns": 2}
+    assert collection.calls == []
+
+
+def test_get_user_chat_data_adds_fetched_entry_to_cached_user():
+    users, _ = _users()
+    users._cache[7] = {"_id": 7, "chat_data": {}}
+    asyncio.run(users.get_user_chat_data(7, -100))
+    assert users._cache[7]["chat_data"]["-100"] == DEFAULT_USER_CHAT_DATA
+
+
+def test_update_user_chat_data_upserts_without_conflicting_paths():
+    users, collection = _users()
+    users._cache[7] = {"_id": 7, "chat_data": {}}
+    assert asyncio.run(users.update_user_chat_data(7, -100, {"warns": 1, "approved": True}))
+    
+    filter, update, upsert = collection.calls[0]
+    assert filter == {"_id": 7} and upsert
+    assert update["$set"] == {"chat_data.-100.warns": 1, "chat_data.-100.approved": True}
+    assert update["$currentDate"] == {"updated_at": True}
+    
+    # $setOnInsert creates the user but must not touch paths set above
+    on_insert = update["$setOnInsert"]
+    assert "chat_data" not in on_insert and "updated_at" not in on_insert
+    assert on_insert["language"] == "en" and "created_at" in on_insert
+    
+    # The cached user is dropped rather than patched
+    assert 7 not in users._cache
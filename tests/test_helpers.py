@@ -0,0 +1,115 @@
+"""
+Tests for core.helpers
+"""
+import asyncio
+from types import SimpleNamespace
+
+from telegram import ChatPermissions
+from telegram.error import BadRequest, TimedOut
+
+from core import helpers
+
+
+class _RecordingBot:
+    """Bot stand-in that keeps the permissions passed to restrict_chat_member"""
+    
+    def __init__(self):
+        self.permissions = None
+    
+    async def restrict_chat_member(self, chat_id, user_id, permissions, until_date=None):
+        self.permissions = permissions
+        return True
+
+
+def _restrict(**flags) -> ChatPermissions:
+    bot = _RecordingBot()
+    update = SimpleNamespace(effective_chat=SimpleNamespace(id=-100))
+    context = SimpleNamespace(bot=bot)
+    assert asyncio.run(helpers.restrict_user(update, context, 1, **flags))
+    return bot.permissions
+
+
+def test_mute_permissions_deny_everything():
+    perms = helpers._MUTE_PERMS
+    assert isinstance(perms, ChatPermissions)
+    assert not any(perms.to_dict().values())
+
+
+def test_full_restrict_reuses_mute_permissions():
+    assert _restrict() is helpers._MUTE_PERMS
+
+
+def test_partial_restrict_builds_per_type_permissions():
+    perms = _restrict(can_send_messages=True, can_send_media=True)
+    assert perms.can_send_messages
+    assert perms.can_send_photos and perms.can_send_videos and perms.can_send_voice_notes
+    assert not perms.can_send_other_messages
+    assert not perms.can_add_web_page_previews
+
+
+class _TimingOutBot:
+    """Bot stand-in whose every request times out"""
+    
+    id = 42
+    
+    def __getattr__(self, name):
+        async def request(*args, **kwargs):
+            raise TimedOut()
+        return request
+
+
+def _timing_out(chat_id: int):
+    update = SimpleNamespace(
+        effective_chat=SimpleNamespace(id=chat_id),
+        effective_user=SimpleNamespace(id=1),
+        effective_message=SimpleNamespace(message_id=1)
+    )
+    return update, SimpleNamespace(bot=_TimingOutBot())
+
+
+def test_permission_checks_return_false_on_timeout():
+    update, context = _timing_out(-200)
+    assert asyncio.run(helpers.is_user_admin(update, context)) is False
+    assert asyncio.run(helpers.is_bot_admin(update, context)) is False
+    assert asyncio.run(helpers.has_permission(update, context, 'can_restrict_members')) is False
+
+
+def test_send_message_returns_none_on_timeout():
+    update, context = _timing_out(-201)
+    assert asyncio.run(helpers.send_message(update, context, "hello")) is None
+
+
+def test_moderation_helpers_return_false_on_timeout():
+    update, context = _timing_out(-202)
+    assert asyncio.run(helpers.restrict_user(update, context, 1)) is False
+    assert asyncio.run(helpers.ban_user(update, context, 1)) is False
+    assert asyncio.run(helpers.unban_user(update, context, 1)) is False
+    assert asyncio.run(helpers.delete_message(update, context)) is False
+
+
+class _ParsingBot:
+    """Bot stand-in that rejects Markdown containing an unclosed '*'"""
+    
+    def __init__(self):
+        self.sent = []
+    
+    async def send_message(self, chat_id, text, parse_mode=None, **kwargs):
+        if parse_mode and text.count('*') % 2:
+            raise BadRequest("Can't parse entities: can't find end of the entity")
+        self.sent.append((text, parse_mode))
+        return True
+
+
+def _send(text: str):
+    bot = _ParsingBot()
+    update = SimpleNamespace(effective_chat=SimpleNamespace(id=-300), effective_message=None)
+    asyncio.run(helpers.send_message(update, SimpleNamespace(bot=bot), text))
+    return bot.sent
+
+
+def test_send_message_keeps_markdown_with_single_underscore():
+    assert _send("**Banned** john_doe") == [("**Banned** john_doe", "Markdown")]
+
+
+def test_send_message_falls_back_to_plain_text_after_parse_error():
+    assert _send("*broken") == [("*broken", None)]
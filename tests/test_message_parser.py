@@ -0,0 +1,39 @@
+"""
+Tests for utils.message_parser
+"""
+from utils.message_parser import MessageParser
+
+split_message = MessageParser.split_message
+
+
+def test_text_at_limit_is_one_chunk():
+    text = "a" * 10
+    assert split_message(text, max_length=10) == [text]
+
+
+def test_text_one_over_limit_splits_on_lines():
+    assert split_message("aaaaa\nbbbbb", max_length=10) == ["aaaaa", "bbbbb"]
+
+
+def test_lines_fill_chunks_up_to_limit():
+    chunks = split_message("aaa\nbbb\nccc\nddd", max_length=8)
+    assert chunks == ["aaa\nbbb", "ccc\nddd"]
+    assert all(len(chunk) <= 8 for chunk in chunks)
+
+
+def test_oversize_line_splits_on_spaces():
+    line = " ".join(["word"] * 10)
+    chunks = split_message(line, max_length=12)
+    assert all(len(chunk) <= 12 for chunk in chunks)
+    assert " ".join(chunks).split() == line.split()
+
+
+def test_oversize_word_is_hard_sliced():
+    chunks = split_message("x" * 25, max_length=10)
+    assert chunks == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_line_after_oversize_line_keeps_its_newline():
+    chunks = split_message("aaaa bbbb cccc\ndd", max_length=10)
+    assert all(len(chunk) <= 10 for chunk in chunks)
+    assert chunks[-1].endswith("cccc\ndd")
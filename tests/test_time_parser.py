@@ -0,0 +1,27 @@
+"""
+Tests for utils.time_parser
+"""
+import pytest
+
+from core.constants import MINUTE, HOUR, MONTH
+from utils.time_parser import TimeParser, parse_time_string
+
+
+@pytest.mark.parametrize("time_str, seconds", [
+    ("10m", 10 * MINUTE),
+    ("0s", 0),
+    ("1M", MONTH),
+    ("1m", MINUTE),
+    (" 2 h", 2 * HOUR),
+])
+def test_parse_valid(time_str, seconds):
+    assert TimeParser.parse_time_string(time_str) == seconds
+
+
+@pytest.mark.parametrize("time_str", ["5x", "", None, "m", "-5m", "1.5h", "10"])
+def test_parse_invalid(time_str):
+    assert TimeParser.parse_time_string(time_str) is None
+
+
+def test_module_function_matches_class():
+    assert parse_time_string("3d") == TimeParser.parse_time_string("3d")
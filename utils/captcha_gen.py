@@ -7,6 +7,28 @@ from typing import Tuple, Dict, Any
 from PIL import Image, ImageDraw, ImageFont
 import io
 
+# Private generator, unaffected by anything else seeding the random module
+_rng = random.Random()
+
+# Characters used in text and image captchas
+_ALPHABET = string.ascii_uppercase + string.digits
+
+# Candidates for emoji captchas
+_EMOJIS = ('🍎', '🍌', '🍊', '🍇', '🍓', '🥝', '🍑', '🥭', '🍍', '🥥')
+
+# Loaded on first use, then shared by every image captcha
+_font = None
+
+def _get_font():
+    """Captcha font, falling back to PIL's default if Arial is unavailable"""
+    global _font
+    if _font is None:
+        try:
+            _font = ImageFont.truetype("arial.ttf", 24)
+        except OSError:
+            _font = ImageFont.load_default()
+    return _font
+
 class CaptchaGenerator:
     """Generate different types of captcha challenges"""
     
@@ -19,21 +41,21 @@ class CaptchaGenerator:
             Tuple of (question, answer)
         """
         operations = ['+', '-', '*']
-        operation = random.choice(operations)
+        operation = _rng.choice(operations)
         
         if operation == '+':
-            a = random.randint(1, 50)
-            b = random.randint(1, 50)
+            a = _rng.randint(1, 50)
+            b = _rng.randint(1, 50)
             answer = a + b
             question = f"What is {a} + {b}?"
         elif operation == '-':
-            a = random.randint(10, 100)
-            b = random.randint(1, a - 1)
+            a = _rng.randint(10, 100)
+            b = _rng.randint(1, a - 1)
             answer = a - b
             question = f"What is {a} - {b}?"
         else:  # multiplication
-            a = random.randint(1, 12)
-            b = random.randint(1, 12)
+            a = _rng.randint(1, 12)
+            b = _rng.randint(1, 12)
             answer = a * b
             question = f"What is {a} × {b}?"
         
@@ -48,8 +70,8 @@ class CaptchaGenerator:
             Tuple of (question, answer)
         """
         # Generate random string
-        length = random.randint(4, 6)
-        answer = ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
+        length = _rng.randint(4, 6)
+        answer = ''.join(_rng.choices(_ALPHABET, k=length))
         question = f"Type this text: `{answer}`"
         
         return question, answer
@@ -62,19 +84,12 @@ class CaptchaGenerator:
         Returns:
             Tuple of (question, correct_answer, buttons_data)
         """
-        # Generate random number for correct answer
-        correct = random.randint(1000, 9999)
-        
-        # Generate wrong answers
-        wrong_answers = []
-        while len(wrong_answers) < 3:
-            wrong = random.randint(1000, 9999)
-            if wrong != correct and wrong not in wrong_answers:
-                wrong_answers.append(wrong)
+        # Four distinct numbers in one draw - the first is the correct answer
+        all_answers = _rng.sample(range(1000, 10000), 4)
+        correct = all_answers[0]
         
         # Shuffle answers
-        all_answers = [correct] + wrong_answers
-        random.shuffle(all_answers)
+        _rng.shuffle(all_answers)
         
         question = f"Click the button with the number: **{correct}**"
         
@@ -97,45 +112,43 @@ class CaptchaGenerator:
             Tuple of (image_bytes, text_answer)
         """
         if text is None:
-            text = ''.join(random.choices(string.ascii_uppercase + string.digits, k=5))
+            text = ''.join(_rng.choices(_ALPHABET, k=5))
         
         # Create image
         width, height = 200, 80
         image = Image.new('RGB', (width, height), color='white')
         draw = ImageDraw.Draw(image)
         
-        # Try to use a font, fallback to default
-        try:
-            font = ImageFont.truetype("arial.ttf", 24)
-        except:
-            font = ImageFont.load_default()
+        font = _get_font()
         
         # Add some noise lines
-        for _ in range(random.randint(3, 7)):
-            x1 = random.randint(0, width)
-            y1 = random.randint(0, height)
-            x2 = random.randint(0, width)
-            y2 = random.randint(0, height)
+        for _ in range(_rng.randint(3, 7)):
+            x1 = _rng.randint(0, width)
+            y1 = _rng.randint(0, height)
+            x2 = _rng.randint(0, width)
+            y2 = _rng.randint(0, height)
             draw.line([(x1, y1), (x2, y2)], fill='lightgray', width=1)
         
         # Add text with slight rotation and positioning
         text_width = draw.textlength(text, font=font)
-        x = (width - text_width) // 2 + random.randint(-10, 10)
-        y = (height - 24) // 2 + random.randint(-5, 5)
+        x = (width - text_width) // 2 + _rng.randint(-10, 10)
+        y = (height - 24) // 2 + _rng.randint(-5, 5)
         
         # Add text with random color
         color = (
-            random.randint(0, 100),
-            random.randint(0, 100),
-            random.randint(0, 100)
+            _rng.randint(0, 100),
+            _rng.randint(0, 100),
+            _rng.randint(0, 100)
         )
         draw.text((x, y), text, fill=color, font=font)
         
-        # Add some noise dots
-        for _ in range(random.randint(50, 100)):
-            x = random.randint(0, width)
-            y = random.randint(0, height)
-            draw.point((x, y), fill='lightgray')
+        # Add some noise dots, drawn in a single call
+        randint = _rng.randint
+        dots = [
+            (randint(0, width), randint(0, height))
+            for _ in range(randint(50, 100))
+        ]
+        draw.point(dots, fill='lightgray')
         
         # Convert to bytes
         img_buffer = io.BytesIO()
@@ -152,25 +165,21 @@ class CaptchaGenerator:
         Returns:
             Tuple of (question, answer)
         """
-        emojis = ['🍎', '🍌', '🍊', '🍇', '🍓', '🥝', '🍑', '🥭', '🍍', '🥥']
-        target_emoji = random.choice(emojis)
+        target_emoji = _rng.choice(_EMOJIS)
         
         # Create a sequence with the target emoji
-        sequence_length = random.randint(8, 12)
-        sequence = []
-        target_count = random.randint(2, 4)
+        sequence_length = _rng.randint(8, 12)
+        target_count = _rng.randint(2, 4)
         
         # Add target emojis
-        for _ in range(target_count):
-            sequence.append(target_emoji)
+        sequence = [target_emoji] * target_count
         
         # Fill rest with random emojis
-        while len(sequence) < sequence_length:
-            other_emoji = random.choice([e for e in emojis if e != target_emoji])
-            sequence.append(other_emoji)
+        others = [e for e in _EMOJIS if e != target_emoji]
+        sequence.extend(_rng.choices(others, k=sequence_length - target_count))
         
         # Shuffle the sequence
-        random.shuffle(sequence)
+        _rng.shuffle(sequence)
         
         sequence_str = ''.join(sequence)
         question = f"How many {target_emoji} do you see?\n{sequence_str}"
@@ -2,9 +2,83 @@
 Message parsing utilities for ZyraX Bot
 """
 import re
+from collections import ChainMap
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, Any, List, Tuple, Optional
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
+# Button syntax: [Button Text](buttonurl:URL)
+_BUTTON_RE = re.compile(r'\[([^\]]+)\]\(buttonurl:([^)]+)\)')
+
+# Characters that need escaping in Telegram markdown, mapped to their escaped form
+_MD_ESCAPE = str.maketrans({char: f'\\{char}' for char in '_*[]()~`>#+-=|{}.!'})
+
+# Media attributes checked by extract_file_info, with the extra fields each one reports
+_FILE_TYPES = (
+    ('photo', ()),
+    ('video', ('duration',)),
+    ('animation', ()),
+    ('document', ('file_name',)),
+    ('sticker', ()),
+    ('audio', ('duration',)),
+    ('voice', ('duration',)),
+    ('video_note', ('duration',))
+)
+
+# Default values for common variables
+_DEFAULT_VARS = MappingProxyType({
+    'mention': 'User',
+    'first': 'User',
+    'last': '',
+    'username': 'user',
+    'chat': 'this chat',
+    'count': '0',
+    'limit': '0',
+    'reason': 'No reason provided',
+    'level': '0',
+    'xp': '0'
+})
+
+def _split_buttons(line: str) -> Tuple[str, List[InlineKeyboardButton]]:
+    """Collect the buttons in a line and the text around them in one pass"""
+    row = []
+    pieces = []
+    last = 0
+    for match in _BUTTON_RE.finditer(line):
+        pieces.append(line[last:match.start()])
+        button_text, button_url = match.groups()
+        row.append(InlineKeyboardButton(button_text.strip(), url=button_url.strip()))
+        last = match.end()
+    
+    if not row:
+        return line, row
+    
+    pieces.append(line[last:])
+    return ''.join(pieces), row
+
+@lru_cache(maxsize=4096)
+def _user_variables(user_id, first: str, last: str, username: str, handle: Optional[str]) -> Tuple[Tuple[str, str], ...]:
+    """Template variables for one user, as an immutable (name, value) tuple"""
+    # Create mention - handle is the real username, without the 'user' fallback
+    if handle:
+        mention = f"@{handle}"
+    elif user_id:
+        mention = f"[{first}](tg://user?id={user_id})"
+    else:
+        mention = first
+    
+    # Full name
+    fullname = f"{first} {last}" if last else first
+    
+    return (
+        ('first', first),
+        ('last', last),
+        ('username', username),
+        ('mention', mention),
+        ('fullname', fullname)
+    )
+
 class MessageParser:
     """Parse messages with markdown, buttons, and variable substitution"""
     
@@ -26,27 +100,31 @@ class MessageParser:
         if not text:
             return text, None
         
-        # Find all button patterns
-        button_pattern = r'\[([^\]]+)\]\(buttonurl:([^)]+)\)'
+        # Most texts have no buttons at all
+        if '(buttonurl:' not in text:
+            return text.strip(), None
+        
+        # Single line - one row at most, no splitting or rejoining
+        if '\n' not in text:
+            cleaned_text, row = _split_buttons(text)
+            return cleaned_text.strip(), InlineKeyboardMarkup([row]) if row else None
         
-        lines = text.split('\n')
         cleaned_lines = []
         keyboard_rows = []
         
-        for line in lines:
-            buttons_in_line = re.findall(button_pattern, line)
+        for line in text.split('\n'):
+            if '[' not in line:
+                # Regular text line
+                cleaned_lines.append(line)
+                continue
             
-            if buttons_in_line:
+            cleaned_line, row = _split_buttons(line)
+            if row:
                 # This line contains buttons
-                row = []
-                for button_text, button_url in buttons_in_line:
-                    row.append(InlineKeyboardButton(button_text.strip(), url=button_url.strip()))
-                
-                if row:
-                    keyboard_rows.append(row)
+                keyboard_rows.append(row)
                 
-                # Remove button syntax from text
-                cleaned_line = re.sub(button_pattern, '', line).strip()
+                # Keep whatever text surrounds the buttons
+                cleaned_line = cleaned_line.strip()
                 if cleaned_line:
                     cleaned_lines.append(cleaned_line)
             else:
@@ -82,29 +160,13 @@ class MessageParser:
         Returns:
             Text with variables substituted
         """
-        if not text:
+        # Nothing to substitute in plain text
+        if not text or '{' not in text:
             return text
         
-        # Default values for common variables
-        defaults = {
-            'mention': 'User',
-            'first': 'User',
-            'last': '',
-            'username': 'user',
-            'chat': 'this chat',
-            'count': '0',
-            'limit': '0',
-            'reason': 'No reason provided',
-            'level': '0',
-            'xp': '0'
-        }
-        
-        # Merge with provided variables
-        variables = {**defaults, **variables}
-        
-        # Substitute variables
+        # Substitute variables, falling back to the defaults without merging
         try:
-            return text.format(**variables)
+            return text.format_map(ChainMap(variables, _DEFAULT_VARS))
         except KeyError as e:
             # If a variable is missing, leave it as is
             return text
@@ -115,13 +177,8 @@ class MessageParser:
         if not text:
             return text
         
-        # Characters that need escaping in Telegram markdown
-        escape_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-        
-        for char in escape_chars:
-            text = text.replace(char, f'\\{char}')
-        
-        return text
+        # One pass over the text instead of one per character
+        return text.translate(_MD_ESCAPE)
     
     @staticmethod
     def parse_markdown_buttons(text: str) -> Tuple[str, Optional[InlineKeyboardMarkup]]:
@@ -156,8 +213,7 @@ class MessageParser:
         if not text:
             return errors
         
-        button_pattern = r'\[([^\]]+)\]\(buttonurl:([^)]+)\)'
-        buttons = re.findall(button_pattern, text)
+        buttons = _BUTTON_RE.findall(text)
         
         for i, (button_text, button_url) in enumerate(buttons, 1):
             # Validate button text
@@ -188,64 +244,25 @@ class MessageParser:
         if not message:
             return None
         
-        file_info = {}
-        
-        # Check for different file types
-        if message.photo:
-            file_info = {
-                'type': 'photo',
-                'file_id': message.photo[-1].file_id,  # Get largest photo
-                'file_size': message.photo[-1].file_size
-            }
-        elif message.video:
-            file_info = {
-                'type': 'video',
-                'file_id': message.video.file_id,
-                'file_size': message.video.file_size,
-                'duration': message.video.duration
-            }
-        elif message.animation:
-            file_info = {
-                'type': 'animation',
-                'file_id': message.animation.file_id,
-                'file_size': message.animation.file_size
-            }
-        elif message.document:
-            file_info = {
-                'type': 'document',
-                'file_id': message.document.file_id,
-                'file_size': message.document.file_size,
-                'file_name': message.document.file_name
-            }
-        elif message.sticker:
-            file_info = {
-                'type': 'sticker',
-                'file_id': message.sticker.file_id,
-                'file_size': message.sticker.file_size
-            }
-        elif message.audio:
-            file_info = {
-                'type': 'audio',
-                'file_id': message.audio.file_id,
-                'file_size': message.audio.file_size,
-                'duration': message.audio.duration
-            }
-        elif message.voice:
-            file_info = {
-                'type': 'voice',
-                'file_id': message.voice.file_id,
-                'file_size': message.voice.file_size,
-                'duration': message.voice.duration
-            }
-        elif message.video_note:
+        # Check for different file types, in priority order
+        for file_type, extra_fields in _FILE_TYPES:
+            media = getattr(message, file_type, None)
+            if not media:
+                continue
+            
+            if file_type == 'photo':
+                media = media[-1]  # Get largest photo
+            
             file_info = {
-                'type': 'video_note',
-                'file_id': message.video_note.file_id,
-                'file_size': message.video_note.file_size,
-                'duration': message.video_note.duration
+                'type': file_type,
+                'file_id': media.file_id,
+                'file_size': media.file_size
             }
+            for field_name in extra_fields:
+                file_info[field_name] = getattr(media, field_name)
+            return file_info
         
-        return file_info if file_info else None
+        return None
     
     @staticmethod
     def format_user_variables(user_data: Dict[str, Any]) -> Dict[str, str]:
@@ -258,28 +275,14 @@ class MessageParser:
         Returns:
             Dict of template variables
         """
-        variables = {}
-        
-        # Basic user info
-        variables['first'] = user_data.get('first_name', 'User')
-        variables['last'] = user_data.get('last_name', '')
-        variables['username'] = user_data.get('username', 'user')
-        
-        # Create mention
-        if user_data.get('username'):
-            variables['mention'] = f"@{user_data['username']}"
-        elif user_data.get('id'):
-            variables['mention'] = f"[{variables['first']}](tg://user?id={user_data['id']})"
-        else:
-            variables['mention'] = variables['first']
-        
-        # Full name
-        if variables['last']:
-            variables['fullname'] = f"{variables['first']} {variables['last']}"
-        else:
-            variables['fullname'] = variables['first']
-        
-        return variables
+        # The same few users keep coming back, so the formatting is cached
+        return dict(_user_variables(
+            user_data.get('id'),
+            user_data.get('first_name', 'User'),
+            user_data.get('last_name', ''),
+            user_data.get('username', 'user'),
+            user_data.get('username')
+        ))
     
     @staticmethod
     def split_message(text: str, max_length: int = 4096) -> List[str]:
@@ -297,33 +300,42 @@ class MessageParser:
             return [text]
         
         chunks = []
-        current_chunk = ""
+        # Pieces of the chunk being built, with their separators, joined once on flush
+        current = []
+        length = 0
         
         # Split by lines first
-        lines = text.split('\n')
-        
-        for line in lines:
-            # If adding this line would exceed limit
-            if len(current_chunk) + len(line) + 1 > max_length:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = ""
-                
-                # If single line is too long, split it
-                if len(line) > max_length:
-                    words = line.split(' ')
-                    for word in words:
-                        if len(current_chunk) + len(word) + 1 > max_length:
-                            if current_chunk:
-                                chunks.append(current_chunk.strip())
-                                current_chunk = ""
-                        current_chunk += word + " "
-                else:
-                    current_chunk = line + "\n"
+        for line in text.split('\n'):
+            if len(line) > max_length:
+                # If single line is too long, start a new chunk and split it on spaces
+                pieces = [(word, ' ') for word in line.split(' ')]
+                pieces[-1] = (pieces[-1][0], '\n')
+                force_flush = True
             else:
-                current_chunk += line + "\n"
+                pieces = [(line, '\n')]
+                force_flush = False
+            
+            for piece, separator in pieces:
+                # If adding this piece would exceed limit
+                if current and (force_flush or length + len(piece) + 1 > max_length):
+                    chunk = ''.join(current).strip()
+                    if chunk:
+                        chunks.append(chunk)
+                    current = []
+                    length = 0
+                force_flush = False
+                
+                # A single word longer than the limit is cut into hard slices
+                while len(piece) > max_length:
+                    chunks.append(piece[:max_length])
+                    piece = piece[max_length:]
+                
+                current.append(piece)
+                current.append(separator)
+                length += len(piece) + 1
         
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
+        chunk = ''.join(current).strip()
+        if chunk:
+            chunks.append(chunk)
         
         return chunks
@@ -1,10 +1,18 @@
 """
 Time parsing utilities for ZyraX Bot
 """
-import re
 from typing import Optional, Tuple
 from core.constants import TIME_PATTERNS
 
+# Units used by format_duration, largest first
+_DURATION_UNITS = (
+    ("week", 604800),  # 7 days
+    ("day", 86400),    # 24 hours
+    ("hour", 3600),    # 60 minutes
+    ("minute", 60),    # 60 seconds
+    ("second", 1)
+)
+
 class TimeParser:
     """Parse time strings like '1m', '2h', '3d', etc."""
     
@@ -25,22 +33,15 @@ class TimeParser:
         # Remove spaces and convert to lowercase
         time_str = time_str.replace(" ", "").strip()
         
-        # Regex pattern to match number + unit
-        pattern = r'^(\d+)([smhdwM])$'
-        match = re.match(pattern, time_str)
-        
-        if not match:
-            return None
-        
-        amount, unit = match.groups()
-        amount = int(amount)
+        # Number + single-letter unit
+        amount, unit = time_str[:-1], time_str[-1:]
         
         # Get multiplier for unit
         multiplier = TIME_PATTERNS.get(unit)
-        if multiplier is None:
+        if multiplier is None or not amount.isdecimal():
             return None
         
-        return amount * multiplier
+        return int(amount) * multiplier
     
     @staticmethod
     def format_duration(seconds: int) -> str:
@@ -56,32 +57,23 @@ class TimeParser:
         if seconds == 0:
             return "0 seconds"
         
-        units = [
-            ("week", 604800),  # 7 days
-            ("day", 86400),    # 24 hours
-            ("hour", 3600),    # 60 minutes
-            ("minute", 60),    # 60 seconds
-            ("second", 1)
-        ]
+        # Under a minute there is only one part
+        if 0 < seconds < 60:
+            return f"{seconds} second{'' if seconds == 1 else 's'}"
         
         parts = []
         
-        for unit_name, unit_seconds in units:
+        for unit_name, unit_seconds in _DURATION_UNITS:
             if seconds >= unit_seconds:
-                unit_count = seconds // unit_seconds
-                seconds %= unit_seconds
-                
-                if unit_count == 1:
-                    parts.append(f"{unit_count} {unit_name}")
-                else:
-                    parts.append(f"{unit_count} {unit_name}s")
+                unit_count, seconds = divmod(seconds, unit_seconds)
+                parts.append(f"{unit_count} {unit_name}{'' if unit_count == 1 else 's'}")
         
         if len(parts) == 1:
             return parts[0]
         elif len(parts) == 2:
             return f"{parts[0]} and {parts[1]}"
         else:
-            return ", ".join(parts[:-1]) + f", and {parts[-1]}"
+            return f"{', '.join(parts[:-1])}, and {parts[-1]}"
     
     @staticmethod
     def is_valid_duration(duration_str: str) -> bool:
@@ -3,9 +3,19 @@ User resolution utilities for ZyraX Bot
 """
 import re
 from typing import Optional, Union, Dict, Any
+from cachetools import TTLCache
 from telegram import Update, User, Message
 from telegram.ext import ContextTypes
 
+# Users fetched from Telegram or seen in updates by ID, reused across updates
+_USERS_BY_ID: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+# Users seen in updates by lowercased username - the Bot API can't look usernames up
+_USERS_BY_NAME: TTLCache = TTLCache(maxsize=50_000, ttl=86_400)
+
+# Markdown mentions: [Name](tg://user?id=123456)
+_MENTION_RE = re.compile(r'\[([^\]]+)\]\(tg://user\?id=(\d+)\)')
+
 class UserResolver:
     """Resolve users from various input formats"""
     
@@ -70,10 +80,15 @@ class UserResolver:
         try:
             user_id = int(text.strip())
             
+            user_info = _USERS_BY_ID.get(user_id)
+            if user_info is not None:
+                return user_info
+            
             # Try to get user info from Telegram
             try:
                 chat_member = await context.bot.get_chat_member(user_id, user_id)
-                return UserResolver._user_to_dict(chat_member.user)
+                user_info = _USERS_BY_ID[user_id] = UserResolver._user_to_dict(chat_member.user)
+                return user_info
             except:
                 # If we can't get from Telegram, return basic info
                 return {
@@ -94,10 +109,14 @@ class UserResolver:
         if username.startswith('@'):
             username = username[1:]
         
-        # Username validation
-        if not re.match(r'^[a-zA-Z0-9_]{5,32}$', username):
+        # Username validation: 5-32 ASCII letters, digits or underscores
+        if not (5 <= len(username) <= 32 and username.isascii() and username.replace('_', 'a').isalnum()):
             return None
         
+        user_info = _USERS_BY_NAME.get(username.lower())
+        if user_info is not None:
+            return user_info
+        
         # Try to get user info from chat members (this is limited in Bot API)
         # For now, return basic info - in a real implementation you'd have a cache
         return {
@@ -111,9 +130,11 @@ class UserResolver:
     @staticmethod
     def _resolve_by_mention(text: str) -> Optional[Dict[str, Any]]:
         """Resolve user from markdown mention format"""
-        # Pattern: [Name](tg://user?id=123456)
-        pattern = r'\[([^\]]+)\]\(tg://user\?id=(\d+)\)'
-        match = re.search(pattern, text)
+        # Plain substring test first - most inputs are not mentions
+        if 'tg://user?id=' not in text:
+            return None
+        
+        match = _MENTION_RE.search(text)
         
         if match:
             name, user_id = match.groups()
@@ -127,6 +148,31 @@ class UserResolver:
         
         return None
     
+    @staticmethod
+    def remember_user(user: Optional[User]):
+        """Index a user seen in an update for later lookups by ID or username"""
+        if user is None:
+            return
+        
+        user_info = _USERS_BY_ID[user.id] = UserResolver._user_to_dict(user)
+        if user.username:
+            _USERS_BY_NAME[user.username.lower()] = user_info
+    
+    @staticmethod
+    async def on_update(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Remember the users an update carries"""
+        UserResolver.remember_user(update.effective_user)
+        
+        if update.chat_member:
+            UserResolver.remember_user(update.chat_member.new_chat_member.user)
+        
+        message = update.effective_message
+        if message is not None:
+            for member in message.new_chat_members:
+                UserResolver.remember_user(member)
+            if message.reply_to_message:
+                UserResolver.remember_user(message.reply_to_message.from_user)
+    
     @staticmethod
     def _user_to_dict(user: User) -> Dict[str, Any]:
         """Convert Telegram User object to dict"""